@@ -119,6 +119,26 @@ with tab_health:
         except:
             st.error("Could not query DB health.")
 
+    st.divider()
+    st.markdown("#### 🔎 Job Posting Search")
+    try:
+        from etl.job_search_db import search_jobs as fts_search_jobs, job_count as fts_job_count # type: ignore
+        st.caption(f"Full-text index over {fts_job_count():,} stored postings (title, company, description, skills).")
+        q_col, d_col = st.columns([3, 1])
+        job_query = q_col.text_input("Keywords", placeholder="e.g. python data analyst nairobi", key="admin_job_search")
+        dept_filter = d_col.text_input("Department (optional)", key="admin_job_search_dept")
+        if job_query:
+            hits = fts_search_jobs(job_query, department=dept_filter or None, limit=50)
+            if hits:
+                st.dataframe(
+                    pd.DataFrame(hits)[['Job Title', 'Company', 'DeptNorm', 'Location', 'last_seen', 'score']],
+                    use_container_width=True
+                )
+            else:
+                st.info("No postings match. Run the ETL pipeline if the index is empty.")
+    except Exception as e:
+        st.error(f"Job search unavailable: {e}")
+
 with tab_analytics:
     st.subheader("Global AI Telemetry & Reports")
     try:
@@ -0,0 +1,16 @@
+"""
+Posting identity shared by the ETL stores and the model indexes.
+
+The seen-URL store, the full-text job database, the demand history, the
+PostgreSQL loader and the classifier's job indexes all key postings by the
+same hash, so it lives here rather than in either package.
+"""
+import hashlib
+from typing import Any # type: ignore
+
+
+def job_key(title: Any, company: Any, description: Any) -> str:
+    """Stable identity of a posting across ETL runs (department is tracked separately)."""
+    h = hashlib.sha1()
+    h.update((str(title) + '|' + str(company) + '|' + str(description)).encode('utf-8', errors='ignore'))
+    return h.hexdigest()
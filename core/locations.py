@@ -0,0 +1,114 @@
+"""
+Normalise free-text job locations to Kenyan counties and build the
+department x region demand cube used for regional demand scoring.
+"""
+import os
+import re
+from typing import Dict, Any, Optional # type: ignore
+
+REMOTE = "Remote"
+UNSPECIFIED = "Unspecified"
+
+KENYA_COUNTIES = [
+    "Mombasa", "Kwale", "Kilifi", "Tana River", "Lamu", "Taita Taveta", "Garissa", "Wajir", "Mandera",
+    "Marsabit", "Isiolo", "Meru", "Tharaka Nithi", "Embu", "Kitui", "Machakos", "Makueni", "Nyandarua",
+    "Nyeri", "Kirinyaga", "Murang'a", "Kiambu", "Turkana", "West Pokot", "Samburu", "Trans Nzoia",
+    "Uasin Gishu", "Elgeyo Marakwet", "Nandi", "Baringo", "Laikipia", "Nakuru", "Narok", "Kajiado",
+    "Kericho", "Bomet", "Kakamega", "Vihiga", "Bungoma", "Busia", "Siaya", "Kisumu", "Homa Bay",
+    "Migori", "Kisii", "Nyamira", "Nairobi",
+]
+
+# Towns, estates and common spellings -> county
+TOWN_TO_COUNTY = {
+    "nairobi cbd": "Nairobi", "westlands": "Nairobi", "upper hill": "Nairobi", "upperhill": "Nairobi",
+    "kilimani": "Nairobi", "karen": "Nairobi", "industrial area": "Nairobi", "embakasi": "Nairobi",
+    "gigiri": "Nairobi", "parklands": "Nairobi", "lavington": "Nairobi", "kasarani": "Nairobi",
+    "thika": "Kiambu", "ruiru": "Kiambu", "juja": "Kiambu", "limuru": "Kiambu", "kikuyu": "Kiambu",
+    "kitengela": "Kajiado", "ngong": "Kajiado", "rongai": "Kajiado", "isinya": "Kajiado",
+    "athi river": "Machakos", "mlolongo": "Machakos", "syokimau": "Machakos",
+    "naivasha": "Nakuru", "gilgil": "Nakuru", "molo": "Nakuru",
+    "eldoret": "Uasin Gishu", "kitale": "Trans Nzoia", "kapsabet": "Nandi", "kabarnet": "Baringo",
+    "iten": "Elgeyo Marakwet", "kapenguria": "West Pokot", "maralal": "Samburu", "lodwar": "Turkana",
+    "kakuma": "Turkana", "dadaab": "Garissa", "nanyuki": "Laikipia", "nyahururu": "Laikipia",
+    "ol kalou": "Nyandarua", "kerugoya": "Kirinyaga", "karatina": "Nyeri", "chuka": "Tharaka Nithi",
+    "maua": "Meru", "voi": "Taita Taveta", "wundanyi": "Taita Taveta", "malindi": "Kilifi",
+    "watamu": "Kilifi", "diani": "Kwale", "ukunda": "Kwale", "hola": "Tana River", "webuye": "Bungoma",
+    "kimilili": "Bungoma", "mumias": "Kakamega", "bondo": "Siaya", "kendu bay": "Homa Bay",
+    "muranga": "Murang'a", "homabay": "Homa Bay", "taveta": "Taita Taveta", "tharaka": "Tharaka Nithi",
+    "elgeyo": "Elgeyo Marakwet", "pokot": "West Pokot",
+}
+
+_REMOTE_RE = re.compile(r'\b(remote|work from home|wfh|anywhere|virtual)\b', re.IGNORECASE)
+
+_NAMES: Dict[str, str] = {**{c.lower(): c for c in KENYA_COUNTIES}, **TOWN_TO_COUNTY}
+# Longest names first so "West Pokot" wins over "Pokot" and "Homa Bay" over nothing
+_PLACE_RE = re.compile(
+    r"\b(" + "|".join(re.escape(n) for n in sorted(_NAMES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+
+def normalize_location(text: Any) -> Optional[str]:
+    """
+    County for the first recognised Kenyan county/town in `text`, "Remote" for
+    remote postings, or None when nothing is recognised.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    match = _PLACE_RE.search(text.replace('’', "'"))
+    if match:
+        return _NAMES[match.group(1).lower()]
+    if _REMOTE_RE.search(text):
+        return REMOTE
+    return None
+
+
+def job_region(record: Dict[str, Any]) -> str:
+    """
+    Region for one job posting: the Location field if it names a place, else the
+    first place mentioned in the title or description (scraped Location values
+    are often a stray description sentence), else "Unspecified".
+    """
+    for field in ('Location', 'Job Title', 'Description'):
+        region = normalize_location(record.get(field))
+        if region:
+            return region
+    return UNSPECIFIED
+
+
+def add_region_column(jobs_df: Any, column: str = 'Region') -> Any:
+    """Return `jobs_df` with a normalised `column` (county / Remote / Unspecified)."""
+    jobs_df = jobs_df.copy()
+    jobs_df[column] = [job_region(r) for r in jobs_df.to_dict('records')]
+    return jobs_df
+
+
+def build_regional_demand(jobs_df: Any, output_path: Optional[str] = None, dept_col: str = 'Department') -> Any:
+    """
+    Department x region job counts (long format: Department, Region, job_count,
+    demand_score) where demand_score is relative to the busiest department in
+    that region. Uses an existing 'Region' column or derives one.
+
+    Args:
+        jobs_df: Scraped jobs
+        output_path (str): Optional CSV path to save the cube to
+
+    Returns:
+        pd.DataFrame: Regional demand cube
+    """
+    import pandas as pd # type: ignore
+
+    if 'Region' not in jobs_df.columns:
+        jobs_df = add_region_column(jobs_df)
+    cube = (jobs_df.dropna(subset=[dept_col])
+            .groupby([dept_col, 'Region']).size().reset_index(name='job_count')
+            .rename(columns={dept_col: 'Department'}))
+    if cube.empty:
+        cube = pd.DataFrame(columns=['Department', 'Region', 'job_count', 'demand_score'])
+    else:
+        cube['demand_score'] = cube['job_count'] / cube.groupby('Region')['job_count'].transform('max')
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        cube.to_csv(output_path, index=False)
+        print(f"Regional demand metrics saved to {output_path}")
+    return cube
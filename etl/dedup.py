@@ -0,0 +1,379 @@
+"""
+Near-duplicate detection for merged job postings.
+
+Cross-posted jobs rarely match exactly: one board writes "Data Analyst at
+Safaricom PLC", another "Data Analyst" by "Safaricom Kenya Limited". Postings
+are blocked so only plausible pairs are compared:
+
+1. normalized (company, title) keys collapse exact duplicates outright;
+2. each remaining title gets a MinHash signature over character 3-gram
+   shingles, and LSH bands bucket titles of the same normalized company and
+   the same numbers ("grade 1" is not "grade 2") whose shingle sets are
+   likely similar;
+3. candidate pairs from a bucket are confirmed with a fuzzy title score
+   (token-sort ratio, as in thefuzz) and merged with union-find.
+
+Everything up to the fuzzy check is vectorized numpy, so hundreds of
+thousands of postings merge in seconds. DedupIndex keeps the exact keys and
+LSH buckets in SQLite instead, for merges that stream their input in chunks.
+"""
+import os
+import re
+import zlib
+import hashlib
+import sqlite3
+import tempfile
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple # type: ignore
+import numpy as np # type: ignore
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_AT_EMPLOYER = re.compile(r'\s+at\s+', re.IGNORECASE)
+_NUMBER = re.compile(r'\d+')
+_FNV_PRIME = np.uint64(1099511628211)
+
+# Legal-form and filler words that vary between boards for the same employer
+_COMPANY_NOISE = {
+    'ltd', 'limited', 'plc', 'inc', 'llc', 'llp', 'co', 'company', 'corp', 'corporation', 'group',
+    'kenya', 'k', 'the', 'and', 'of', 'international', 'intl',
+}
+
+
+def _words(text: str) -> List[str]:
+    return _NON_ALNUM.sub(' ', text.lower().replace('&', ' and ')).split()
+
+
+@lru_cache(maxsize=65536)
+def _normalize_company(name: str) -> str:
+    words = _words(name)
+    kept = [w for w in words if w not in _COMPANY_NOISE]
+    return ' '.join(kept or words)
+
+
+def normalize_company(name: Any) -> str:
+    """Lowercase company name without punctuation, legal suffixes or 'Kenya' ('' if missing)."""
+    return _normalize_company(name) if isinstance(name, str) else ''
+
+
+def _normalize_title(title: Any, norm_company: str) -> str:
+    if not isinstance(title, str):
+        return ''
+    parts = _AT_EMPLOYER.split(title.strip())
+    if len(parts) > 1:
+        employer = normalize_company(parts[-1])
+        if not norm_company or not employer or employer == norm_company:
+            title = ' at '.join(parts[:-1])
+    return ' '.join(_words(title))
+
+
+def normalize_title(title: Any, company: Any = '') -> str:
+    """Lowercase title without punctuation and without a trailing 'at <company>'."""
+    return _normalize_title(title, normalize_company(company))
+
+
+def _shingle_codes(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Character 3-gram shingles of every text as 24-bit integers (three bytes
+    packed), concatenated, plus the number of shingles per text. Texts are
+    space-padded so each has at least one shingle.
+    """
+    encoded = [f" {t} ".encode('utf-8') for t in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    grams = (buf[:-2] << np.uint64(16)) | (buf[1:-1] << np.uint64(8)) | buf[2:]
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    counts = lengths - 2
+    # Position of every gram inside its text; grams crossing into the next text are dropped
+    doc = np.repeat(np.arange(len(texts)), lengths)[:len(grams)]
+    pos = np.arange(len(grams)) - starts[doc]
+    return grams[pos < counts[doc]], counts
+
+
+def minhash_signatures(texts: List[str], num_perm: int = 32, seed: int = 7) -> np.ndarray:
+    """
+    (n_texts, num_perm) MinHash signatures of the texts' character 3-gram
+    sets. Each permutation is a multiply-shift hash (a*x + b, top 32 bits, with
+    64-bit wrap-around), which avoids a modulo per shingle.
+    """
+    if not texts:
+        return np.zeros((0, num_perm), dtype=np.uint32)
+    rng = np.random.RandomState(seed)
+    a = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+    codes, counts = _shingle_codes(texts)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    shift = np.uint64(32)
+    with np.errstate(over='ignore'):
+        for i in range(num_perm):
+            signatures[:, i] = np.minimum.reduceat((a[i] * codes + b[i]) >> shift, offsets)
+    return signatures
+
+
+def lsh_buckets(signatures: np.ndarray, blocks: List[str], bands: int) -> np.ndarray:
+    """
+    (n, bands) LSH bucket ids: a 64-bit hash of the block (normalized company
+    and title numbers),
+    the band number and the band's signature rows. Ids are stable across runs,
+    so they can be stored in an on-disk index.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    block_crc = {b: zlib.crc32(b.encode('utf-8')) for b in set(blocks)}
+    block_hash = np.fromiter((block_crc[b] for b in blocks), dtype=np.uint64, count=n)
+    buckets = np.empty((n, bands), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            h = (block_hash + np.uint64(band << 32)) * _FNV_PRIME
+            for r in range(band * rows, (band + 1) * rows):
+                h = (h ^ signatures[:, r].astype(np.uint64)) * _FNV_PRIME
+            buckets[:, band] = h
+    return buckets.view(np.int64)
+
+
+def _candidate_pairs(buckets: np.ndarray) -> np.ndarray:
+    """
+    (i, j) pairs with i < j sharing at least one LSH bucket: every pair of
+    members of every bucket, so a match is never missed because a bucket's
+    first member happens not to resemble the others.
+    """
+    n, bands = buckets.shape
+    pairs = []
+    for band in range(bands):
+        order = np.argsort(buckets[:, band], kind='stable')
+        sorted_key = buckets[order, band]
+        is_start = np.ones(n, dtype=bool)
+        is_start[1:] = sorted_key[1:] != sorted_key[:-1]
+        group_start = np.maximum.accumulate(np.where(is_start, np.arange(n), 0))
+        # Each member pairs with the `earlier` members before it in its bucket
+        earlier = np.arange(n) - group_start
+        total = int(earlier.sum())
+        if not total:
+            continue
+        offset = np.arange(total) - np.repeat(np.cumsum(earlier) - earlier, earlier)
+        left = order[np.repeat(group_start, earlier) + offset]
+        # The stable sort keeps members in row order, so left < right
+        pairs.append(np.stack([left, np.repeat(order, earlier)], axis=1))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def _fuzzy_scores(left: List[str], right: List[str]) -> np.ndarray:
+    """Token-sort ratio (0-100) for each pair; rapidfuzz's batch scorer when available."""
+    try:
+        from rapidfuzz import process, fuzz as rfuzz # type: ignore
+        return np.asarray(process.cpdist(left, right, scorer=rfuzz.token_sort_ratio, workers=-1))
+    except ImportError:
+        from thefuzz import fuzz # type: ignore
+        return np.array([fuzz.token_sort_ratio(x, y) for x, y in zip(left, right)], dtype=float)
+
+
+def _lsh_blocks(norm_title: List[str], norm_company: List[str]) -> List[str]:
+    """
+    LSH block per title: its normalized company plus the title's numbers, so
+    "teacher grade 1" and "teacher grade 2" are never compared even though
+    their fuzzy score clears the threshold.
+    """
+    return [f"{c}\x00{' '.join(sorted(_NUMBER.findall(t)))}" for t, c in zip(norm_title, norm_company)]
+
+
+def _normalize_all(titles: List[Any], companies: List[Any]) -> Tuple[List[str], List[str]]:
+    company_norms = {c: normalize_company(c) for c in set(companies)}
+    norm_company = [company_norms[c] for c in companies]
+    return [_normalize_title(t, c) for t, c in zip(titles, norm_company)], norm_company
+
+
+def _cluster(norm_title: List[str], norm_company: List[str], threshold: float, num_perm: int,
+             bands: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (representative row per row, key id per row, LSH buckets per key),
+    where keys are the distinct normalized (company, title) pairs.
+    """
+    import pandas as pd # type: ignore
+
+    n = len(norm_title)
+    # Identical normalized (company, title) keys are duplicates without any scoring;
+    # factorize numbers keys in order of first appearance
+    key_ids, uniques = pd.factorize(pd.Series(norm_company, dtype=object) + '\x00' + pd.Series(norm_title, dtype=object))
+    first_row = np.full(len(uniques), n, dtype=np.int64)
+    np.minimum.at(first_row, key_ids, np.arange(n))
+    key_titles = [norm_title[r] for r in first_row]
+    buckets = lsh_buckets(minhash_signatures(key_titles, num_perm),
+                          _lsh_blocks(key_titles, [norm_company[r] for r in first_row]), bands)
+
+    parent = np.arange(len(uniques))
+    candidates = _candidate_pairs(buckets)
+    if len(candidates):
+        scores = _fuzzy_scores([key_titles[i] for i in candidates[:, 0]], [key_titles[j] for j in candidates[:, 1]])
+
+        def _root(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j in candidates[scores >= threshold]:
+            ri, rj = _root(i), _root(j)
+            if ri != rj:
+                # The earliest posting represents the cluster (drop_duplicates keeps the first)
+                parent[max(ri, rj)] = min(ri, rj)
+        roots = np.array([_root(k) for k in range(len(uniques))])
+    else:
+        roots = parent
+    return first_row[roots[key_ids]], key_ids, buckets
+
+
+def near_duplicate_clusters(titles: List[Any], companies: List[Any], threshold: float = 90,
+                            num_perm: int = 32, bands: int = 8) -> np.ndarray:
+    """
+    Cluster representative for every posting: the row index of the first
+    posting it is a (near-)duplicate of, or its own index.
+
+    Args:
+        titles, companies: Posting titles and employers (same length)
+        threshold (float): Minimum token-sort ratio for two titles of the same
+            normalized company and with the same numbers to count as the same job
+        num_perm (int): MinHash permutations
+        bands (int): LSH bands (num_perm // bands rows each); more bands find
+            less similar candidates at the cost of more comparisons
+
+    Returns:
+        np.ndarray: Representative row index per posting
+    """
+    if len(titles) == 0:
+        return np.zeros(0, dtype=np.int64)
+    norm_title, norm_company = _normalize_all(titles, companies)
+    return _cluster(norm_title, norm_company, threshold, num_perm, bands)[0]
+
+
+def drop_near_duplicates(jobs_df: Any, title_col: str = 'Job Title', company_col: str = 'Company',
+                         threshold: float = 90, **kwargs: Any) -> Tuple[Any, int]:
+    """
+    Keep the first posting of every near-duplicate cluster.
+
+    Returns:
+        tuple: (deduplicated DataFrame with its original index, number of rows dropped)
+    """
+    reps = near_duplicate_clusters(jobs_df[title_col].tolist(), jobs_df[company_col].tolist(),
+                                   threshold=threshold, **kwargs)
+    keep = reps == np.arange(len(jobs_df))
+    return jobs_df[keep], int((~keep).sum())
+
+
+class DedupIndex:
+    """
+    On-disk key index for deduplicating postings chunk by chunk, so a merge
+    only ever holds one chunk in memory. Rows are checked against the chunk
+    itself and against every row kept from earlier chunks: exact lowercase
+    (title, company) keys first, then LSH buckets whose stored titles are
+    fuzzy-scored like `near_duplicate_clusters`.
+
+    Args:
+        db_path (str): SQLite file for the index; None uses a temporary file
+        near (bool): Also drop near duplicates (exact keys only otherwise)
+        threshold, num_perm, bands: As for near_duplicate_clusters
+    """
+
+    def __init__(self, db_path: Optional[str] = None, near: bool = True, threshold: float = 90,
+                 num_perm: int = 32, bands: int = 8):
+        self._tmpdir = None
+        if db_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            db_path = os.path.join(self._tmpdir.name, 'dedup_keys.db')
+        self.near = near
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.conn = sqlite3.connect(db_path)
+        # A scratch index: losing it on a crash only means re-running the merge
+        self.conn.executescript("""
+            PRAGMA synchronous = OFF;
+            PRAGMA journal_mode = MEMORY;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+            CREATE TABLE IF NOT EXISTS exact_keys (key INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS lsh_buckets (bucket INTEGER, title TEXT);
+            CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets(bucket);
+            CREATE TEMP TABLE probe (row INTEGER, bucket INTEGER);
+        """)
+
+    @staticmethod
+    def _exact_key(title: Any, company: Any) -> int:
+        """Signed 64-bit hash of the lowercase (title, company) pair merge_and_deduplicate compares."""
+        digest = hashlib.blake2b(f"{str(title).lower().strip()}\x00{str(company).lower().strip()}".encode('utf-8'),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, 'little', signed=True)
+
+    def _probe(self, rows: List[int], keys: List[int], query: str) -> List[Tuple[Any, ...]]:
+        self.conn.execute("DELETE FROM probe")
+        self.conn.executemany("INSERT INTO probe VALUES (?, ?)", zip(rows, keys))
+        return self.conn.execute(query).fetchall()
+
+    def _known_exact(self, keys: List[int]) -> set:
+        """Keys already in the index."""
+        matches = self._probe(list(range(len(keys))), keys,
+                              "SELECT p.bucket FROM probe p JOIN exact_keys e ON e.key = p.bucket")
+        return {key for key, in matches}
+
+    def _known_near(self, titles: List[str], buckets: np.ndarray) -> np.ndarray:
+        """Mask of rows with a stored title in one of their buckets scoring >= threshold."""
+        rows = np.repeat(np.arange(len(titles)), buckets.shape[1])
+        matches = self._probe(rows.tolist(), buckets.ravel().tolist(),
+                              "SELECT DISTINCT p.row, l.title FROM probe p JOIN lsh_buckets l ON l.bucket = p.bucket")
+        known = np.zeros(len(titles), dtype=bool)
+        if matches:
+            scores = _fuzzy_scores([titles[r] for r, _ in matches], [t for _, t in matches])
+            known[np.array([r for r, _ in matches])[scores >= self.threshold]] = True
+        return known
+
+    def filter(self, titles: List[Any], companies: List[Any]) -> Tuple[np.ndarray, int, int]:
+        """
+        Decide which rows of a chunk to keep and add them to the index.
+
+        Returns:
+            tuple: (boolean keep mask, exact duplicates dropped, near duplicates dropped)
+        """
+        n = len(titles)
+        exact = [self._exact_key(t, c) for t, c in zip(titles, companies)]
+        keep = np.zeros(n, dtype=bool)
+        first_seen = {}
+        for i, key in enumerate(exact):
+            first_seen.setdefault(key, i)
+        known = self._known_exact(list(first_seen))
+        keep[[i for key, i in first_seen.items() if key not in known]] = True
+        n_exact = n - int(keep.sum())
+
+        n_near = 0
+        rows = np.flatnonzero(keep)
+        if self.near and len(rows):
+            norm_title, norm_company = _normalize_all([titles[i] for i in rows], [companies[i] for i in rows])
+            reps, key_ids, buckets = _cluster(norm_title, norm_company, self.threshold, self.num_perm, self.bands)
+            local = np.flatnonzero(reps == np.arange(len(rows)))
+            local = local[~self._known_near([norm_title[i] for i in local], buckets[key_ids[local]])]
+            keep[:] = False
+            keep[rows[local]] = True
+            n_near = len(rows) - len(local)
+            # Inserting in bucket order keeps the index's B-tree writes sequential
+            new = buckets[key_ids[local]].ravel()
+            order = np.argsort(new)
+            titles_of = np.repeat(local, buckets.shape[1])[order].tolist()
+            self.conn.executemany("INSERT INTO lsh_buckets VALUES (?, ?)",
+                                  zip(new[order].tolist(), (norm_title[i] for i in titles_of)))
+
+        # Near-dropped rows are indexed too: their exact copies in later chunks are exact duplicates
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO exact_keys VALUES (?)",
+                                  ((key,) for key in sorted(exact[i] for i in rows)))
+        return keep, n_exact, n_near
+
+    def close(self):
+        self.conn.close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
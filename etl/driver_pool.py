@@ -0,0 +1,194 @@
+"""
+Selenium Driver Pool
+====================
+A fixed number of headless Chrome drivers fed from a work queue, so detail
+pages are scraped concurrently instead of one tab at a time. Page loads go
+through a per-host token bucket rather than fixed sleeps: each site sees at
+most `rate_per_host` requests per second (plus a small burst) however many
+drivers are running. One pool can be shared by the MyJobMag and
+BrighterMonday scrapers; each host keeps its own bucket.
+"""
+
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional # type: ignore
+from urllib.parse import urlparse
+
+
+def _log(msg: str):
+    print(f"[DriverPool | {datetime.now():%H:%M:%S}] {msg}")
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it (no-op when rate <= 0, i.e. unlimited)."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first request to that host."""
+
+    def __init__(self, rate_per_host: float = 1.0, burst: int = 1):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        bucket.acquire()
+
+
+def _default_driver_factory(headless: bool) -> Any:
+    from etl.scrape_brightermonday import _build_driver # type: ignore
+    return _build_driver(headless)
+
+
+class DriverPool:
+    """
+    Up to `size` Selenium drivers, started lazily and reused across `map` calls.
+
+    Args:
+        size (int): Maximum number of concurrent drivers
+        headless (bool): Run Chrome headless
+        rate_per_host (float): Page loads per second allowed per host (<= 0: unlimited)
+        burst (int): Page loads a host may receive back-to-back after being idle
+        wait_timeout (float): Seconds `load` waits for the expected element
+        driver_factory: Callable(headless) -> driver (defaults to the shared Chrome setup)
+    """
+
+    def __init__(self, size: int = 4, headless: bool = True, rate_per_host: float = 1.0, burst: int = 1,
+                 wait_timeout: float = 20, driver_factory: Optional[Callable[[bool], Any]] = None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.wait_timeout = wait_timeout
+        self.limiter = HostRateLimiter(rate_per_host, burst)
+        self._factory = driver_factory or _default_driver_factory
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._drivers: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_start = len(self._drivers) < self.size
+            if can_start:
+                self._drivers.append(None)  # reserve the slot while the driver starts
+        if not can_start:
+            return self._idle.get()
+        try:
+            driver = self._factory(self.headless)
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def load(self, driver: Any, url: str, wait_css: Optional[str] = None) -> bool:
+        """
+        Rate-limited `driver.get(url)`; if `wait_css` is given, wait for it and
+        return whether it appeared.
+        """
+        self.limiter.wait(url)
+        driver.get(url)
+        if not wait_css:
+            return True
+        from selenium.webdriver.common.by import By # type: ignore
+        from selenium.webdriver.support.ui import WebDriverWait # type: ignore
+        from selenium.webdriver.support import expected_conditions as EC # type: ignore
+        try:
+            WebDriverWait(driver, self.wait_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_css)))
+            return True
+        except Exception:
+            return False
+
+    def map(self, fn: Callable[[Any, Any], Any], items: List[Any]) -> List[Any]:
+        """
+        `fn(driver, item)` for every item, spread over the pool's drivers.
+        Results come back in the order of `items`; an item whose call raises
+        gets None.
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        work: "queue.Queue[Any]" = queue.Queue()
+        for pair in enumerate(items):
+            work.put(pair)
+
+        def _worker():
+            driver = None
+            try:
+                while True:
+                    try:
+                        index, item = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    if driver is None:
+                        try:
+                            driver = self._acquire()
+                        except Exception as e:
+                            _log(f"Warning: could not start a driver: {e}")
+                            work.put((index, item))  # leave it for a worker that has one
+                            return
+                    try:
+                        results[index] = fn(driver, item)
+                    except Exception as e:
+                        _log(f"Warning: task {index} failed: {e}")
+            finally:
+                if driver is not None:
+                    self._idle.put(driver)
+
+        threads = [threading.Thread(target=_worker, daemon=True) for _ in range(min(self.size, len(items)))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def close(self):
+        """Quit every driver the pool started."""
+        with self._lock:
+            drivers, self._drivers = [d for d in self._drivers if d is not None], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._idle = queue.LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
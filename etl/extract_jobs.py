@@ -1,19 +1,16 @@
 import os
-import json
-import time
+import sys
 import re
 import pandas as pd # type: ignore
 from pathlib import Path
 from datetime import datetime
-from selenium import webdriver # type: ignore
-from selenium.webdriver.chrome.service import Service # type: ignore
-from selenium.webdriver.chrome.options import Options # type: ignore
-from selenium.webdriver.common.by import By # type: ignore
-from selenium.webdriver.support.ui import WebDriverWait # type: ignore
-from selenium.webdriver.support import expected_conditions as EC # type: ignore
-from webdriver_manager.chrome import ChromeDriverManager # type: ignore
 from thefuzz import fuzz # type: ignore
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.taxonomy import ( # type: ignore
+    DEPARTMENT_KEYWORDS, JOB_CATEGORY_ALIASES, get_taxonomy, load_category_overrides
+)
+
 # -------------------------------
 # 🪵 UTILITY- Log Function
 # -------------------------------
@@ -24,212 +21,60 @@ def log(message):
 # -------------------------------
 # 🗺️ CLASSIFICATION LOGIC
 # -------------------------------
-department_keywords = {
-    "Information Technology": [
-        "developer", "software", "ict", "data", "ai", "machine learning", "cyber", "programmer",
-        "analyst", "information technology", "computer", "network", "support", "systems",
-        "cloud", "security", "database", "web", "frontend", "backend", "fullstack",
-        "coding", "programming", "software engineering", "it", "hardware", "tech",
-        "apps", "mobile", "internet", "coding", "algorithm", "devops", "code", "coder", "website",
-        "python", "javascript", "java", "c#", "rust", "go", "php", "ruby", "sql", "flutter", "react",
-        "node", "typescript", "swift", "kotlin", "android", "ios", "aws", "azure", "docker", "kubernetes"
-    ],
-    "Business": [
-        "business", "operations", "strategy", "manager", "consultant", "entrepreneur",
-        "logistics", "supply chain", "management", "administration", "leadership", "commerce", "startup"
-    ],
-    "Education": [
-        "teacher", "lecturer", "education", "instructor", "tutor", "training",
-        "curriculum", "school", "dean", "academic", "principal", "teaching", "pedagogy", "training"
-    ],
-    "Finance & Accounting": [
-        "accountant", "finance", "auditor", "economist", "investment", "bookkeeper",
-        "financial", "tax", "cpa", "controller", "budget", "accounting", "banking", "audit", "money"
-    ],
-    "Healthcare & Medical": [
-        "nurse", "doctor", "pharmacist", "medical", "clinical", "health", "surgeon",
-        "therapist", "dental", "radiologist", "physician", "lab technician", "veterinary",
-        "nutritionist", "psychiatrist", "medicine", "dentistry", "pharmacy", "patient",
-        "care", "healthcare", "therapy", "hospital", "surgery", "anatomy", "biology",
-        "diseases", "pathology", "pharmaceuticals", "public health", "physiology",
-        "nursing", "midwifery", "diagnostics", "treatment", "human health", "biologist", "science"
-    ],
-    "Engineering": [
-        "engineer", "mechanical", "civil", "electrical", "technician", "biomedical",
-        "mechatronic", "chemical", "project engineer", "structural",
-        "industrial", "automotive", "manufacturing", "telecommunication", "machinery",
-        "construction", "design", "robotics", "automation", "robot", "robots", "build", "building",
-        "electronics", "maintenance", "architecture", "system design", "engines"
-    ],
-    "Marketing & Sales": [
-        "marketing", "seo", "sales", "brand", "advertising", "digital", "content",
-        "promotion", "telemarketing", "social media", "copywriter", "account executive",
-        "market research", "public relations", "pr", "selling"
-    ],
-    "Administration & Support": [
-        "admin", "clerk", "secretary", "assistant", "receptionist", "office manager",
-        "front desk", "executive assistant", "records", "filing"
-    ],
-    "Human Resources": [
-        "human resources", "hr", "recruiter", "talent management", "personnel", "staffing",
-        "employee relations", "talent acquisition", "labor laws", "payroll", "onboarding", "hiring"
-    ],
-    "Law": [
-        "lawyer", "legal", "attorney", "advocate", "compliance", "legal officer", "paralegal",
-        "regulatory", "litigation", "contract", "corporate law", "law", "justice", "judiciary",
-        "courts", "arbitration"
-    ],
-    "Arts & Media": [
-        "artist", "musician", "painter", "graphic designer", "illustrator", "videographer",
-        "photographer", "media", "journalist", "writer", "editor", "communication",
-        "film", "animation", "content creator", "design", "creative", "theatre", "drawing"
-    ],
-    "Agriculture & Environmental": [
-        "agriculture", "horticulture", "environment", "climate", "forestry", "conservation",
-        "agronomist", "ecologist", "farm", "natural resources", "soil", "animal", "crop",
-        "farming", "livestock", "irrigation", "agribusiness", "vet"
-    ],
-    "Architecture & Construction": [
-        "architecture", "architect", "construction", "site supervisor", "planner",
-        "urban planning", "interior design", "landscape", "surveying", "quantity surveyor",
-        "draughtsman", "builder", "real estate development", "building"
-    ],
-    "Social Sciences & Community": [
-        "social worker", "sociologist", "community", "ngo", "development officer",
-        "humanitarian", "psychologist", "counselor", "activist", "gender", "youth worker",
-        "counseling", "anthropology"
-    ],
-    "Hospitality & Tourism": [
-        "hospitality", "tourism", "hotel", "chef", "cook", "housekeeping", "travel",
-        "airline", "waiter", "bartender", "event planner", "front office", "resort", "catering"
-    ],
-    "Security & Protective Services": [
-        "security", "guard", "military", "police", "defense", "intelligence", "forensic",
-        "safety", "firefighter", "rescue", "policing", "crimonology"
-    ],
-    "Data Science & Analytics": [
-        "data analyst", "data scientist", "big data", "statistics", "mathematics",
-        "tableau", "power bi", "sql", "excel", "visualization", "predictive modeling",
-        "machine learning", "data mining", "math", "analysis"
-    ],
-    "Project Management": [
-        "project manager", "pmp", "agile", "scrum", "planning", "delivery", "stakeholder",
-        "budgeting", "coordination", "implementation"
-    ],
-    "Renewable Energy & Environment": [
-        "solar", "wind", "renewable", "energy", "sustainability", "environmental",
-        "climate change", "green energy", "conservation"
-    ],
-    "Real Estate & Property": [
-        "real estate", "property", "valuation", "realtor", "broker", "estate agent",
-        "leasing", "tenancy", "land", "property management"
-    ],
-    "Aviation & Logistics": [
-        "pilot", "aviation", "flight", "logistics", "warehouse", "transport",
-        "airline", "cargo", "fleet", "clearing", "forwarding"
-    ],
-    "Other": []
-}
+# Keyword lists and patterns come from the shared taxonomy (models/taxonomy.py);
+# `department_keywords` stays importable from here for older scripts
+department_keywords = DEPARTMENT_KEYWORDS
 
 def classify_department(job_title, description="", skills=""):
-    text = f"{job_title} {description} {skills}".lower()
-    title_lower = job_title.lower()
-    
-    best_dept = "Other"
-    max_score = 0
-    
-    for dept, keywords in department_keywords.items():
-        score = 0
-        for kw in keywords:
-            kw_lower = kw.lower()
-            # Use word boundaries to prevent 'it' matching 'with'
-            pattern = r'\b' + re.escape(kw_lower) + r'\b'
-            
-            if re.search(pattern, text):
-                score += 1
-                # Weight job title heavily
-                if re.search(pattern, title_lower):
-                    score += 5
-                    
-        if score > max_score:
-            max_score = score
-            best_dept = dept
-            
-    return best_dept
+    return get_taxonomy().classify(job_title, description, skills)
+
+def classify_departments(df, title_col='Job Title', desc_col='Description', skills_col='Skills Required'):
+    """
+    Vectorized `classify_department` over a DataFrame of postings: keyword hits
+    are collected with one regex scan per text and scored with a single sparse
+    matrix multiply. Returns a Series of departments aligned with `df`.
+    """
+    def _col(name):
+        return df[name].fillna('').astype(str) if name in df.columns else pd.Series([''] * len(df), index=df.index)
+
+    titles = _col(title_col)
+    texts = titles + ' ' + _col(desc_col) + ' ' + _col(skills_col)
+    return pd.Series(get_taxonomy().classify_batch(titles.tolist(), texts.tolist()), index=df.index)
 
 # --- Normalization helpers ---
-NORMALIZE_MAP_BUILTIN = {
-    # IT
-    'IT': 'Information Technology', 'I.T.': 'Information Technology', 'Information Tech': 'Information Technology',
-    # Business family
-    'Sales & Marketing': 'Marketing & Sales', 'Sales/Marketing': 'Marketing & Sales', 'Marketing': 'Marketing & Sales', 'Sales': 'Marketing & Sales',
-    'Accounting/Finance': 'Finance & Accounting', 'Finance': 'Finance & Accounting', 'Accounting': 'Finance & Accounting',
-    'Admin & Support': 'Administration & Support', 'Administration': 'Administration & Support',
-    'Business Development': 'Business', 'Operations': 'Business', 'Customer Service': 'Business',
-    'Real Estate': 'Real Estate & Property', 'Property': 'Real Estate & Property',
-    # Education
-    'Education/Teaching': 'Education', 'Teaching': 'Education', 'Education': 'Education', 'Teacher': 'Education', 'Lecturer': 'Education',
-    # Data / Analytics
-    'Data/Analytics': 'Data Science & Analytics', 'Data Science': 'Data Science & Analytics', 'Analytics': 'Data Science & Analytics',
-    # Project Management
-    'Project/Program Management': 'Project Management', 'Programme Management': 'Project Management',
-    # Agriculture & Environment
-    'Agriculture': 'Agriculture & Environmental', 'Environment': 'Agriculture & Environmental', 'Environmental': 'Agriculture & Environmental', 'Horticulture': 'Agriculture & Environmental', 'Livestock': 'Agriculture & Environmental',
-    # Law
-    'Legal': 'Law', 'Legal & Compliance': 'Law', 'Law': 'Law',
-    # Healthcare
-    'Healthcare': 'Healthcare & Medical', 'Medical': 'Healthcare & Medical', 'Nursing': 'Healthcare & Medical', 'Pharmacy': 'Healthcare & Medical', 'Dentistry': 'Healthcare & Medical', 'Veterinary': 'Healthcare & Medical',
-    # HR
-    'Human Resource': 'Human Resources', 'Human Resources': 'Human Resources', 'HR': 'Human Resources',
-    # Renewable Energy & Environment
-    'Renewable Energy': 'Renewable Energy & Environment', 'Environment & Conservation': 'Renewable Energy & Environment'
-}
+NORMALIZE_MAP_BUILTIN = JOB_CATEGORY_ALIASES
 
 def load_external_category_map():
-    try:
-        base = Path(__file__).resolve().parents[1]
-        path = base / 'data' / 'category_mappings.json'
-        if path.exists():
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, dict) else {}
-    except Exception:
-        pass
-    return {}
-
-_DEF_PATTERNS = [
-    (r'nurs|pharm|dent|clinic|medical|health|vet', 'Healthcare & Medical'),
-    (r'human resource|\bhr\b|recruit|talent', 'Human Resources'),
-    (r'teacher|lectur|education|tsc|school', 'Education'),
-    (r'sales|marketing|brand|seo|sem|growth', 'Marketing & Sales'),
-    (r'agri|farm|horti|soil|crop|livestock', 'Agriculture & Environmental'),
-    (r'environ|ecolog|conserv|renewable|solar|wind|energy', 'Renewable Energy & Environment'),
-    (r'data|analytics?|machine learning|\bml\b|\bai\b|business intelligence|\bbi\b', 'Data Science & Analytics'),
-    (r'project manager|program manager|\bpmo\b|project', 'Project Management'),
-    (r'law|legal|advocate|attorney|compliance', 'Law'),
-    (r'account|finance|auditor|\bcpa\b|bookkeep|treasury', 'Finance & Accounting'),
-    (r'software|developer|engineer|\bit\b|systems|network|cyber|cloud|devops', 'Information Technology'),
-]
+    return load_category_overrides()
 
 def infer_dept_from_text(text: str) -> str:
-    s = (text or '').lower()
-    for pat, dep in _DEF_PATTERNS:
-        try:
-            if re.search(pat, s):
-                return dep
-        except Exception:
-            continue
-    return ''
+    return get_taxonomy().infer_department(text)
 
 def normalize_department(raw: str, fallback_text: str = '') -> str:
     raw = (raw or '').strip()
-    cat_map = {**NORMALIZE_MAP_BUILTIN, **load_external_category_map()}
     if raw:
-        return cat_map.get(raw, raw)
+        return get_taxonomy().normalize_category(raw)
     # try inference
     guess = infer_dept_from_text(fallback_text)
     return guess if guess else raw
 
+def normalize_departments(raw, fallback_text=None):
+    """
+    Vectorized `normalize_department` for a Series of raw category labels:
+    non-empty labels go through one dictionary map over the cached category
+    map, and only rows with an empty label fall back to inferring a department
+    from the matching `fallback_text` entry. Returns a Series aligned with `raw`.
+    """
+    raw = pd.Series(raw).fillna('').astype(str).str.strip()
+    category_map = get_taxonomy().category_map
+    result = raw.map(lambda r: category_map.get(r, r))
+
+    empty = raw == ''
+    if fallback_text is not None and empty.any():
+        fallback = pd.Series(fallback_text, index=raw.index).fillna('').astype(str)
+        result[empty] = fallback[empty].map(infer_dept_from_text)
+    return result
+
 
 def extract_category_from_description(desc: str) -> str:
     try:
@@ -242,6 +87,13 @@ def extract_category_from_description(desc: str) -> str:
         pass
     return ''
 
+def extract_labeled_field(description: str, keyword: str) -> str:
+    """Value after the colon on the first description line mentioning `keyword` ('' if none)."""
+    for line in (description or '').split("\n"):
+        if keyword.lower() in line.lower():
+            return line.split(":", 1)[-1].strip()
+    return ""
+
 def classify_location(location_text):
     # TODO: Implement robust location classification (Remote, On-site, Hybrid)
     return "Unclear"
@@ -249,128 +101,152 @@ def classify_location(location_text):
 # -------------------------------
 # 🕷 Scraper Function
 # -------------------------------
+def _myjobmag_listing(pool, driver, url):
+    """Job cards on one listing page as dicts (WebElements do not outlive the driver call)."""
+    from selenium.webdriver.common.by import By # type: ignore
+
+    if not pool.load(driver, url, "ul.job-list > li.job-list-li"):
+        return []
+    cards = []
+    for card in driver.find_elements(By.CSS_SELECTOR, "ul.job-list > li.job-list-li"):
+        try:
+            job_title_elem = card.find_element(By.CSS_SELECTOR, "h2 > a")
+            company_elem = card.find_element(By.CSS_SELECTOR, "li.job-logo img")
+            cards.append({
+                "title": job_title_elem.text.strip(),
+                "url": job_title_elem.get_attribute("href"),
+                "company": company_elem.get_attribute("alt").strip(),
+            })
+        except Exception:
+            continue
+    return cards
+
+def _myjobmag_detail(pool, driver, card):
+    """Scrape one job page into a record (title-only record if the page fails)."""
+    from selenium.webdriver.common.by import By # type: ignore
+
+    job_title, company_name, job_link = card["title"], card["company"], card["url"]
+    try:
+        if not pool.load(driver, job_link, "div.job-details"):
+            raise TimeoutError("job details did not load")
+        description = driver.find_element(By.CSS_SELECTOR, "div.job-details").text.strip()
+
+        def extract_field(keyword):
+            return extract_labeled_field(description, keyword)
+
+        location = extract_field("Location")
+        skills = extract_field("Skills")
+        raw_category = extract_field("Category") or extract_field("Function") or extract_field("Industry")
+        if not raw_category:
+            raw_category = extract_category_from_description(description)
+
+        # Department classification fallback
+        classified_dept = classify_department(job_title, description, skills)
+        # Normalize Dept using mapping + inference (prefer explicit category if present)
+        dept_norm = normalize_department(classified_dept, f"{job_title} {description} {skills}")
+
+        return {
+            "Job Title": job_title,
+            "Company": company_name,
+            "Description": description,
+            "Minimum Qualification": extract_field("Qualification"),
+            "Skills Required": skills,
+            "Skillmentequired": skills,  # keep compatibility
+            "Location": location,
+            "Work Type": classify_location(location),
+            "Years of Experience": extract_field("Experience"),
+            "Category": raw_category,
+            "Department": classified_dept,
+            "DeptNorm": dept_norm,
+            "Url": job_link
+        }
+
+    except Exception:
+        log(f"Failed to extract job from: {job_link}")
+        classified_dept = classify_department(job_title, "", "")
+        dept_norm = normalize_department(classified_dept, job_title)
+        return {
+            "Job Title": job_title,
+            "Company": company_name,
+            "Description": "",
+            "Minimum Qualification": "",
+            "Skills Required": "",
+            "Skillmentequired": "",
+            "Location": "",
+            "Work Type": "Unclear",
+            "Years of Experience": "",
+            "Category": "",
+            "Department": classified_dept,
+            "DeptNorm": dept_norm,
+            "Url": job_link
+        }
+
 def scrape_myjobmag(pages=5, headless=True, delay=1.5,
                     json_path="data/myjobmag_jobs.json",
-                    csv_path="data/myjobmag_jobs.csv"):
-
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1920,1080")
-
-    # Use WebDriver Manager to automatically handle driver installation
-    service = Service(ChromeDriverManager().install())
-    
-    driver = webdriver.Chrome(service=service, options=options)
-    wait = WebDriverWait(driver, 20)
-    all_jobs = []
+                    csv_path="data/myjobmag_jobs.csv",
+                    workers=4, pool=None, seen_store=None,
+                    stream_path="data/myjobmag_jobs.jsonl", resume=True, return_records=True):
+    """
+    Scrape MyJobMag with a pool of Selenium drivers. Detail pages are loaded
+    concurrently by `workers` drivers; `delay` is the minimum interval between
+    page loads on myjobmag.co.ke (a per-host token bucket, not a sleep per job).
+    Pass a shared `pool` (etl.driver_pool.DriverPool) to reuse drivers across scrapers,
+    and a `seen_store` (etl.seen_store.SeenStore) to only fetch postings not scraped before.
+
+    Jobs are appended to the `stream_path` JSONL after every page, with a checkpoint,
+    so an interrupted run resumes where it stopped; the JSON/CSV files are converted
+    from the stream at the end. Returns the records, or their count if
+    `return_records` is False.
+    """
+    # Selenium is imported lazily (via the pool) so etl/http_scraper.py can reuse this module without it
+    from functools import partial
+    from etl.driver_pool import DriverPool # type: ignore
+    from etl.seen_store import merge_page # type: ignore
+    from etl.job_stream import JobStream, export_stream # type: ignore
+
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(size=workers, headless=headless, rate_per_host=1 / delay if delay else 0)
+    stream = JobStream(stream_path, "myjobmag", resume=resume)
+    if stream.resumed:
+        log(f"Resuming at page {stream.start_page} ({stream.jobs_written} jobs already streamed)")
+    stopped_early = stream.state.get("stopped_early", False)
 
     try:
-        for page in range(1, pages + 1):
+        for page in range(stream.start_page, pages + 1):
             url = f"https://www.myjobmag.co.ke/jobs/page/{page}" if page > 1 else "https://www.myjobmag.co.ke/jobs"
             log(f"Fetching page {page}: {url}")
-            driver.get(url)
-
-            try:
-                wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul.job-list > li.job-list-li")))
-            except:
+            cards = pool.map(partial(_myjobmag_listing, pool), [url])[0]
+            if not cards:
                 log(f"No jobs found on page {page}")
+                stream.checkpoint(page + 1)
                 continue
-
-            job_cards = driver.find_elements(By.CSS_SELECTOR, "ul.job-list > li.job-list-li")
-
-            for card in job_cards:
-                try:
-                    job_title_elem = card.find_element(By.CSS_SELECTOR, "h2 > a")
-                    job_title = job_title_elem.text.strip()
-                    job_link = job_title_elem.get_attribute("href")
-
-                    company_elem = card.find_element(By.CSS_SELECTOR, "li.job-logo img")
-                    company_name = company_elem.get_attribute("alt").strip()
-                except Exception:
-                    continue
-
-                driver.execute_script("window.open('');")
-                driver.switch_to.window(driver.window_handles[-1])
-
-                try:
-                    driver.get(job_link)
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-details")))
-                    description = driver.find_element(By.CSS_SELECTOR, "div.job-details").text.strip()
-
-                    def extract_field(keyword):
-                        for line in description.split("\n"):
-                            if keyword.lower() in line.lower():
-                                return line.split(":", 1)[-1].strip()
-                        return ""
-
-                    location = extract_field("Location")
-                    skills = extract_field("Skills")
-                    raw_category = extract_field("Category") or extract_field("Function") or extract_field("Industry")
-                    if not raw_category:
-                        raw_category = extract_category_from_description(description)
-
-                    # Department classification fallback
-                    classified_dept = classify_department(job_title, description, skills)
-                    # Normalize Dept using mapping + inference (prefer explicit category if present)
-                    dept_norm = normalize_department(classified_dept, f"{job_title} {description} {skills}")
-
-                    job_data = {
-                        "Job Title": job_title,
-                        "Company": company_name,
-                        "Description": description,
-                        "Minimum Qualification": extract_field("Qualification"),
-                        "Skills Required": skills,
-                        "Skillmentequired": skills,  # keep compatibility
-                        "Location": location,
-                        "Work Type": classify_location(location),
-                        "Years of Experience": extract_field("Experience"),
-                        "Category": raw_category,
-                        "Department": classified_dept,
-                        "DeptNorm": dept_norm,
-                        "Url": job_link
-                    }
-
-                except Exception as e:
-                    log(f"Failed to extract job from: {job_link}")
-                    classified_dept = classify_department(job_title, "", "")
-                    dept_norm = normalize_department(classified_dept, job_title)
-                    job_data = {
-                        "Job Title": job_title,
-                        "Company": company_name,
-                        "Description": "",
-                        "Minimum Qualification": "",
-                        "Skills Required": "",
-                        "Skillmentequired": "",
-                        "Location": "",
-                        "Work Type": "Unclear",
-                        "Years of Experience": "",
-                        "Category": "",
-                        "Department": classified_dept,
-                        "DeptNorm": dept_norm,
-                        "Url": job_link
-                    }
-
-                try:
-                    driver.close()
-                except Exception:
-                    pass
-                driver.switch_to.window(driver.window_handles[0])
-                all_jobs.append(job_data)
-                time.sleep(delay)
+            fresh, known = seen_store.partition(cards) if seen_store else (cards, {})
+            jobs = merge_page(cards, known, pool.map(partial(_myjobmag_detail, pool), fresh))
+            stream.append(jobs)
+            if seen_store:
+                seen_store.mark("myjobmag", cards, jobs)
+                log(f"{len(known)}/{len(cards)} postings on page {page} already scraped")
+                if seen_store.should_stop(len(known), len(cards)):
+                    log(f"Page {page} is mostly known; stopping pagination")
+                    stopped_early = True
+                    stream.checkpoint(pages + 1, stopped_early=True)
+                    break
+            stream.checkpoint(page + 1)
+
+        if stopped_early and seen_store:
+            stream.append(seen_store.carry_forward("myjobmag", stream.urls()))
 
     finally:
-        driver.quit()
-
-    os.makedirs(os.path.dirname(json_path), exist_ok=True)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(all_jobs, f, indent=2, ensure_ascii=False)
-
-    pd.DataFrame(all_jobs).to_csv(csv_path, index=False, encoding="utf-8")
-    log(f"Scraped and saved {len(all_jobs)} jobs.")
-    return all_jobs
+        if own_pool:
+            pool.close()
+
+    total = export_stream(stream.path, json_path, csv_path)
+    all_jobs = list(stream.records()) if return_records else None
+    stream.finish()
+    stream.close()
+    log(f"Scraped and saved {total} jobs.")
+    return all_jobs if return_records else total
 
 # -------------------------------
 # ▶️ Entry Point
@@ -0,0 +1,528 @@
+"""
+Browserless Job Scraper
+=======================
+Fetches MyJobMag and BrighterMonday listing and detail pages over a pooled
+HTTP session and parses them with BeautifulSoup into the same column schema
+as extract_jobs.scrape_myjobmag() and scrape_brightermonday(). Selenium is
+only started as a fallback for pages whose raw HTML has no job content
+(e.g. rendered client-side).
+
+Pages can be recorded to, and replayed from, a directory of saved HTML
+fixtures so the parsers can be tested and benchmarked offline:
+
+    python etl/http_scraper.py --source myjobmag --pages 2 --record tests/fixtures/http_scraper
+    python etl/http_scraper.py --source all --fixtures tests/fixtures/http_scraper
+"""
+
+import os
+import re
+import sys
+import time
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional # type: ignore
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd # type: ignore
+import requests # type: ignore
+from requests.adapters import HTTPAdapter # type: ignore
+from urllib3.util.retry import Retry # type: ignore
+from bs4 import BeautifulSoup # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from etl.extract_jobs import ( # type: ignore
+    classify_departments, normalize_departments, extract_labeled_field, extract_category_from_description,
+    classify_location
+)
+from etl.driver_pool import HostRateLimiter # type: ignore
+from etl.seen_store import merge_page # type: ignore
+from etl.job_stream import JobStream, export_stream # type: ignore
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# lxml is noticeably faster when installed; html.parser ships with Python
+try:
+    import lxml # type: ignore # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def _log(msg: str):
+    print(f"[HTTP scraper | {datetime.now():%H:%M:%S}] {msg}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fetchers: anything with get(url, wait_css=None) -> Optional[str] and close()
+# ─────────────────────────────────────────────────────────────────────────────
+def fixture_name(url: str) -> str:
+    """File name a page is recorded under / replayed from (slugged URL, hashed if long)."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', url.split('://', 1)[-1]).strip('_')
+    if len(slug) > 120:
+        slug = f"{slug[:120]}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}"
+    return f"{slug}.html"
+
+
+def _record(record_dir: Optional[str], url: str, html: str):
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+        with open(os.path.join(record_dir, fixture_name(url)), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+
+class HttpFetcher:
+    """Pooled `requests` session with retries on transient errors; optionally records pages."""
+
+    def __init__(self, timeout: float = 20, pool_size: int = 8, retries: int = 2,
+                 user_agent: str = DEFAULT_USER_AGENT, record_dir: Optional[str] = None):
+        self.timeout = timeout
+        self.record_dir = record_dir
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent, "Accept-Language": "en-US,en;q=0.9"})
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, wait_css: Optional[str] = None) -> Optional[str]:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            _log(f"Warning: GET {url} failed: {e}")
+            return None
+        _record(self.record_dir, url, response.text)
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class FixtureFetcher:
+    """Replays pages saved by a recording fetcher; missing pages come back as None."""
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+
+    def get(self, url: str, wait_css: Optional[str] = None) -> Optional[str]:
+        path = os.path.join(self.fixture_dir, fixture_name(url))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def close(self):
+        pass
+
+
+class SeleniumFetcher:
+    """Rendered page source from headless Chrome; the driver starts on first use."""
+
+    def __init__(self, headless: bool = True, timeout: float = 20, record_dir: Optional[str] = None):
+        self.headless = headless
+        self.timeout = timeout
+        self.record_dir = record_dir
+        self.driver: Any = None
+
+    def get(self, url: str, wait_css: Optional[str] = None) -> Optional[str]:
+        try:
+            if self.driver is None:
+                from etl.scrape_brightermonday import _build_driver # type: ignore
+                self.driver = _build_driver(self.headless)
+            self.driver.get(url)
+            if wait_css:
+                from selenium.webdriver.common.by import By # type: ignore
+                from selenium.webdriver.support.ui import WebDriverWait # type: ignore
+                from selenium.webdriver.support import expected_conditions as EC # type: ignore
+                try:
+                    WebDriverWait(self.driver, self.timeout).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_css)))
+                except Exception:
+                    pass
+            html = self.driver.page_source
+        except Exception as e:
+            _log(f"Warning: Selenium fallback failed for {url}: {e}")
+            return None
+        _record(self.record_dir, url, html)
+        return html
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTML helpers
+# ─────────────────────────────────────────────────────────────────────────────
+_BLOCK_TAGS = ["p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table",
+               "section", "article", "header", "footer", "blockquote", "pre", "dd", "dt", "dl"]
+
+
+def html_text(element: Any) -> str:
+    """
+    Visible text of an element with one line per block element, like Selenium's
+    `.text`, so line-based field extraction behaves the same on both paths.
+    """
+    if element is None:
+        return ""
+    for tag in element.find_all(["script", "style", "noscript"]):
+        tag.decompose()
+    for br in element.find_all("br"):
+        br.replace_with("\n")
+    for tag in element.find_all(_BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+    lines = (re.sub(r'[ \t\r\f\v\xa0]+', ' ', line).strip() for line in element.get_text().split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _first_text(root: Any, selectors: List[str]) -> str:
+    for sel in selectors:
+        text = html_text(root.select_one(sel))
+        if text:
+            return text
+    return ""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MyJobMag
+# ─────────────────────────────────────────────────────────────────────────────
+MYJOBMAG_BASE_URL = "https://www.myjobmag.co.ke/jobs"
+
+
+def myjobmag_listing_url(page: int) -> str:
+    return f"{MYJOBMAG_BASE_URL}/page/{page}" if page > 1 else MYJOBMAG_BASE_URL
+
+
+def parse_myjobmag_listing(html: str, page_url: str) -> List[Dict[str, str]]:
+    """Job cards on a MyJobMag listing page as {'title', 'url', 'company'}."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = []
+    for card in soup.select("ul.job-list > li.job-list-li"):
+        link = card.select_one("h2 > a")
+        logo = card.select_one("li.job-logo img")
+        if link is None or logo is None or not link.get("href"):
+            continue
+        cards.append({
+            "title": html_text(link).replace("\n", " "),
+            "url": urljoin(page_url, link["href"]),
+            "company": (logo.get("alt") or "").strip(),
+        })
+    return cards
+
+
+def parse_myjobmag_detail(html: str) -> Optional[Dict[str, str]]:
+    """{'description'} from a MyJobMag job page, or None if it has no job details block."""
+    details = BeautifulSoup(html, HTML_PARSER).select_one("div.job-details")
+    if details is None:
+        return None
+    return {"description": html_text(details)}
+
+
+def myjobmag_record(card: Dict[str, str], detail: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Row in the scrape_myjobmag() schema; Department/DeptNorm are filled in per batch."""
+    if detail is None:
+        return {
+            "Job Title": card["title"], "Company": card["company"], "Description": "",
+            "Minimum Qualification": "", "Skills Required": "", "Skillmentequired": "",
+            "Location": "", "Work Type": "Unclear", "Years of Experience": "", "Category": "",
+            "Department": "", "DeptNorm": "", "Url": card["url"]
+        }
+    description = detail["description"]
+    location = extract_labeled_field(description, "Location")
+    skills = extract_labeled_field(description, "Skills")
+    raw_category = (extract_labeled_field(description, "Category") or extract_labeled_field(description, "Function")
+                    or extract_labeled_field(description, "Industry"))
+    if not raw_category:
+        raw_category = extract_category_from_description(description)
+    return {
+        "Job Title": card["title"],
+        "Company": card["company"],
+        "Description": description,
+        "Minimum Qualification": extract_labeled_field(description, "Qualification"),
+        "Skills Required": skills,
+        "Skillmentequired": skills,  # keep compatibility
+        "Location": location,
+        "Work Type": classify_location(location),
+        "Years of Experience": extract_labeled_field(description, "Experience"),
+        "Category": raw_category,
+        "Department": "",
+        "DeptNorm": "",
+        "Url": card["url"]
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BrighterMonday
+# ─────────────────────────────────────────────────────────────────────────────
+BRIGHTERMONDAY_BASE_URL = "https://www.brightermonday.co.ke/jobs"
+_BM_DESCRIPTION_WAIT = "div[data-cy='job-description'], div.job-description, section.description"
+
+
+def brightermonday_listing_url(page: int) -> str:
+    return f"{BRIGHTERMONDAY_BASE_URL}?page={page}" if page > 1 else BRIGHTERMONDAY_BASE_URL
+
+
+def parse_brightermonday_listing(html: str, page_url: str) -> List[Dict[str, str]]:
+    """Job cards on a BrighterMonday listing page as {'title', 'url', 'company', 'location'}."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    elements = soup.select("article[data-cy='job-card']") or soup.select("div.search-result-item, div[class*='JobCard']")
+    cards = []
+    for card in elements:
+        link = card.select_one("h3 a, h2 a, a[data-cy='job-title']")
+        if link is None or not link.get("href"):
+            continue
+        cards.append({
+            "title": html_text(link).replace("\n", " "),
+            "url": urljoin(page_url, link["href"]),
+            "company": _first_text(card, ["span[data-cy='company-name']", "div.company-name", "p.company"]),
+            "location": _first_text(card, ["span[data-cy='job-location']", "li.location", "span.location"]),
+        })
+    return cards
+
+
+def parse_brightermonday_detail(html: str) -> Optional[Dict[str, str]]:
+    """{'description', 'category', 'experience', 'skills'} from a job page, or None if it has no description block."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    if soup.select_one(_BM_DESCRIPTION_WAIT) is None:
+        return None
+    description = _first_text(soup, ["div[data-cy='job-description']", "div.job-description",
+                                     "section.description", "div.content"])
+    category = _first_text(soup, ["span[data-cy='job-category']", "a[href*='/jobs-by-category/']",
+                                  "li.job-detail-category span"])
+    experience = _first_text(soup, ["li[data-cy='experience']", "span.experience", "li.experience"])
+    skills = " ".join(line.strip() for line in description.split("\n")
+                      if re.search(r"skill|qualification|require|proficien", line.lower()))
+    return {"description": description, "category": category, "experience": experience, "skills": skills[:500]}
+
+
+def brightermonday_record(card: Dict[str, str], detail: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Row in the scrape_brightermonday() schema; Department/DeptNorm are filled in per batch."""
+    detail = detail or {"description": "", "category": "", "experience": "", "skills": ""}
+    return {
+        "Job Title": card["title"],
+        "Company": card["company"],
+        "Description": detail["description"][:2000],
+        "Minimum Qualification": "",
+        "Skills Required": detail["skills"],
+        "Skillmentequired": detail["skills"],
+        "Location": card["location"],
+        "Work Type": "Unclear",
+        "Years of Experience": detail["experience"],
+        "Category": detail["category"],
+        "Department": "",
+        "DeptNorm": "",
+        "Url": card["url"],
+        "Source": "BrighterMonday"
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Engine
+# ─────────────────────────────────────────────────────────────────────────────
+SOURCES: Dict[str, Dict[str, Any]] = {
+    "myjobmag": {
+        "listing_url": myjobmag_listing_url,
+        "listing_wait": "ul.job-list > li.job-list-li",
+        "parse_listing": parse_myjobmag_listing,
+        "detail_wait": "div.job-details",
+        "parse_detail": parse_myjobmag_detail,
+        "record": myjobmag_record,
+        # MyJobMag normalises the keyword department; BrighterMonday prefers the site's category
+        "prefer_category": False,
+        "json_path": "data/myjobmag_jobs.json",
+        "csv_path": "data/myjobmag_jobs.csv",
+        "stream_path": "data/myjobmag_jobs.jsonl",
+    },
+    "brightermonday": {
+        "listing_url": brightermonday_listing_url,
+        "listing_wait": "article[data-cy='job-card']",
+        "parse_listing": parse_brightermonday_listing,
+        "detail_wait": _BM_DESCRIPTION_WAIT,
+        "parse_detail": parse_brightermonday_detail,
+        "record": brightermonday_record,
+        "prefer_category": True,
+        "json_path": "data/brightermonday_jobs.json",
+        "csv_path": "data/brightermonday_jobs.csv",
+        "stream_path": "data/brightermonday_jobs.jsonl",
+    },
+}
+
+DEFAULT_OUTPUT = "default"
+
+
+def _classify_records(records: List[Dict[str, str]], prefer_category: bool):
+    """Fill Department/DeptNorm for all records with the batch classifier."""
+    if not records:
+        return
+    df = pd.DataFrame(records)
+    departments = classify_departments(df)
+    raw = departments
+    if prefer_category:
+        category = df["Category"].fillna('').astype(str).str.strip()
+        raw = category.where(category != '', departments)
+    text = df["Job Title"] + " " + df["Description"] + " " + df["Skills Required"]
+    dept_norm = normalize_departments(raw, text)
+    for record, dept, norm in zip(records, departments, dept_norm):
+        record["Department"] = dept
+        record["DeptNorm"] = norm
+
+
+def scrape_source(source: str,
+                  pages: int = 5,
+                  fetcher: Any = None,
+                  fixture_dir: Optional[str] = None,
+                  record_dir: Optional[str] = None,
+                  selenium_fallback: Optional[bool] = None,
+                  workers: int = 4,
+                  delay: float = 0.5,
+                  json_path: Optional[str] = DEFAULT_OUTPUT,
+                  csv_path: Optional[str] = DEFAULT_OUTPUT,
+                  seen_store: Any = None,
+                  stream_path: Optional[str] = DEFAULT_OUTPUT,
+                  resume: bool = True,
+                  return_records: bool = True) -> Any:
+    """
+    Scrape one source over HTTP into job dicts in the Selenium scrapers' schema.
+
+    Jobs are streamed to a JSONL file page by page with a checkpoint after each
+    page; an interrupted run is resumed from its checkpoint. JSON/CSV outputs
+    are converted from the stream at the end.
+
+    Args:
+        source (str): 'myjobmag' or 'brightermonday'
+        pages (int): Listing pages to walk
+        fetcher: Page fetcher to use (defaults to FixtureFetcher(fixture_dir) or HttpFetcher)
+        fixture_dir (str): Replay saved HTML from this directory instead of the network
+        record_dir (str): Save every fetched page here (for building fixtures)
+        selenium_fallback (bool): Re-fetch pages with no job content through headless
+            Chrome (default: on for live scraping, off for fixture replay)
+        workers (int): Concurrent detail-page fetches
+        delay (float): Minimum interval between requests to the source's host,
+            enforced by a token bucket shared by all workers (0 when replaying)
+        json_path / csv_path (str): Output files; the source's data/ files by default, None to skip
+        seen_store (SeenStore): Skip detail pages scraped on earlier runs and stop paginating
+            once a page is mostly known (full scrape when None)
+        stream_path (str): JSONL stream (the source's data/ file by default, None for a temp file)
+        resume (bool): Continue an interrupted run from its checkpoint
+        return_records (bool): Return the records (read back from the stream) rather than their count
+
+    Returns:
+        list | int: Job records, or the number of jobs if `return_records` is False
+    """
+    spec = SOURCES[source]
+    replay = fetcher is None and fixture_dir is not None
+    if fetcher is None:
+        fetcher = FixtureFetcher(fixture_dir) if replay else HttpFetcher(pool_size=max(workers, 1), record_dir=record_dir)
+    if selenium_fallback is None:
+        selenium_fallback = not replay
+    if replay:
+        delay = 0.0
+    fallback = SeleniumFetcher(record_dir=record_dir) if selenium_fallback else None
+    # The one Selenium driver is not thread-safe: workers fetch over HTTP concurrently
+    # and take turns only for the (rare) browser re-fetch
+    fallback_lock = threading.Lock()
+    limiter = HostRateLimiter(1 / delay if delay else 0)
+
+    def _fetch(url: str, wait_css: str, parse: Callable[[str], Any]) -> Any:
+        limiter.wait(url)
+        html = fetcher.get(url)
+        parsed = parse(html) if html else None
+        if not parsed and fallback is not None:
+            with fallback_lock:
+                limiter.wait(url)
+                html = fallback.get(url, wait_css=wait_css)
+            parsed = parse(html) if html else None
+        return parsed
+
+    def _detail(card: Dict[str, str]) -> Dict[str, str]:
+        return spec["record"](card, _fetch(card["url"], spec["detail_wait"], spec["parse_detail"]))
+
+    stream = JobStream(spec["stream_path"] if stream_path == DEFAULT_OUTPUT else stream_path, source, resume=resume)
+    if stream.resumed:
+        _log(f"Resuming {source} at page {stream.start_page} ({stream.jobs_written} jobs already streamed)")
+    stopped_early = stream.state.get("stopped_early", False)
+    try:
+        for page in range(stream.start_page, pages + 1):
+            url = spec["listing_url"](page)
+            _log(f"Fetching {source} page {page}: {url}")
+            cards = _fetch(url, spec["listing_wait"], lambda html: spec["parse_listing"](html, url))
+            if not cards:
+                _log(f"No jobs found on page {page}")
+                stream.checkpoint(page + 1)
+                continue
+            fresh, known = seen_store.partition(cards) if seen_store else (cards, {})
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    fetched = list(pool.map(_detail, fresh))
+            else:
+                fetched = [_detail(card) for card in fresh]
+            page_records = merge_page(cards, known, fetched)
+            _classify_records(page_records, spec["prefer_category"])
+            stream.append(page_records)
+            if seen_store:
+                seen_store.mark(source, cards, page_records)
+                _log(f"{len(known)}/{len(cards)} postings on page {page} already scraped")
+                if seen_store.should_stop(len(known), len(cards)):
+                    _log(f"Page {page} is mostly known; stopping pagination")
+                    stopped_early = True
+                    stream.checkpoint(pages + 1, stopped_early=True)
+                    break
+            stream.checkpoint(page + 1)
+
+        if stopped_early and seen_store:
+            # Older postings that were not re-listed on the pages visited stay in the snapshot
+            carried = seen_store.carry_forward(source, stream.urls())
+            _classify_records(carried, spec["prefer_category"])
+            stream.append(carried)
+    finally:
+        fetcher.close()
+        if fallback is not None:
+            fallback.close()
+
+    json_path = spec["json_path"] if json_path == DEFAULT_OUTPUT else json_path
+    csv_path = spec["csv_path"] if csv_path == DEFAULT_OUTPUT else csv_path
+    total = export_stream(stream.path, json_path, csv_path)
+    records = list(stream.records()) if return_records else None
+    stream.finish()
+    stream.close()
+    _log(f"Scraped {total} {source} jobs.")
+    return records if return_records else total
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Browserless job scraper (HTTP + HTML parsing, Selenium fallback)")
+    parser.add_argument("--source", choices=list(SOURCES) + ["all"], default="all")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--fixtures", help="Replay saved HTML from this directory (offline, nothing written)")
+    parser.add_argument("--record", help="Save fetched pages to this directory as fixtures")
+    parser.add_argument("--no-selenium", action="store_true", help="Disable the Selenium fallback")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for name in (SOURCES if args.source == "all" else [args.source]):
+        start = time.perf_counter()
+        jobs = scrape_source(
+            name, pages=args.pages, fixture_dir=args.fixtures, record_dir=args.record,
+            selenium_fallback=False if args.no_selenium else None, workers=args.workers, delay=args.delay,
+            json_path=None if args.fixtures else DEFAULT_OUTPUT,
+            csv_path=None if args.fixtures else DEFAULT_OUTPUT,
+            stream_path=None if args.fixtures else DEFAULT_OUTPUT,
+            return_records=False
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {jobs} jobs in {elapsed:.2f}s ({jobs / max(elapsed, 1e-9):.1f} jobs/s)")
@@ -0,0 +1,197 @@
+"""
+Embedded SQLite job store with an FTS5 full-text index.
+
+The ETL upserts every scraped snapshot into `data/jobs_search.db`; postings are
+keyed by the same title|company|description hash as the classifier's job
+indexes, so re-scraping a posting only bumps its `last_seen` date. Search runs
+ranked (bm25) keyword queries inside SQLite, so callers never load the corpus
+into pandas.
+"""
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Any, Optional # type: ignore
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, 'data', 'jobs_search.db')
+
+# bm25 column weights for (title, company, description, skills)
+_BM25_WEIGHTS = (5.0, 1.0, 1.0, 2.0)
+
+_QUERY_STOP_WORDS = {
+    'i', 'a', 'an', 'the', 'and', 'or', 'to', 'of', 'in', 'on', 'for', 'with', 'at', 'by', 'is', 'am',
+    'be', 'want', 'like', 'love', 'enjoy', 'my', 'me', 'job', 'jobs', 'work', 'career',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT UNIQUE NOT NULL,
+    title TEXT,
+    company TEXT,
+    description TEXT,
+    skills TEXT,
+    location TEXT,
+    department TEXT,
+    url TEXT,
+    source TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_department ON jobs(department);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description, skills,
+    content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, description, skills)
+    VALUES (new.id, new.title, new.company, new.description, new.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, skills)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.skills);
+END;
+DROP TRIGGER IF EXISTS jobs_au;
+CREATE TRIGGER IF NOT EXISTS jobs_au_text AFTER UPDATE OF title, company, description, skills ON jobs
+WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+  OR old.description IS NOT new.description OR old.skills IS NOT new.skills
+BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, skills)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.skills);
+    INSERT INTO jobs_fts(rowid, title, company, description, skills)
+    VALUES (new.id, new.title, new.company, new.description, new.skills);
+END;
+"""
+
+
+def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open (creating if needed) the job search database."""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _text(value: Any) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+
+def upsert_jobs(conn: sqlite3.Connection, jobs_df: Any, seen_on: Optional[str] = None) -> Dict[str, int]:
+    """
+    Insert new postings from a scraped snapshot and refresh known ones.
+
+    Only new rows (and rows whose skills text changed) touch the FTS index:
+    the update trigger re-indexes a row only when one of its text columns
+    actually changed, so re-seen postings just get `last_seen`, department and
+    location updated.
+    Returns {'inserted': n, 'updated': n}.
+    """
+    from core.job_keys import job_key # type: ignore
+
+    seen_on = seen_on or datetime.now().strftime('%Y-%m-%d')
+    before = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    rows = []
+    for record in jobs_df.to_dict('records'):
+        title, company, desc = record.get('Job Title'), record.get('Company'), record.get('Description')
+        skills = record.get('Skills Required', record.get('Skillmentequired'))
+        dept = record.get('DeptNorm', record.get('Department'))
+        rows.append((
+            job_key(title, company, desc), _text(title), _text(company), _text(desc), _text(skills),
+            _text(record.get('Location')), _text(dept), _text(record.get('Url')), _text(record.get('Source')),
+            seen_on, seen_on,
+        ))
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO jobs (job_key, title, company, description, skills, location, department, url, source, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_key) DO UPDATE SET
+                last_seen = excluded.last_seen,
+                department = excluded.department,
+                location = excluded.location,
+                skills = excluded.skills
+        """, rows)
+    inserted = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - before
+    return {'inserted': inserted, 'updated': len(rows) - inserted}
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 OR-query of quoted terms (no FTS syntax leaks through)."""
+    terms = []
+    for tok in re.findall(r'\w+', (text or '').lower()):
+        if len(tok) > 1 and tok not in _QUERY_STOP_WORDS and tok not in terms:
+            terms.append(tok)
+    return ' OR '.join(f'"{t}"' for t in terms)
+
+
+def search_jobs(query: str, department: Optional[str] = None, limit: int = 20,
+                seen_since: Optional[str] = None, db_path: str = DEFAULT_DB_PATH) -> List[Dict[str, Any]]:
+    """
+    Ranked keyword search over the job store.
+
+    Returns records keyed like the jobs CSV ('Job Title', 'Company', 'Description',
+    'Skills Required', 'Location', 'DeptNorm', 'Url', 'Source') plus 'score'
+    (higher is better) and 'last_seen'. Returns [] if the database is missing.
+    """
+    match = build_match_query(query)
+    if not match or not os.path.exists(db_path):
+        return []
+
+    sql = f"""
+        SELECT j.title, j.company, j.description, j.skills, j.location, j.department, j.url, j.source,
+               j.last_seen, bm25(jobs_fts, {', '.join(str(w) for w in _BM25_WEIGHTS)}) AS rank
+        FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid
+        WHERE jobs_fts MATCH ?
+    """
+    params: List[Any] = [match]
+    if department:
+        sql += " AND j.department = ?"
+        params.append(department)
+    if seen_since:
+        sql += " AND j.last_seen >= ?"
+        params.append(seen_since)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(int(limit))
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [{
+        'Job Title': r[0], 'Company': r[1], 'Description': r[2], 'Skills Required': r[3],
+        'Location': r[4], 'DeptNorm': r[5], 'Url': r[6], 'Source': r[7],
+        'last_seen': r[8], 'score': round(-r[9], 4),
+    } for r in rows]
+
+
+def job_count(db_path: str = DEFAULT_DB_PATH) -> int:
+    """Number of postings in the store (0 if it does not exist yet)."""
+    if not os.path.exists(db_path):
+        return 0
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def update_from_csv(csv_path: str, db_path: str = DEFAULT_DB_PATH) -> Dict[str, int]:
+    """Upsert a jobs CSV (e.g. the merged snapshot) into the store."""
+    import pandas as pd # type: ignore
+    conn = connect(db_path)
+    try:
+        return upsert_jobs(conn, pd.read_csv(csv_path))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(PROJECT_ROOT)
+    stats = update_from_csv(os.path.join(PROJECT_ROOT, 'data', 'myjobmag_jobs.csv'))
+    print(f"Job search DB updated: {stats['inserted']} new, {stats['updated']} refreshed ({job_count():,} total)")
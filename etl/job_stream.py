@@ -0,0 +1,238 @@
+"""
+Streaming, checkpointed scraper output.
+
+Scrapers append every job to a JSONL file as soon as its listing page is
+done and record a checkpoint (next page, jobs written) after each page, so a
+crash loses at most the page in flight and the next run resumes from the
+checkpoint. The JSON/CSV (and optional Parquet) files the rest of the ETL
+reads are produced afterwards by converters that stream the JSONL in chunks.
+"""
+import os
+import json
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional # type: ignore
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Records of a JSONL file, one at a time (a truncated last line is ignored)."""
+    if not path or not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _chunks(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for record in iter_jsonl(path):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _atomic_write(path: str, text: str):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class JobStream:
+    """
+    Append-only JSONL job stream with a pagination checkpoint next to it.
+
+    Args:
+        jsonl_path (str): Stream file; None streams to a temporary file (no resume)
+        source (str): Scraper name stored in the checkpoint (a checkpoint of another source is ignored)
+        resume (bool): Continue from an unfinished checkpoint instead of starting over
+    """
+
+    def __init__(self, jsonl_path: Optional[str], source: str, resume: bool = True):
+        self._tmpdir = None
+        if jsonl_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            jsonl_path = os.path.join(self._tmpdir.name, f"{source}.jsonl")
+            resume = False
+        self.path = jsonl_path
+        self.checkpoint_path = f"{os.path.splitext(jsonl_path)[0]}.checkpoint.json"
+        self.source = source
+        self.state: Dict[str, Any] = {}
+        self.jobs_written = 0
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint:
+            self.state = checkpoint.get('state', {})
+            self.jobs_written = int(checkpoint.get('jobs_written', 0))
+            self.start_page = int(checkpoint.get('next_page', 1))
+            self._truncate_to(self.jobs_written)
+        else:
+            self.start_page = 1
+            open(self.path, 'w', encoding='utf-8').close()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    @property
+    def resumed(self) -> bool:
+        return self.start_page > 1
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            if os.path.exists(self.checkpoint_path) and os.path.exists(self.path):
+                with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+                if checkpoint.get('source') == self.source and not checkpoint.get('done'):
+                    return checkpoint
+        except Exception as e:
+            print(f"Warning: Could not read scraper checkpoint {self.checkpoint_path}: {e}")
+        return None
+
+    def _truncate_to(self, n_lines: int):
+        """Drop anything written after the last checkpoint (a page that was in flight)."""
+        with open(self.path, 'r+', encoding='utf-8') as f:
+            offset = 0
+            for _ in range(n_lines):
+                line = f.readline()
+                if not line:
+                    break
+                offset += len(line.encode('utf-8'))
+            f.seek(offset)
+            f.truncate()
+
+    def append(self, records: List[Optional[Dict[str, Any]]]):
+        """Append records (None entries are skipped) and flush them to disk."""
+        for record in records:
+            if record:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.jobs_written += 1
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def checkpoint(self, next_page: int, **state: Any):
+        """Persist pagination state; a resumed run starts at `next_page`."""
+        self.state.update(state)
+        _atomic_write(self.checkpoint_path, json.dumps({
+            'source': self.source, 'next_page': next_page, 'jobs_written': self.jobs_written,
+            'state': self.state, 'updated_at': datetime.now().isoformat(timespec='seconds'), 'done': False,
+        }))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        self._file.flush()
+        return iter_jsonl(self.path)
+
+    def urls(self) -> List[str]:
+        return [r.get('Url') for r in self.records()]
+
+    def finish(self):
+        """Mark the run complete so the next one starts fresh."""
+        self._file.close()
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+
+def jsonl_to_json(jsonl_path: str, json_path: str):
+    """Write the stream as a JSON array (same layout as json.dump(..., indent=2)) without loading it."""
+    os.makedirs(os.path.dirname(json_path) or '.', exist_ok=True)
+    with open(json_path, 'w', encoding='utf-8') as out:
+        first = True
+        for record in iter_jsonl(jsonl_path):
+            body = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            out.write(("[\n  " if first else ",\n  ") + body)
+            first = False
+        out.write("[]" if first else "\n]")
+
+
+def jsonl_to_csv(jsonl_path: str, csv_path: str, chunk_size: int = 1000) -> int:
+    """
+    Write the stream as CSV `chunk_size` records at a time. Columns are every
+    key seen, in first-seen order (as pd.DataFrame(records) would give).
+    Returns the number of rows written.
+    """
+    import pandas as pd # type: ignore
+
+    columns: List[str] = []
+    seen = set()
+    for record in iter_jsonl(jsonl_path):
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+
+    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+    if not columns:
+        pd.DataFrame().to_csv(csv_path, index=False, encoding='utf-8')
+        return 0
+    rows = 0
+    for i, chunk in enumerate(_chunks(jsonl_path, chunk_size)):
+        pd.DataFrame(chunk, columns=columns).to_csv(
+            csv_path, index=False, encoding='utf-8', mode='w' if i == 0 else 'a', header=(i == 0)
+        )
+        rows += len(chunk)
+    return rows
+
+
+def jsonl_to_parquet(jsonl_path: str, parquet_path: str, chunk_size: int = 5000) -> int:
+    """Columnar copy of the stream (all columns as strings), written in row groups. Needs pyarrow."""
+    import pyarrow as pa # type: ignore
+    import pyarrow.parquet as pq # type: ignore
+
+    columns: List[str] = []
+    seen = set()
+    for record in iter_jsonl(jsonl_path):
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    schema = pa.schema([(c, pa.string()) for c in columns])
+
+    os.makedirs(os.path.dirname(parquet_path) or '.', exist_ok=True)
+    rows = 0
+    with pq.ParquetWriter(parquet_path, schema) as writer:
+        for chunk in _chunks(jsonl_path, chunk_size):
+            data = {c: [None if r.get(c) is None else str(r.get(c)) for r in chunk] for c in columns}
+            writer.write_table(pa.table(data, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def export_stream(jsonl_path: str, json_path: Optional[str] = None, csv_path: Optional[str] = None,
+                  parquet_path: Optional[str] = None) -> int:
+    """Convert a finished stream to the requested outputs; returns the number of jobs."""
+    if json_path:
+        jsonl_to_json(jsonl_path, json_path)
+    rows = sum(1 for _ in iter_jsonl(jsonl_path))
+    if csv_path:
+        jsonl_to_csv(jsonl_path, csv_path)
+    if parquet_path:
+        try:
+            jsonl_to_parquet(jsonl_path, parquet_path)
+        except ImportError:
+            print("Warning: pyarrow is not installed; skipping Parquet output.")
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert a scraper JSONL stream to JSON/CSV/Parquet")
+    parser.add_argument("jsonl")
+    parser.add_argument("--json")
+    parser.add_argument("--csv")
+    parser.add_argument("--parquet")
+    args = parser.parse_args()
+    print(f"{export_stream(args.jsonl, args.json, args.csv, args.parquet)} jobs converted")
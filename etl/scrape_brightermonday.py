@@ -1,30 +1,28 @@
 """
 BrighterMonday Kenya Scraper
 ============================
-Scrapes job listings from https://www.brightermonday.co.ke using Selenium.
+Scrapes job listings from https://www.brightermonday.co.ke using a pool of Selenium drivers.
 Produces the same column schema as extract_jobs.py (MyJobMag) so both
 data sources can be merged cleanly by update_jobs.py.
 """
 
-import time
-import json
 import re
-import os
-import pandas as pd # type: ignore
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 from selenium import webdriver # type: ignore
 from selenium.webdriver.chrome.service import Service # type: ignore
 from selenium.webdriver.chrome.options import Options # type: ignore
 from selenium.webdriver.common.by import By # type: ignore
-from selenium.webdriver.support.ui import WebDriverWait # type: ignore
-from selenium.webdriver.support import expected_conditions as EC # type: ignore
 from webdriver_manager.chrome import ChromeDriverManager # type: ignore
 
 # Reuse shared classification utilities from the existing ETL module
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from etl.extract_jobs import classify_department, normalize_department # type: ignore
+from etl.driver_pool import DriverPool # type: ignore
+from etl.seen_store import merge_page # type: ignore
+from etl.job_stream import JobStream, export_stream # type: ignore
 
 # ─────────────────────────────────────────────────────────────────────────────
 def _log(msg: str):
@@ -60,160 +58,179 @@ def _safe_attr(driver, css: str, attr: str, parent=None) -> str:
         return ""
 
 # ─────────────────────────────────────────────────────────────────────────────
+BASE_URL = "https://www.brightermonday.co.ke/jobs"
+_DESCRIPTION_CSS = "div[data-cy='job-description'], div.job-description, section.description"
+
+def _listing_cards(pool, driver, url: str) -> list:
+    """Job cards on one listing page as dicts (WebElements do not outlive the driver call)."""
+    # Wait for job cards to render
+    if not pool.load(driver, url, "article[data-cy='job-card']"):
+        _log("⚠️  No job cards found, trying fallback…")
+        if not pool.load(driver, url, "div.search-result-item, div[class*='JobCard'], a[href*='/jobs/']"):
+            return []
+
+    cards = driver.find_elements(By.CSS_SELECTOR, "article[data-cy='job-card']")
+    if not cards:
+        # Broad fallback selector
+        cards = driver.find_elements(
+            By.CSS_SELECTOR, "div.search-result-item, div[class*='JobCard']"
+        )
+
+    found = []
+    for card in cards:
+        try:
+            # ── Title + URL ──────────────────────────────────────
+            title_elem = card.find_element(By.CSS_SELECTOR, "h3 a, h2 a, a[data-cy='job-title']")
+            job_title = title_elem.text.strip()
+            job_link  = title_elem.get_attribute("href")
+        except Exception:
+            continue
+
+        # ── Company ───────────────────────────────────────────
+        company = ""
+        for sel in ["span[data-cy='company-name']", "div.company-name", "p.company"]:
+            company = _safe_text(driver, sel, parent=card)
+            if company:
+                break
+
+        # ── Location (card-level) ─────────────────────────────
+        location = ""
+        for sel in ["span[data-cy='job-location']", "li.location", "span.location"]:
+            location = _safe_text(driver, sel, parent=card)
+            if location:
+                break
+
+        found.append({"title": job_title, "url": job_link, "company": company, "location": location})
+    return found
+
+def _job_record(pool, driver, card: dict) -> dict:
+    """Visit one job's detail page for description + category and build its record."""
+    job_title, job_link = card["title"], card["url"]
+    description, category, skills_text, experience = "", "", "", ""
+    try:
+        if not pool.load(driver, job_link, _DESCRIPTION_CSS):
+            raise TimeoutError("job description did not load")
+        for sel in ["div[data-cy='job-description']", "div.job-description", "section.description", "div.content"]:
+            description = _safe_text(driver, sel)
+            if description:
+                break
+
+        # Extract category label shown on detail page
+        for sel in ["span[data-cy='job-category']", "a[href*='/jobs-by-category/']",
+                    "li.job-detail-category span"]:
+            category = _safe_text(driver, sel)
+            if category:
+                break
+
+        # Extract experience text
+        for sel in ["li[data-cy='experience']", "span.experience", "li.experience"]:
+            experience = _safe_text(driver, sel)
+            if experience:
+                break
+
+        # Try to grab skills / required info from description
+        for line in description.split("\n"):
+            if re.search(r"skill|qualification|require|proficien", line.lower()):
+                skills_text += line.strip() + " "
+        skills_text = skills_text.strip()[:500]
+
+    except Exception:
+        pass
+
+    # ── Department classification ──────────────────────────
+    classified_dept = classify_department(job_title, description, skills_text)
+    dept_norm = normalize_department(
+        category if category else classified_dept,
+        f"{job_title} {description} {skills_text}"
+    )
+
+    return {
+        "Job Title":              job_title,
+        "Company":                card["company"],
+        "Description":            description[:2000],
+        "Minimum Qualification":  "",
+        "Skills Required":        skills_text,
+        "Skillmentequired":       skills_text,
+        "Location":               card["location"],
+        "Work Type":              "Unclear",
+        "Years of Experience":    experience,
+        "Category":               category,
+        "Department":             classified_dept,
+        "DeptNorm":               dept_norm,
+        "Url":                    job_link,
+        "Source":                 "BrighterMonday"
+    }
+
 def scrape_brightermonday(pages: int = 5,
                           headless: bool = True,
                           delay: float = 1.5,
                           json_path: str = "data/brightermonday_jobs.json",
-                          csv_path:  str = "data/brightermonday_jobs.csv") -> list:
+                          csv_path:  str = "data/brightermonday_jobs.csv",
+                          workers: int = 4,
+                          pool=None,
+                          seen_store=None,
+                          stream_path: str = "data/brightermonday_jobs.jsonl",
+                          resume: bool = True,
+                          return_records: bool = True):
     """
     Scrape BrighterMonday Kenya and return a list of job dicts with the same
     schema as extract_jobs.scrape_myjobmag().
-    """
-    driver = _build_driver(headless)
-    wait  = WebDriverWait(driver, 20)
-    all_jobs: list[dict] = []
 
-    BASE_URL = "https://www.brightermonday.co.ke/jobs"
+    Detail pages are loaded concurrently by `workers` pooled drivers; `delay`
+    is the minimum interval between page loads on brightermonday.co.ke (per-host
+    token bucket). Pass a shared `pool` to reuse the MyJobMag scraper's drivers,
+    and a `seen_store` (etl.seen_store.SeenStore) to only fetch postings not scraped before.
+    Jobs stream to `stream_path` (JSONL, checkpointed per page, resumable) and
+    the JSON/CSV files are converted from it at the end; with `return_records`
+    False only the job count is returned.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(size=workers, headless=headless, rate_per_host=1 / delay if delay else 0)
+    stream = JobStream(stream_path, "brightermonday", resume=resume)
+    if stream.resumed:
+        _log(f"↩️  Resuming at page {stream.start_page} ({stream.jobs_written} jobs already streamed)")
+    stopped_early = stream.state.get("stopped_early", False)
 
     try:
-        for page in range(1, pages + 1):
+        for page in range(stream.start_page, pages + 1):
             url = f"{BASE_URL}?page={page}" if page > 1 else BASE_URL
             _log(f"📄 Fetching page {page}: {url}")
-            driver.get(url)
-
-            # Wait for job cards to render
-            try:
-                wait.until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "article[data-cy='job-card']")
-                ))
-            except Exception:
-                _log(f"⚠️  No job cards found on page {page}, trying fallback…")
-                try:
-                    wait.until(EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div.search-result-item, div[class*='JobCard'], a[href*='/jobs/']")
-                    ))
-                except Exception:
-                    _log(f"❌  Skipping page {page}")
-                    continue
-
-            cards = driver.find_elements(By.CSS_SELECTOR, "article[data-cy='job-card']")
+            cards = pool.map(partial(_listing_cards, pool), [url])[0]
             if not cards:
-                # Broad fallback selector
-                cards = driver.find_elements(
-                    By.CSS_SELECTOR, "div.search-result-item, div[class*='JobCard']"
-                )
+                _log(f"❌  Skipping page {page}")
+                stream.checkpoint(page + 1)
+                continue
 
             _log(f"   Found {len(cards)} job card(s) on page {page}")
-
-            for card in cards:
-                try:
-                    # ── Title + URL ──────────────────────────────────────
-                    title_elem = card.find_element(By.CSS_SELECTOR, "h3 a, h2 a, a[data-cy='job-title']")
-                    job_title = title_elem.text.strip()
-                    job_link  = title_elem.get_attribute("href")
-                except Exception:
-                    continue
-
-                # ── Company ───────────────────────────────────────────
-                company = ""
-                for sel in ["span[data-cy='company-name']", "div.company-name", "p.company"]:
-                    company = _safe_text(driver, sel, parent=card)
-                    if company:
-                        break
-
-                # ── Location (card-level) ─────────────────────────────
-                location = ""
-                for sel in ["span[data-cy='job-location']", "li.location", "span.location"]:
-                    location = _safe_text(driver, sel, parent=card)
-                    if location:
-                        break
-
-                # ── Visit detail page for description + category ───────
-                description: str = ""
-                category: str = ""
-                skills_text: str = ""
-                experience: str = ""
-                description, category, skills_text, experience = "", "", "", ""
-                driver.execute_script("window.open('');")
-                driver.switch_to.window(driver.window_handles[-1])
-                try:
-                    driver.get(job_link)
-                    wait.until(EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div[data-cy='job-description'], div.job-description, section.description")
-                    ))
-                    for sel in ["div[data-cy='job-description']", "div.job-description", "section.description", "div.content"]:
-                        description = _safe_text(driver, sel)
-                        if description:
-                            break
-
-                    # Extract category label shown on detail page
-                    for sel in ["span[data-cy='job-category']", "a[href*='/jobs-by-category/']",
-                                "li.job-detail-category span"]:
-                        category = _safe_text(driver, sel)
-                        if category:
-                            break
-
-                    # Extract experience text
-                    for sel in ["li[data-cy='experience']", "span.experience", "li.experience"]:
-                        experience = _safe_text(driver, sel)
-                        if experience:
-                            break
-
-                    # Try to grab skills / required info from description
-                    from typing import Any
-                    desc_content: Any = description or ""
-                    for line in desc_content.split("\n"): # type: ignore
-                        if re.search(r"skill|qualification|require|proficien", line.lower()):
-                            skills_text += str(line).strip() + " " # type: ignore
-                    
-                    st_any: Any = skills_text
-                    skills_text = str(st_any.strip())[:500] # type: ignore
-
-                except Exception:
-                    pass
-                finally:
-                    try:
-                        driver.close()
-                    except Exception:
-                        pass
-                    driver.switch_to.window(driver.window_handles[0])
-
-                # ── Department classification ──────────────────────────
-                classified_dept = classify_department(job_title, description, skills_text)
-                dept_norm = normalize_department(
-                    category if category else classified_dept,
-                    f"{job_title} {description} {skills_text}"
-                )
-
-                all_jobs.append({
-                    "Job Title":              job_title,
-                    "Company":                company,
-                    "Description":            str(description)[:2000],   # type: ignore
-                    "Minimum Qualification":  "",
-                    "Skills Required":        skills_text,
-                    "Skillmentequired":       skills_text,
-                    "Location":               location,
-                    "Work Type":              "Unclear",
-                    "Years of Experience":    experience,
-                    "Category":               category,
-                    "Department":             classified_dept,
-                    "DeptNorm":               dept_norm,
-                    "Url":                    job_link,
-                    "Source":                 "BrighterMonday"
-                })
-                time.sleep(delay)
+            fresh, known = seen_store.partition(cards) if seen_store else (cards, {})
+            jobs = merge_page(cards, known, pool.map(partial(_job_record, pool), fresh))
+            stream.append(jobs)
+            if seen_store:
+                seen_store.mark("brightermonday", cards, jobs)
+                _log(f"   {len(known)}/{len(cards)} already scraped")
+                if seen_store.should_stop(len(known), len(cards)):
+                    _log(f"   Page {page} is mostly known; stopping pagination")
+                    stopped_early = True
+                    stream.checkpoint(pages + 1, stopped_early=True)
+                    break
+            stream.checkpoint(page + 1)
+
+        if stopped_early and seen_store:
+            stream.append(seen_store.carry_forward("brightermonday", stream.urls()))
 
     finally:
-        driver.quit()
+        if own_pool:
+            pool.close()
 
     # ── Persist results ────────────────────────────────────────────────────
-    os.makedirs(os.path.dirname(json_path) if os.path.dirname(json_path) else ".", exist_ok=True)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(all_jobs, f, indent=2, ensure_ascii=False)
-    pd.DataFrame(all_jobs).to_csv(csv_path, index=False, encoding="utf-8")
+    total = export_stream(stream.path, json_path, csv_path)
+    all_jobs = list(stream.records()) if return_records else None
+    stream.finish()
+    stream.close()
 
-    _log(f"✅  Saved {len(all_jobs)} BrighterMonday jobs → {csv_path}")
-    return all_jobs
+    _log(f"✅  Saved {total} BrighterMonday jobs → {csv_path}")
+    return all_jobs if return_records else total
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,152 @@
+"""
+Persistent store of already-scraped job postings for incremental scraping.
+
+Each posting is keyed by its URL and keeps a content hash (the same
+title|company|description `job_key` the job indexes use), a hash of its
+listing card and the last scraped record. Scrapers use it to skip detail
+pages they have already fetched (re-using the stored record) and to stop
+paginating once a listing page is mostly known, so a steady-state run only
+pays for new postings.
+"""
+import os
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple # type: ignore
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SEEN_DB_PATH = os.path.join(PROJECT_ROOT, 'data', 'seen_jobs.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    url TEXT PRIMARY KEY,
+    source TEXT,
+    card_hash TEXT,
+    content_hash TEXT,
+    record TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_seen_content ON seen_jobs(content_hash);
+CREATE INDEX IF NOT EXISTS idx_seen_source_last ON seen_jobs(source, last_seen);
+"""
+
+
+def card_hash(card: Dict[str, Any]) -> str:
+    """Hash of what a listing card shows (title + company); a change means the posting was edited."""
+    from core.job_keys import job_key # type: ignore
+    return job_key(card.get('title', ''), card.get('company', ''), '')
+
+
+def merge_page(cards: List[Dict[str, Any]], known: Dict[str, Dict[str, Any]],
+               fetched: List[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+    """Records for a listing page in card order: stored ones for known cards, `fetched` (in order) for the rest."""
+    fetched_iter = iter(fetched)
+    return [known[c['url']] if c.get('url') in known else next(fetched_iter) for c in cards]
+
+
+class SeenStore:
+    """
+    Seen-URL store backed by SQLite.
+
+    Args:
+        db_path (str): Database file (created if missing)
+        stop_ratio (float): Stop paginating once this share of a page's cards is already known
+        carry_forward_days (int): After an early stop, postings of the source seen within this
+            many days (but not re-listed on the pages visited) are carried into the snapshot
+        skip_known (bool): False for a full refresh: nothing is skipped, but the store is still updated
+    """
+
+    def __init__(self, db_path: str = DEFAULT_SEEN_DB_PATH, stop_ratio: float = 0.8, carry_forward_days: int = 30,
+                 skip_known: bool = True):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.stop_ratio = stop_ratio
+        self.carry_forward_days = carry_forward_days
+        self.skip_known = skip_known
+        # Pool workers may call mark() from other threads; writes are serialised by sqlite
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+    def partition(self, cards: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Split listing cards into (cards whose detail page must be fetched,
+        {url: stored record} for known, unchanged postings).
+        """
+        if not self.skip_known:
+            return list(cards), {}
+        urls = [c['url'] for c in cards if c.get('url')]
+        stored: Dict[str, Tuple[str, str]] = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT url, card_hash, record FROM seen_jobs WHERE url IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            stored.update({url: (h, rec) for url, h, rec in rows})
+
+        fresh, known = [], {}
+        for card in cards:
+            hit = stored.get(card.get('url'))
+            if hit and hit[0] == card_hash(card) and hit[1]:
+                known[card['url']] = json.loads(hit[1])
+            else:
+                fresh.append(card)
+        return fresh, known
+
+    def should_stop(self, n_known: int, n_cards: int) -> bool:
+        """Whether a listing page is mostly already seen (so older pages will be too)."""
+        return self.skip_known and n_cards > 0 and n_known / n_cards >= self.stop_ratio
+
+    def mark(self, source: str, cards: List[Dict[str, Any]], records: List[Optional[Dict[str, Any]]],
+             seen_on: Optional[str] = None):
+        """
+        Record scraped postings (cards and their records, in the same order).
+        Records without a description (failed detail pages) are not stored, so
+        they are retried next run; known postings just get `last_seen` bumped.
+        """
+        from core.job_keys import job_key # type: ignore
+
+        seen_on = seen_on or datetime.now().strftime('%Y-%m-%d')
+        rows = []
+        for card, record in zip(cards, records):
+            if not record or not record.get('Description') or not card.get('url'):
+                continue
+            rows.append((
+                card['url'], source, card_hash(card),
+                job_key(record.get('Job Title'), record.get('Company'), record.get('Description')),
+                json.dumps(record, ensure_ascii=False), seen_on, seen_on,
+            ))
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO seen_jobs (url, source, card_hash, content_hash, record, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    card_hash = excluded.card_hash,
+                    content_hash = excluded.content_hash,
+                    record = excluded.record,
+                    last_seen = excluded.last_seen
+            """, rows)
+
+    def carry_forward(self, source: str, exclude_urls: List[str]) -> List[Dict[str, Any]]:
+        """Stored records of `source` seen within `carry_forward_days`, minus the URLs already in the snapshot."""
+        since = (datetime.now() - timedelta(days=self.carry_forward_days)).strftime('%Y-%m-%d')
+        exclude = set(exclude_urls)
+        rows = self.conn.execute(
+            "SELECT url, record FROM seen_jobs WHERE source = ? AND last_seen >= ? ORDER BY last_seen DESC, rowid",
+            (source, since)
+        ).fetchall()
+        return [json.loads(rec) for url, rec in rows if url not in exclude and rec]
+
+    def count(self, source: Optional[str] = None) -> int:
+        if source:
+            return self.conn.execute("SELECT COUNT(*) FROM seen_jobs WHERE source = ?", (source,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
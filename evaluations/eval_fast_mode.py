@@ -0,0 +1,163 @@
+import sys
+import os
+import json
+import time
+import statistics
+from typing import List, Dict, Any # type: ignore
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.recommender import CareerRecommender # type: ignore
+from models.nlp_preprocessing import embedding_available # type: ignore
+
+REPORT_PATH = os.path.join(os.path.dirname(__file__), 'fast_mode_report.md')
+
+# Extra probes on top of the ground-truth profiles, covering short and mixed inputs
+PROBE_TEXTS = [
+    "I want to be a nurse",
+    "software developer",
+    "I love coding and building software.",
+    "I want to help sick people in hospitals.",
+    "I enjoy farming and want to grow crops with modern irrigation.",
+    "I want to defend people in court as an advocate.",
+    "I like designing bridges and roads.",
+    "I want to analyse data and build dashboards in power bi.",
+    "I like teaching children and mentoring students.",
+    "I am interested in hotels, travel and tourism.",
+    "I want to fly planes or work in aviation logistics.",
+    "I am not sure, I like many things.",
+]
+
+def _ranking(scores: Dict[str, float]) -> List[str]:
+    return sorted(scores.keys(), key=lambda d: scores[d], reverse=True)
+
+def spearman_rho(rank_a: List[str], rank_b: List[str]) -> float:
+    """Spearman rank correlation between two full rankings of the same departments."""
+    n = len(rank_a)
+    if n < 2:
+        return 1.0
+    pos_b = {d: i for i, d in enumerate(rank_b)}
+    d_sq = sum((i - pos_b.get(d, i)) ** 2 for i, d in enumerate(rank_a))
+    return 1 - (6 * d_sq) / (n * (n * n - 1))
+
+def top_k_overlap(rank_a: List[str], rank_b: List[str], k: int) -> float:
+    """Fraction of the top-k departments shared by both rankings."""
+    return len(set(rank_a[:k]) & set(rank_b[:k])) / k if k > 0 else 0.0
+
+def _timed_classify(rec, text: str, mode: str, repeats: int):
+    jobs_df = rec.jobs_df if not rec.jobs_df.empty else None
+    # Warm-up call so cached indices are not counted
+    scores = rec.classifier.classify(text, jobs_df=jobs_df, mode=mode)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scores = rec.classifier.classify(text, jobs_df=jobs_df, mode=mode)
+        timings.append((time.perf_counter() - start) * 1000)
+    return scores, statistics.median(timings)
+
+def compare_modes(repeats: int = 5) -> Dict[str, Any]:
+    """
+    Run every probe through the "full" and "fast" classifier modes and quantify
+    how far the fast rankings drift from the full three-layer rankings. The
+    "cascade" mode is reported alongside: how often it skipped BERT and whether
+    its top department still matched the full mode.
+    """
+    rec = CareerRecommender()
+    gt_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'evaluation_ground_truth.json')
+    with open(gt_path, 'r') as f:
+        ground_truth = json.load(f)
+
+    cases = [{'text': c['student_text'], 'relevant': c['relevant_departments']} for c in ground_truth]
+    cases += [{'text': t, 'relevant': []} for t in PROBE_TEXTS]
+
+    rows = []
+    for case in cases:
+        full_scores, full_ms = _timed_classify(rec, case['text'], "full", repeats)
+        fast_scores, fast_ms = _timed_classify(rec, case['text'], "fast", repeats)
+        jobs_df = rec.jobs_df if not rec.jobs_df.empty else None
+        cascade_scores, cascade_path = rec.classifier.classify_with_path(case['text'], jobs_df=jobs_df, mode="cascade")
+        full_rank, fast_rank = _ranking(full_scores), _ranking(fast_scores)
+        rows.append({
+            'text': case['text'],
+            'full_top': full_rank[0],
+            'fast_top': fast_rank[0],
+            'top1_agree': full_rank[0] == fast_rank[0],
+            'cascade_path': cascade_path,
+            'cascade_top1_agree': full_rank[0] == _ranking(cascade_scores)[0],
+            'top3_overlap': top_k_overlap(full_rank, fast_rank, 3),
+            'spearman': spearman_rho(full_rank, fast_rank),
+            'full_hit@3': bool(set(case['relevant']) & set(full_rank[:3])) if case['relevant'] else None,
+            'fast_hit@3': bool(set(case['relevant']) & set(fast_rank[:3])) if case['relevant'] else None,
+            'full_ms': full_ms,
+            'fast_ms': fast_ms,
+        })
+
+    labelled = [r for r in rows if r['full_hit@3'] is not None]
+    # The embedding backend silently falls back to keyword vectors when its weights cannot be loaded
+    bert_loaded = embedding_available(rec.classifier.vectorizer.embedding_mode)
+    summary = {
+        'semantic_layer_loaded': bert_loaded,
+        'semantic_layer': "DistilBERT" if bert_loaded else "keyword fallback (DistilBERT weights unavailable)",
+        'cases': len(rows),
+        'top1_agreement': sum(r['top1_agree'] for r in rows) / len(rows),
+        'mean_top3_overlap': statistics.mean(r['top3_overlap'] for r in rows),
+        'mean_spearman': statistics.mean(r['spearman'] for r in rows),
+        'cascade_skip_share': sum(r['cascade_path'] == "fast" for r in rows) / len(rows),
+        'cascade_top1_agreement': sum(r['cascade_top1_agree'] for r in rows) / len(rows),
+        'full_hit@3': sum(r['full_hit@3'] for r in labelled) / len(labelled) if labelled else 0.0,
+        'fast_hit@3': sum(r['fast_hit@3'] for r in labelled) / len(labelled) if labelled else 0.0,
+        'median_full_ms': statistics.median(r['full_ms'] for r in rows),
+        'median_fast_ms': statistics.median(r['fast_ms'] for r in rows),
+    }
+    return {'summary': summary, 'rows': rows}
+
+def write_report(result: Dict[str, Any], path: str = REPORT_PATH):
+    """Write the comparison as a markdown report next to this script."""
+    s = result['summary']
+    lines = [
+        "# Fast vs Full Classifier Mode",
+        "",
+        "Generated by `evaluations/eval_fast_mode.py`.",
+        "",
+    ]
+    if not s['semantic_layer_loaded']:
+        lines += [
+            "> The DistilBERT weights could not be loaded, so the semantic layer used the keyword",
+            "> fallback vectors. Full-mode figures therefore reflect the fallback, not DistilBERT;",
+            "> re-run the script with the model available for representative accuracy and latency.",
+            "",
+        ]
+    lines += [
+        "| Metric | Value |",
+        "| :--- | ---: |",
+        f"| Semantic layer | {s['semantic_layer']} |",
+        f"| Cases | {s['cases']} |",
+        f"| Top-1 agreement | {s['top1_agreement']:.1%} |",
+        f"| Mean top-3 overlap | {s['mean_top3_overlap']:.1%} |",
+        f"| Mean Spearman rho (full ranking) | {s['mean_spearman']:.3f} |",
+        f"| Cascade: requests that skipped BERT | {s['cascade_skip_share']:.1%} |",
+        f"| Cascade: top-1 agreement with full | {s['cascade_top1_agreement']:.1%} |",
+        f"| Ground-truth hit@3 (full) | {s['full_hit@3']:.1%} |",
+        f"| Ground-truth hit@3 (fast) | {s['fast_hit@3']:.1%} |",
+        f"| Median latency full (ms) | {s['median_full_ms']:.2f} |",
+        f"| Median latency fast (ms) | {s['median_fast_ms']:.2f} |",
+        "",
+        "| Input | Full top-1 | Fast top-1 | Top-3 overlap | Spearman | Cascade path | Full ms | Fast ms |",
+        "| :--- | :--- | :--- | ---: | ---: | :--- | ---: | ---: |",
+    ]
+    for r in result['rows']:
+        lines.append(
+            f"| {r['text']} | {r['full_top']} | {r['fast_top']} | {r['top3_overlap']:.0%} | "
+            f"{r['spearman']:.3f} | {r['cascade_path']} | {r['full_ms']:.2f} | {r['fast_ms']:.2f} |"
+        )
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+if __name__ == "__main__":
+    result = compare_modes()
+    print("--- Fast vs Full Classifier Mode ---")
+    for key, value in result['summary'].items():
+        print(f"{key:<20}: {value:.3f}" if isinstance(value, float) else f"{key:<20}: {value}")
+    print(f"\nReport written to {write_report(result)}")
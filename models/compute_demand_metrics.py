@@ -1,13 +1,22 @@
 import pandas as pd # type: ignore
 import os
 
-def compute_demand_metrics(jobs_csv_path="data/jobs.csv", output_path="data/job_demand_metrics.csv"):
+def compute_demand_metrics(jobs_csv_path="data/jobs.csv", output_path="data/job_demand_metrics.csv",
+                           demand_db_path=None, seen_on=None):
     """
     Compute job demand metrics from scraped jobs data.
 
     Args:
         jobs_csv_path (str): Path to the scraped jobs CSV
         output_path (str): Path to save the metrics CSV
+        demand_db_path (str): Optional DemandStore database. The snapshot's new
+            postings are appended to it (dated `seen_on`, default today) and
+            its history adds history_job_count / history_demand_score plus
+            7/30/90-day counts, scores and growth rates to the snapshot's
+            job_count / demand_score. The first run only seeds the store (see
+            models/demand_store.py), so the window columns stay 0 until later
+            runs add postings.
+        seen_on (str): Scrape date (YYYY-MM-DD) for the DemandStore
 
     Returns:
         pd.DataFrame: Demand metrics
@@ -24,6 +33,15 @@ def compute_demand_metrics(jobs_csv_path="data/jobs.csv", output_path="data/job_
     max_count = demand_df['job_count'].max()
     demand_df['demand_score'] = demand_df['job_count'] / max_count
 
+    if demand_db_path:
+        from models.demand_store import DemandStore # type: ignore
+        with DemandStore(demand_db_path) as store:
+            new_postings = store.ingest_csv(jobs_csv_path, seen_on)
+            demand_df = demand_df.merge(store.metrics(), on='Department', how='left')
+        counts = [c for c in demand_df.columns if c == 'history_job_count' or c.startswith('job_count_')]
+        demand_df[counts] = demand_df[counts].fillna(0).astype(int)
+        print(f"{new_postings} new postings added to {demand_db_path}")
+
     # Save to CSV
     demand_df.to_csv(output_path, index=False)
 
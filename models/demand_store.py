@@ -0,0 +1,183 @@
+"""
+Append-only, time-windowed job demand store.
+
+Every scrape run adds the postings it has not seen before (keyed by the same
+title|company|description `job_key` as the other job indexes) to a per-day,
+per-department count. Rolling windows (7/30/90 days), growth rates and the
+normalized `demand_score` are sums over that small daily table, so neither
+the ETL nor the recommender re-aggregates the job history.
+
+The first snapshot ingested into an empty store is a baseline: its postings
+were first seen on unknown earlier dates, so they are filed under
+BASELINE_DAY, which counts towards the all-time history but falls in no
+rolling window. Windows therefore only count postings that appeared after the
+first run, and growth needs two full windows of such runs before it is
+meaningful.
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple # type: ignore
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DEMAND_DB_PATH = os.path.join(PROJECT_ROOT, 'data', 'demand_history.db')
+DEFAULT_WINDOWS = (7, 30, 90)
+# Sorts before every real YYYY-MM-DD day, so no window ever includes it
+BASELINE_DAY = '0000-00-00'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS demand_postings (
+    job_key TEXT PRIMARY KEY,
+    department TEXT,
+    first_seen TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS demand_daily (
+    day TEXT,
+    department TEXT,
+    job_count INTEGER,
+    PRIMARY KEY (day, department)
+);
+"""
+
+
+class DemandStore:
+    """
+    Per-department posting counts by first-seen scrape date (SQLite).
+
+    A posting is counted once, on the day it is first scraped; later
+    department relabels do not move it (the store is append-only).
+
+    Args:
+        db_path (str): Database file (created if missing)
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DEMAND_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+
+    def ingest(self, jobs_df: Any, seen_on: Optional[str] = None, dept_col: str = 'Department',
+               baseline: bool = False) -> int:
+        """
+        Count the postings of a scraped snapshot (or a chunk of one) that are
+        new to the store under `seen_on` (today by default), or under
+        BASELINE_DAY if `baseline` is set. Rows without a department are
+        ignored, as in compute_demand_metrics.
+        Returns the number of new postings.
+        """
+        from core.job_keys import job_key # type: ignore
+
+        seen_on = BASELINE_DAY if baseline else seen_on or datetime.now().strftime('%Y-%m-%d')
+        rows = [
+            (job_key(title, company, desc), dept)
+            for title, company, desc, dept in jobs_df[['Job Title', 'Company', 'Description', dept_col]].itertuples(index=False)
+            if isinstance(dept, str) and dept
+        ]
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (job_key TEXT PRIMARY KEY, department TEXT)")
+            self.conn.execute("DELETE FROM incoming")
+            self.conn.executemany("INSERT OR IGNORE INTO incoming VALUES (?, ?)", rows)
+            self.conn.execute("DELETE FROM incoming WHERE job_key IN (SELECT job_key FROM demand_postings)")
+            new = self.conn.execute("SELECT COUNT(*) FROM incoming").fetchone()[0]
+            self.conn.execute("""
+                INSERT INTO demand_daily (day, department, job_count)
+                SELECT ?, department, COUNT(*) FROM incoming WHERE true GROUP BY department
+                ON CONFLICT(day, department) DO UPDATE SET job_count = job_count + excluded.job_count
+            """, (seen_on,))
+            self.conn.execute("INSERT INTO demand_postings SELECT job_key, department, ? FROM incoming", (seen_on,))
+        return new
+
+    def ingest_csv(self, csv_path: str, seen_on: Optional[str] = None, chunk_size: int = 50000) -> int:
+        """
+        Ingest a jobs CSV `chunk_size` rows at a time, as the baseline if the
+        store is still empty; returns the number of new postings.
+        """
+        import pandas as pd # type: ignore
+        baseline = self.is_empty()
+        return sum(self.ingest(chunk, seen_on, baseline=baseline) for chunk in pd.read_csv(csv_path, chunksize=chunk_size))
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM demand_postings LIMIT 1").fetchone() is None
+
+    def latest_day(self) -> Optional[str]:
+        """Latest scrape day after the baseline (None if there is none yet)."""
+        return self.conn.execute("SELECT MAX(day) FROM demand_daily WHERE day > ?", (BASELINE_DAY,)).fetchone()[0]
+
+    def _window_bounds(self, days: int, as_of: Optional[str], periods_back: int = 0) -> Tuple[str, str]:
+        """(first day, last day) of the `days`-long window ending `periods_back` windows before `as_of`."""
+        end = datetime.strptime(as_of, '%Y-%m-%d') - timedelta(days=days * periods_back)
+        return (end - timedelta(days=days - 1)).strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+    def window_counts(self, days: Optional[int] = None, as_of: Optional[str] = None,
+                      periods_back: int = 0) -> Dict[str, int]:
+        """
+        New postings per department in the `days` days ending at `as_of`
+        (default: the latest scrape day), or over all history, baseline
+        included, if `days` is None. `periods_back` shifts the window back by
+        whole windows (1 = the previous window).
+        """
+        as_of = as_of or self.latest_day()
+        if days is None:
+            rows = self.conn.execute(
+                "SELECT department, SUM(job_count) FROM demand_daily WHERE day <= ? GROUP BY department",
+                (as_of or BASELINE_DAY,)
+            ).fetchall()
+        elif as_of is None:
+            return {}
+        else:
+            rows = self.conn.execute(
+                "SELECT department, SUM(job_count) FROM demand_daily WHERE day BETWEEN ? AND ? GROUP BY department",
+                self._window_bounds(days, as_of, periods_back)
+            ).fetchall()
+        return {dept: int(count) for dept, count in rows}
+
+    def demand(self, days: Optional[int] = None, as_of: Optional[str] = None) -> Any:
+        """
+        Demand metrics for one window, in the job_demand_metrics.csv layout
+        (Department, job_count, demand_score) plus `growth`: the relative change
+        against the previous window of the same length (NaN when that was empty
+        or `days` is None).
+
+        Returns:
+            pd.DataFrame: One row per department seen in the window
+        """
+        import pandas as pd # type: ignore
+
+        current = self.window_counts(days, as_of)
+        previous = self.window_counts(days, as_of, periods_back=1) if days else {}
+        demand_df = pd.DataFrame(sorted(current.items()), columns=['Department', 'job_count'])
+        max_count = demand_df['job_count'].max() if not demand_df.empty else 0
+        demand_df['demand_score'] = demand_df['job_count'] / max_count if max_count else 0.0
+        demand_df['growth'] = [
+            (count - previous[dept]) / previous[dept] if previous.get(dept) else float('nan')
+            for dept, count in zip(demand_df['Department'], demand_df['job_count'])
+        ]
+        return demand_df
+
+    def metrics(self, windows: Iterable[int] = DEFAULT_WINDOWS, as_of: Optional[str] = None) -> Any:
+        """
+        All-time history_job_count / history_demand_score per department plus
+        job_count_<N>d, demand_score_<N>d and growth_<N>d columns for each
+        rolling window.
+        """
+        metrics_df = self.demand(None, as_of).drop(columns=['growth']).rename(columns={
+            'job_count': 'history_job_count', 'demand_score': 'history_demand_score'
+        })
+        for days in windows:
+            window_df = self.demand(days, as_of).rename(columns={
+                'job_count': f'job_count_{days}d', 'demand_score': f'demand_score_{days}d', 'growth': f'growth_{days}d'
+            })
+            metrics_df = metrics_df.merge(window_df, on='Department', how='left')
+            metrics_df[f'job_count_{days}d'] = metrics_df[f'job_count_{days}d'].fillna(0).astype(int)
+            metrics_df[f'demand_score_{days}d'] = metrics_df[f'demand_score_{days}d'].fillna(0.0)
+        return metrics_df
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,76 @@
+import os
+from typing import Dict, List, Any, Optional, Tuple # type: ignore
+import numpy as np # type: ignore
+import torch # type: ignore
+from .nlp_preprocessing import get_bert_embeddings_batch, get_static_embedding, _load_static_table # type: ignore
+
+DEFAULT_CENTROIDS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'dept_job_centroids.npz')
+
+
+def embed_texts(texts: List[str], embedding_mode: str = "bert", batch_size: int = 32) -> Any:
+    """
+    Embed many texts with the given mode; returns a float32 (n, dim) numpy array.
+
+    These vectors are saved under the mode's name, so unlike the query-time
+    embeddings there is no keyword fallback: if the mode's backend cannot be
+    loaded this raises instead of returning vectors from another space.
+    """
+    if embedding_mode == "static":
+        _load_static_table()
+        vectors = torch.stack([get_static_embedding(t) for t in texts]) if texts else torch.zeros((0, 768))
+    else:
+        vectors = get_bert_embeddings_batch(texts, batch_size=batch_size, fallback=False)
+    return vectors.detach().cpu().numpy().astype(np.float32)
+
+
+def build_department_centroids(jobs_df: Any, output_path: str = DEFAULT_CENTROIDS_PATH,
+                               embedding_mode: str = "bert", batch_size: int = 32,
+                               vectors: Any = None) -> Dict[str, int]:
+    """
+    Embed every job description and average the vectors per DeptNorm.
+
+    Meant to run offline with the data snapshot (see scripts/update_jobs.py), so
+    the classifier only loads the finished centroids. The embedding mode is stored
+    alongside so centroids are never compared against vectors from another space.
+    Pass `vectors` (one row per row of `jobs_df`, same mode) to reuse embeddings
+    already computed for the snapshot instead of embedding again.
+
+    Returns:
+        dict: {department: number of postings averaged}
+    """
+    mask = (jobs_df['Description'].notna() & jobs_df['DeptNorm'].notna()
+            & (jobs_df['DeptNorm'].astype(str).str.strip() != '')).to_numpy()
+    jobs = jobs_df[mask]
+    if jobs.empty:
+        return {}
+
+    if vectors is None:
+        vectors = embed_texts(jobs['Description'].astype(str).tolist(), embedding_mode, batch_size)
+    else:
+        vectors = np.asarray(vectors, dtype=np.float32)[mask]
+
+    labels = jobs['DeptNorm'].astype(str).to_numpy()
+    depts = sorted(set(labels))
+    centroids = np.stack([vectors[labels == d].mean(axis=0) for d in depts])
+    counts = np.array([(labels == d).sum() for d in depts])
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    np.savez(output_path, departments=np.array(depts), centroids=centroids,
+             counts=counts, embedding_mode=np.array(embedding_mode))
+    return dict(zip(depts, counts.tolist()))
+
+
+def load_department_centroids(path: str = DEFAULT_CENTROIDS_PATH) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Load centroids written by `build_department_centroids`.
+
+    Returns:
+        (embedding_mode, {department: torch vector}) or None if unavailable.
+    """
+    try:
+        data = np.load(path, allow_pickle=False)
+        centroids = {str(d): torch.from_numpy(v.astype(np.float32))
+                     for d, v in zip(data['departments'], data['centroids'])}
+        return str(data['embedding_mode']), centroids
+    except Exception:
+        return None
@@ -0,0 +1,116 @@
+from typing import Dict, List, Any, Optional # type: ignore
+import numpy as np # type: ignore
+
+# Status codes returned by EligibilityMatrix; -1 means no requirement data / no results
+ELIGIBLE, ASPIRATIONAL, NOT_ELIGIBLE, UNKNOWN = 0, 1, 2, -1
+STATUS_LABELS = {
+    ELIGIBLE: "ELIGIBLE",
+    ASPIRATIONAL: "ASPIRATIONAL",
+    NOT_ELIGIBLE: "NOT ELIGIBLE",
+    UNKNOWN: "UNKNOWN",
+}
+
+
+def _clean(name: Any) -> str:
+    return str(name).replace('\n', ' ').strip().lower()
+
+
+class EligibilityMatrix:
+    """
+    Vectorized form of `CareerRecommender.check_eligibility` over every
+    requirement entry at once.
+
+    Requirements are compiled once into a minimum-mean vector and a
+    (programmes x subject slots) matrix of minimum grade points, where a slot is
+    each distinct `required_subjects` key ("Mathematics", "English_or_Kiswahili",
+    "Teaching_Subject_1", ...). For one student, the slot points are computed once
+    and the statuses of all programmes follow from a single max over deficits:
+    any shortfall of 2+ points is NOT ELIGIBLE, a worst shortfall of exactly 1 is
+    ASPIRATIONAL, otherwise ELIGIBLE — the same outcome the per-programme loop
+    reaches.
+    """
+
+    def __init__(self, requirements: Dict[str, Any], grade_points: Dict[str, int]):
+        self.grade_points = grade_points
+        self.keys = list(requirements)
+
+        slots: Dict[str, int] = {}
+        for req in requirements.values():
+            for sub in (req or {}).get('required_subjects', {}) or {}:
+                slots.setdefault(sub, len(slots))
+        self.slots = list(slots)
+
+        self.min_mean = np.array(
+            [grade_points.get((req or {}).get('min_mean_grade', 'C+'), 0) for req in requirements.values()],
+            dtype=np.int16
+        )
+        # 0 = slot not required (a student never has negative points, so no deficit)
+        self.min_subject = np.zeros((len(self.keys), len(self.slots)), dtype=np.int16)
+        for row, req in enumerate(requirements.values()):
+            for sub, min_g in ((req or {}).get('required_subjects', {}) or {}).items():
+                self.min_subject[row, slots[sub]] = grade_points.get(min_g, 0)
+
+        # Name lookup mirrors check_eligibility: exact cleaned match first, then substring
+        self._exact: Dict[str, int] = {}
+        for row, key in enumerate(self.keys):
+            self._exact.setdefault(_clean(key), row)
+        self._clean_keys = [_clean(k) for k in self.keys]
+        self._lookup_cache: Dict[str, int] = {}
+
+    def lookup(self, program_name: str) -> int:
+        """Row of the requirement entry check_eligibility would use, or -1."""
+        clean_prog = _clean(program_name)
+        if clean_prog in self._lookup_cache:
+            return self._lookup_cache[clean_prog]
+        row = self._exact.get(clean_prog, -1)
+        if row < 0:
+            for i, clean_key in enumerate(self._clean_keys):
+                if clean_key in clean_prog or clean_prog in clean_key:
+                    row = i
+                    break
+        self._lookup_cache[clean_prog] = row
+        return row
+
+    def _slot_points(self, student_results: dict) -> Any:
+        """Points the student brings to every subject slot."""
+        gp = self.grade_points
+        subjects = student_results.get("subjects", {}) or {}
+
+        def pts(grade):
+            return gp.get("E" if grade == "N/A" else grade, 0)
+
+        ranked = sorted((gp.get(g, 0) for g in subjects.values()), reverse=True)
+        points = np.empty(len(self.slots), dtype=np.int16)
+        for i, sub in enumerate(self.slots):
+            if "_or_" in sub:
+                points[i] = max(pts(subjects.get(opt, "N/A")) for opt in sub.split("_or_"))
+            elif "Teaching_Subject" in sub:
+                idx = 0 if "1" in sub else 1
+                points[i] = ranked[idx] if len(ranked) > idx else gp.get("E", 0)
+            else:
+                points[i] = pts(subjects.get(sub, "N/A"))
+        return points
+
+    def statuses(self, student_results: Optional[dict]) -> Any:
+        """Status code for every requirement entry (UNKNOWN for all if no results)."""
+        if student_results is None:
+            return np.full(len(self.keys), UNKNOWN, dtype=np.int8)
+        mean_pts = self.grade_points.get(student_results.get("mean_grade", "E"), 0)
+        worst = self.min_mean.astype(np.int32) - mean_pts
+        if self.slots:
+            deficits = self.min_subject.astype(np.int32) - self._slot_points(student_results)
+            worst = np.maximum(worst, deficits.max(axis=1))
+        codes = np.full(len(self.keys), ELIGIBLE, dtype=np.int8)
+        codes[worst == 1] = ASPIRATIONAL
+        codes[worst >= 2] = NOT_ELIGIBLE
+        return codes
+
+    def statuses_for_rows(self, rows: Any, student_results: Optional[dict]) -> Any:
+        """Status codes for requirement rows as returned by `lookup` (-1 rows stay UNKNOWN)."""
+        rows = np.asarray(rows)
+        codes = np.full(len(rows), UNKNOWN, dtype=np.int8)
+        if student_results is None:
+            return codes
+        known = rows >= 0
+        codes[known] = self.statuses(student_results)[rows[known]]
+        return codes
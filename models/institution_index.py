@@ -0,0 +1,132 @@
+import math
+from typing import Dict, List, Any, Optional # type: ignore
+import numpy as np # type: ignore
+from .eligibility_matrix import EligibilityMatrix, ELIGIBLE, UNKNOWN, STATUS_LABELS # type: ignore
+from .programme_search import _infer_level # type: ignore
+
+_CUTOFF_COLS = ['Cutoff_2024', 'Cutoff_2023', 'Cutoff_2022']
+
+
+def _clean_institution(name: Any) -> str:
+    return str(name).replace('\n', ' ').strip() if isinstance(name, str) else ''
+
+
+class InstitutionIndex:
+    """
+    Reverse index over kuccps_courses.csv: institution -> programme offerings.
+
+    Offerings are stored once, sorted by institution, as parallel arrays
+    (institution id, requirement row, latest cutoff) plus one record per offering
+    with its level, code, per-year cutoffs and requirement key. Each institution
+    owns a contiguous slice, so "programmes at X" is a slice and per-institution
+    eligibility counts are a single bincount over the status codes from
+    `EligibilityMatrix.statuses`.
+    """
+
+    def __init__(self, kuccps_df: Any, matrix: EligibilityMatrix, requirements: Optional[Dict[str, Any]] = None):
+        self.matrix = matrix
+        records = []
+        if kuccps_df is not None and {'Programme_Name', 'Institution_Name'} <= set(kuccps_df.columns):
+            cutoff_cols = [c for c in _CUTOFF_COLS if c in kuccps_df.columns]
+            for record in kuccps_df.to_dict('records'):
+                name, inst = record.get('Programme_Name'), _clean_institution(record.get('Institution_Name'))
+                if not isinstance(name, str) or not name.strip() or not inst:
+                    continue
+                cutoffs = {}
+                for col in cutoff_cols:
+                    try:
+                        value = float(record.get(col))
+                    except (TypeError, ValueError):
+                        continue
+                    if not math.isnan(value):
+                        cutoffs[col.split('_')[-1]] = value
+                row = matrix.lookup(name)
+                req_key = matrix.keys[row] if row >= 0 else None
+                level = _infer_level(name) or ((requirements or {}).get(req_key) or {}).get('level') or "Degree"
+                records.append({
+                    'institution': inst,
+                    'programme': name,
+                    'code': str(record.get('Program_Code', '') or ''),
+                    'level': level,
+                    'cutoffs': cutoffs,
+                    'cutoff': next(iter(cutoffs.values()), None),  # latest year available
+                    'requirement_key': req_key,
+                    '_row': row,
+                })
+
+        records.sort(key=lambda r: (r['institution'].lower(), r['programme'], r['code']))
+        self.institution_names: List[str] = []
+        self._ranges: Dict[str, tuple] = {}
+        inst_ids = []
+        for i, rec in enumerate(records):
+            key = rec['institution'].lower()
+            if key not in self._ranges:
+                self._ranges[key] = (i, i)
+                self.institution_names.append(rec['institution'])
+            start, _ = self._ranges[key]
+            self._ranges[key] = (start, i + 1)
+            inst_ids.append(len(self.institution_names) - 1)
+
+        self.req_rows = np.array([r.pop('_row') for r in records], dtype=np.int64)
+        self.inst_ids = np.array(inst_ids, dtype=np.int32)
+        self.levels = np.array([r['level'] for r in records], dtype=object)
+        self.offerings = records
+
+    def institutions(self) -> List[str]:
+        """All institution names, alphabetical."""
+        return list(self.institution_names)
+
+    def offering_statuses(self, codes: Any) -> Any:
+        """Status code per offering, given `codes` for every requirement entry."""
+        codes = np.asarray(codes)
+        if len(codes) == 0:
+            return np.full(len(self.req_rows), UNKNOWN, dtype=np.int8)
+        return np.where(self.req_rows >= 0, codes[np.maximum(self.req_rows, 0)], UNKNOWN).astype(np.int8)
+
+    def programmes_at(self, institution: str, codes: Any = None, statuses: Optional[List[int]] = None,
+                      level: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Offerings at `institution` (case-insensitive), alphabetical by programme.
+        With `codes`, each record gets an 'eligibility' label and `statuses`
+        (status codes, e.g. [ELIGIBLE]) keeps only those outcomes.
+        """
+        span = self._ranges.get(_clean_institution(institution).lower())
+        if span is None:
+            return []
+        start, stop = span
+        keep = np.ones(stop - start, dtype=bool)
+        if level:
+            keep &= self.levels[start:stop] == level
+        offering_codes = None
+        if codes is not None:
+            offering_codes = self.offering_statuses(codes)[start:stop]
+            if statuses is not None:
+                keep &= np.isin(offering_codes, statuses)
+
+        results = []
+        for i in np.flatnonzero(keep):
+            rec = dict(self.offerings[start + i])
+            if offering_codes is not None:
+                rec['eligibility'] = STATUS_LABELS[int(offering_codes[i])]
+            results.append(rec)
+        return results
+
+    def rank_institutions(self, codes: Any, status: int = ELIGIBLE, level: Optional[str] = None,
+                          top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Institutions ordered by how many of their offerings have `status` for the
+        student whose `codes` are given; ties break on name. Institutions with no
+        such offering are left out.
+        """
+        n = len(self.institution_names)
+        if n == 0:
+            return []
+        mask = self.offering_statuses(codes) == status
+        in_level = self.levels == level if level else np.ones(len(self.levels), dtype=bool)
+        matched = np.bincount(self.inst_ids[mask & in_level], minlength=n)
+        totals = np.bincount(self.inst_ids[in_level], minlength=n)
+        order = sorted(np.flatnonzero(matched), key=lambda i: (-matched[i], self.institution_names[i]))
+        if top_n is not None:
+            order = order[:top_n]
+        return [{'institution': self.institution_names[i], 'matching_programmes': int(matched[i]),
+                 'total_programmes': int(totals[i])} for i in order]
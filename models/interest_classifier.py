@@ -1,17 +1,80 @@
 from typing import Dict, List, Any, cast, Optional, Tuple # type: ignore
 from .interest_vectorizer import InterestVectorizer # type: ignore
+from .nlp_preprocessing import preprocess_text, embedding_available # type: ignore
+from .job_signal_index import JobSignalIndex # type: ignore
 import torch # type: ignore
 import torch.nn.functional as F # type: ignore
-from sklearn.metrics.pairwise import cosine_similarity # type: ignore
 import numpy as np # type: ignore
 import re
 
+
+def _build_query_index(tfidf: Any, dept_matrix: Any) -> Tuple[Any, Dict[str, int], Any, bool, Any]:
+    """Snapshot what `_query_scores` needs from a fitted TfidfVectorizer and its department matrix."""
+    return (tfidf.build_analyzer(), tfidf.vocabulary_, np.asarray(tfidf.idf_),
+            bool(tfidf.sublinear_tf), np.asarray(dept_matrix.T.todense()))
+
+
+def _query_scores(query_index: Tuple[Any, Dict[str, int], Any, bool, Any], text: str) -> Any:
+    """
+    Cosine similarity of `text` against L2-normalised TF-IDF department rows.
+
+    Equivalent to `cosine_similarity(tfidf.transform([text]), dept_matrix)`, but the
+    single query vector is built straight from the fitted vocabulary and IDF, which
+    skips scikit-learn's per-call input validation (the dominant cost for one short query).
+    """
+    analyzer, vocab, idf, sublinear_tf, dept_matrix_t = query_index
+    counts: Dict[int, int] = {}
+    for term in analyzer(text):
+        idx = vocab.get(term)
+        if idx is not None:
+            counts[idx] = counts.get(idx, 0) + 1
+    if not counts:
+        return np.zeros(dept_matrix_t.shape[1])
+
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    if sublinear_tf:
+        tf = 1.0 + np.log(tf)
+    weights = tf * idf[idx]
+    weights /= np.linalg.norm(weights)
+    return weights @ dept_matrix_t[idx]
+
+
 class InterestClassifier:
-    def __init__(self):
-        self.vectorizer = InterestVectorizer()
-        self.dept_bert_vectors = self.vectorizer.get_department_bert_vectors()
+    # "full" runs all three layers; "fast" skips the BERT forward pass;
+    # "cascade" only runs BERT when the cheap layers are not decisive
+    MODES = ("full", "fast", "cascade")
+    # None embeds the whole text at once; "max" / "attention" embed each sentence
+    # and pool the per-department similarities over sentences
+    SENTENCE_POOLING = (None, "max", "attention")
+
+    def __init__(self, cascade_margin: float = 0.05, cascade_min_signal: float = 0.10, embedding_mode: str = "bert",
+                 job_signal_index: Optional[JobSignalIndex] = None,
+                 dept_centroids: Optional[Tuple[str, Dict[str, Any]]] = None, centroid_weight: float = 0.3,
+                 sentence_pooling: Optional[str] = None, attention_temperature: float = 0.1):
+        if sentence_pooling not in self.SENTENCE_POOLING:
+            raise ValueError(f"Unknown sentence pooling '{sentence_pooling}'. Expected one of {self.SENTENCE_POOLING}.")
+        self.vectorizer = InterestVectorizer(embedding_mode=embedding_mode)
+        self.dept_bert_vectors = self._blend_centroids(
+            self.vectorizer.get_department_bert_vectors(), dept_centroids, centroid_weight
+        )
+        self.sentence_pooling = sentence_pooling
+        self.attention_temperature = attention_temperature
+        self._dept_unit_matrix = None
         self.dept_tfidf_matrix = self.vectorizer.get_department_tfidf_vectors()
         self.departments = self.vectorizer.departments
+        self._keyword_query_index = _build_query_index(self.vectorizer.tfidf, self.dept_tfidf_matrix)
+        # ((jobs_df, n_rows), fitted job-description TF-IDF index) for the third layer
+        self._job_signal_cache = None
+        # Optional incrementally maintained statistics for the third layer; when
+        # present, a new jobs snapshot only tokenizes the postings that changed
+        self.job_signal_index = job_signal_index
+
+        # Cascade thresholds and per-path bookkeeping
+        self.cascade_margin = cascade_margin
+        self.cascade_min_signal = cascade_min_signal
+        self.last_path = None
+        self.path_counts = {"fast": 0, "full": 0}
 
         # Mutual-exclusion groups: if a strong indicator fires, softly penalise competing depts
         self._signal_groups = [
@@ -74,6 +137,37 @@ class InterestClassifier:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _blend_centroids(self, keyword_vectors: Dict[str, Any], dept_centroids: Optional[Tuple[str, Dict[str, Any]]],
+                         weight: float) -> Dict[str, Any]:
+        """
+        Mix each keyword-list embedding with the offline real-job centroid of the
+        same department (see models/dept_centroids.py). Both are unit-normalised
+        first so `weight` is the centroid's share of the direction. Done once here,
+        so the blend adds nothing per request.
+        """
+        if not dept_centroids or weight <= 0:
+            return keyword_vectors
+        centroid_mode, centroids = dept_centroids
+        if centroid_mode != self.vectorizer.embedding_mode:
+            print(f"Warning: Ignoring department centroids built with '{centroid_mode}' embeddings")
+            return keyword_vectors
+        if not embedding_available(centroid_mode):
+            # The department vectors are keyword fallbacks, not in the centroids' space
+            print(f"Warning: Ignoring department centroids, '{centroid_mode}' embeddings are unavailable")
+            return keyword_vectors
+
+        blended = {}
+        for dept, k_vec in keyword_vectors.items():
+            c_vec = centroids.get(dept)
+            k_flat = k_vec.detach().cpu().flatten().float()
+            if c_vec is None or c_vec.shape[0] != k_flat.shape[0] or torch.norm(c_vec) == 0:
+                blended[dept] = k_vec
+                continue
+            k_unit = k_flat / (torch.norm(k_flat) + 1e-9)
+            c_unit = c_vec / torch.norm(c_vec)
+            blended[dept] = (1 - weight) * k_unit + weight * c_unit
+        return blended
+
     def _apply_signal_groups(self, text_lower: str, scores: Any) -> Any:
         """Soft signal-based rescoring using mutual-exclusion groups."""
         for triggers, boost_dept, penalise_depts, boost_factor, penalty_factor in self._signal_groups:
@@ -94,6 +188,39 @@ class InterestClassifier:
 
         return scores
 
+    def _job_signal_index(self, jobs_df: Any) -> Optional[Tuple[Any, List[str]]]:
+        """
+        Fit (once per jobs snapshot) the TF-IDF model over job descriptions grouped
+        by DeptNorm. The fitted vectorizer and department matrix are cached so that
+        later requests only need to transform the student text. With a
+        `JobSignalIndex` attached, the snapshot is synced into it instead of refitting.
+        """
+        # Keep a reference to the frame itself so its id() cannot be recycled
+        cache_key = (jobs_df, len(jobs_df))
+        cached = self._job_signal_cache
+        if cached is not None and cached[0][0] is jobs_df and cached[0][1] == cache_key[1]:
+            return cached[1]
+
+        if self.job_signal_index is not None:
+            self.job_signal_index.sync(jobs_df)
+            index = self.job_signal_index.query_index()
+            self._job_signal_cache = (cache_key, index)
+            return index
+
+        from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
+
+        grouped = jobs_df.groupby('DeptNorm')['Description'].apply(
+            lambda texts: ' '.join(texts.dropna().astype(str).tolist())
+        )
+        index = None
+        if not grouped.empty:
+            tfidf = TfidfVectorizer(max_features=3000, ngram_range=(1, 2), sublinear_tf=True)
+            dept_vecs = tfidf.fit_transform(grouped.tolist())
+            index = (_build_query_index(tfidf, dept_vecs), grouped.index.tolist())
+
+        self._job_signal_cache = (cache_key, index)
+        return index
+
     def _job_description_signal(self, text: str, jobs_df: Any) -> Dict[str, float]:
         """
         Compute a soft third-signal by TF-IDF-matching the student text against
@@ -106,54 +233,21 @@ class InterestClassifier:
             if 'Description' not in jobs_df.columns or 'DeptNorm' not in jobs_df.columns:
                 return {}
 
-            from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
-            from sklearn.metrics.pairwise import cosine_similarity as cos_sim # type: ignore
-
-            grouped = jobs_df.groupby('DeptNorm')['Description'].apply(
-                lambda texts: ' '.join(texts.dropna().astype(str).tolist())
-            )
-            if grouped.empty:
+            index = self._job_signal_index(jobs_df)
+            if index is None:
                 return {}
+            query_index, labels = index
 
-            corpus = grouped.tolist()
-            labels = grouped.index.tolist()
-            all_texts = [text] + corpus
-
-            tfidf = TfidfVectorizer(max_features=3000, ngram_range=(1, 2), sublinear_tf=True)
-            mat = tfidf.fit_transform(all_texts)
-            query_vec = mat[0]
-            dept_vecs = mat[1:]
-
-            sims = cos_sim(query_vec, dept_vecs).flatten()
+            sims = _query_scores(query_index, text)
             max_sim = sims.max() if sims.max() > 0 else 1.0
             return {label: float(sim / max_sim) for label, sim in zip(labels, sims)} # type: ignore
         except Exception:
             return {}
 
-    # ------------------------------------------------------------------
-    # Public API
-    # ------------------------------------------------------------------
-    def classify(self, text: str, bert_weight: float = 0.45, tfidf_weight: float = 0.35,
-                 job_signal_weight: float = 0.20, jobs_df: Any = None) -> Dict[str, float]:
-        """
-        Classifiy student interest text using a THREE-LAYER hybrid engine:
-          1. BERT semantic similarity (45 %)
-          2. TF-IDF keyword similarity against department keyword corpora (35 %)
-          3. TF-IDF against REAL job descriptions from the CSV (20 %)
-        After blending, soft mutual-exclusion groups refine the ranking.
-
-        Args:
-            text (str): Raw student input
-            bert_weight (float): BERT layer weight
-            tfidf_weight (float): TF-IDF keyword layer weight
-            job_signal_weight (float): Job-description layer weight
-            jobs_df: Optional DataFrame with 'DeptNorm' and 'Description' columns
-        Returns:
-            dict: department → similarity score
-        """
-        text_lower = text.lower()
-
-        # ── Layer 1: BERT Similarity ──────────────────────────────────
+    def _bert_scores(self, text: str, pooled: bool = True) -> Dict[str, float]:
+        """Layer 1: cosine similarity between the student and department BERT vectors."""
+        if pooled and self.sentence_pooling:
+            return self._sentence_bert_scores(text)
         student_bert = self.vectorizer.vectorize_bert(text)
         bert_scores = {}
         for dept, dept_vector in self.dept_bert_vectors.items():
@@ -164,39 +258,169 @@ class InterestClassifier:
                 continue
             sim = F.cosine_similarity(s_vec.unsqueeze(0), d_vec.unsqueeze(0))
             bert_scores[dept] = float(sim.item())
+        return bert_scores
 
-        # ── Layer 2: TF-IDF keyword similarity ───────────────────────
-        student_tfidf = self.vectorizer.vectorize_tfidf(text)
-        tfidf_similarities = cosine_similarity(student_tfidf, self.dept_tfidf_matrix).flatten()
-        tfidf_scores = {dept: float(score) for dept, score in zip(self.departments, tfidf_similarities)}
+    def _dept_matrix(self) -> Tuple[List[str], Any, Any]:
+        """Department names, unit-normalised vectors stacked as (n_depts, dim), and which rows are usable."""
+        if self._dept_unit_matrix is None:
+            names = list(self.dept_bert_vectors)
+            vecs = [self.dept_bert_vectors[d].detach().cpu().flatten().float() for d in names]
+            dim = max((v.shape[0] for v in vecs), default=0)
+            valid = torch.tensor([v.shape[0] == dim for v in vecs], dtype=torch.bool)
+            matrix = torch.stack([v if v.shape[0] == dim else torch.zeros(dim) for v in vecs]) if vecs else torch.zeros((0, 0))
+            self._dept_unit_matrix = (names, F.normalize(matrix, dim=1), valid)
+        return self._dept_unit_matrix
 
-        # ── Layer 3: Real Job-Description semantic match ──────────────
-        job_scores = self._job_description_signal(text, jobs_df) if jobs_df is not None else {}
+    def _sentence_bert_scores(self, text: str) -> Dict[str, float]:
+        """
+        Layer 1 for long texts: every sentence is embedded in one batched forward
+        pass and compared with every department; a department's score is the max
+        over sentences ("max") or a softmax-weighted mean where the sentences most
+        similar to that department get the most weight ("attention"). This keeps one
+        strongly expressed interest from being diluted by the rest of the essay.
+        """
+        sentence_vecs = self.vectorizer.vectorize_sentences(text).detach().cpu().float()
+        names, dept_matrix, valid = self._dept_matrix()
+        if sentence_vecs.shape[0] < 2 or sentence_vecs.shape[1] != dept_matrix.shape[1]:
+            return self._bert_scores(text, pooled=False)
+
+        sims = F.normalize(sentence_vecs, dim=1) @ dept_matrix.T  # (n_sentences, n_depts)
+        if self.sentence_pooling == "max":
+            pooled = sims.max(dim=0).values
+        else:
+            weights = torch.softmax(sims / self.attention_temperature, dim=0)
+            pooled = (weights * sims).sum(dim=0)
+        pooled = torch.where(valid, pooled, torch.zeros_like(pooled))
+        return {dept: float(score) for dept, score in zip(names, pooled)}
+
+    def _tfidf_scores(self, text: str) -> Dict[str, float]:
+        """Layer 2: TF-IDF similarity against the department keyword corpora."""
+        tfidf_similarities = _query_scores(self._keyword_query_index, preprocess_text(text))
+        return {dept: float(score) for dept, score in zip(self.departments, tfidf_similarities)}
 
-        # ── Blend all three layers ────────────────────────────────────
+    def _blend(self, text_lower: str, bert_scores: Dict[str, float], tfidf_scores: Dict[str, float],
+               job_scores: Dict[str, float], bert_weight: float, tfidf_weight: float,
+               job_signal_weight: float, use_bert: bool) -> Dict[str, float]:
+        """Weighted blend of the layer scores followed by signal-group rescoring."""
+        # ── Effective layer weights ───────────────────────────────────
+        if not use_bert:
+            # The BERT weight goes to the keyword layer only: the job-description layer is
+            # max-normalised (its top department always scores 1.0), so a larger share
+            # would let it decide the top department of short texts on its own
+            if job_scores:
+                w_b, w_t, w_j = 0.0, tfidf_weight + bert_weight, job_signal_weight
+            else:
+                w_b, w_t, w_j = 0.0, bert_weight + tfidf_weight + job_signal_weight, 0.0
+        elif not job_scores:
+            # Recalculate effective weights if job signal is absent
+            w_b, w_t, w_j = bert_weight + job_signal_weight * 0.5, tfidf_weight + job_signal_weight * 0.5, 0.0
+        else:
+            w_b, w_t, w_j = bert_weight, tfidf_weight, job_signal_weight
+
+        # ── Blend all layers ──────────────────────────────────────────
         final_scores = {}
         for dept in self.dept_bert_vectors:
             b = bert_scores.get(dept, 0.0)
             t = tfidf_scores.get(dept, 0.0)
             j = job_scores.get(dept, 0.0)
 
-            # Recalculate effective weights if job signal is absent
-            if not job_scores:
-                w_b, w_t, w_j = bert_weight + job_signal_weight * 0.5, tfidf_weight + job_signal_weight * 0.5, 0.0
-            else:
-                w_b, w_t, w_j = bert_weight, tfidf_weight, job_signal_weight
-
             score = (w_b * b) + (w_t * t) + (w_j * j)
             final_scores[dept] = score
 
         # ── Soft signal group rescoring ───────────────────────────────
-        final_scores = self._apply_signal_groups(text_lower, final_scores)
+        return self._apply_signal_groups(text_lower, final_scores)
 
-        return final_scores
+    def _is_decisive(self, text_lower: str, tfidf_scores: Dict[str, float],
+                     fast_scores: Optional[Dict[str, float]] = None) -> bool:
+        """
+        True when the keyword TF-IDF layer plus the signal groups settle the ranking
+        on their own. The job-description layer is left out of the margin and
+        signal checks because it is max-normalised and therefore always has a top
+        score of 1.0; it must not overturn the keyword winner either, so when the
+        fast-path scores are given their top department has to be the same.
+        """
+        keyword_scores = self._apply_signal_groups(text_lower, dict(tfidf_scores))
+        ranked = sorted(keyword_scores, key=keyword_scores.get, reverse=True)
+        if not ranked:
+            return False
+        top = [keyword_scores[d] for d in ranked[:2]]
+        margin = top[0] - top[1] if len(top) > 1 else top[0]
+        if top[0] < self.cascade_min_signal or margin < self.cascade_margin:
+            return False
+        return fast_scores is None or max(fast_scores, key=fast_scores.get) == ranked[0]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def classify_with_path(self, text: str, bert_weight: float = 0.45, tfidf_weight: float = 0.35,
+                           job_signal_weight: float = 0.20, jobs_df: Any = None,
+                           mode: str = "full") -> Tuple[Dict[str, float], str]:
+        """
+        Same as `classify`, but also returns the path the request took:
+        "full" (BERT computed) or "fast" (TF-IDF layers only).
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown classifier mode '{mode}'. Expected one of {self.MODES}.")
+
+        text_lower = text.lower()
+
+        # ── Cheap layers first: keyword TF-IDF + real job descriptions ─
+        tfidf_scores = self._tfidf_scores(text)
+        job_scores = self._job_description_signal(text, jobs_df) if jobs_df is not None else {}
+
+        path = "full"
+        if mode in ("fast", "cascade"):
+            scores = self._blend(text_lower, {}, tfidf_scores, job_scores,
+                                 bert_weight, tfidf_weight, job_signal_weight, use_bert=False)
+            if mode == "fast" or self._is_decisive(text_lower, tfidf_scores, scores):
+                path = "fast"
+
+        if path == "full":
+            # ── Layer 1: BERT Similarity ──────────────────────────────
+            bert_scores = self._bert_scores(text)
+            scores = self._blend(text_lower, bert_scores, tfidf_scores, job_scores,
+                                 bert_weight, tfidf_weight, job_signal_weight, use_bert=True)
+
+        self.last_path = path
+        self.path_counts[path] = self.path_counts.get(path, 0) + 1
+        return scores, path
+
+    def classify(self, text: str, bert_weight: float = 0.45, tfidf_weight: float = 0.35,
+                 job_signal_weight: float = 0.20, jobs_df: Any = None, mode: str = "full") -> Dict[str, float]:
+        """
+        Classifiy student interest text using a THREE-LAYER hybrid engine:
+          1. BERT semantic similarity (45 %)
+          2. TF-IDF keyword similarity against department keyword corpora (35 %)
+          3. TF-IDF against REAL job descriptions from the CSV (20 %)
+        After blending, soft mutual-exclusion groups refine the ranking.
+
+        Modes:
+          - "full": all three layers.
+          - "fast": the BERT layer is skipped and its weight goes to the keyword
+            TF-IDF layer, keeping classification sub-millisecond under load.
+          - "cascade": the cheap layers run first; BERT is only computed when the
+            keyword layer's top-two margin is below `cascade_margin`, its top
+            score is below `cascade_min_signal` (both after signal-group rescoring)
+            or the fast blend would rank a different department first.
+            The path taken is kept in `last_path` / `path_counts`.
+
+        Args:
+            text (str): Raw student input
+            bert_weight (float): BERT layer weight
+            tfidf_weight (float): TF-IDF keyword layer weight
+            job_signal_weight (float): Job-description layer weight
+            jobs_df: Optional DataFrame with 'DeptNorm' and 'Description' columns
+            mode (str): "full", "fast" or "cascade"
+        Returns:
+            dict: department → similarity score
+        """
+        scores, _ = self.classify_with_path(text, bert_weight, tfidf_weight, job_signal_weight,
+                                            jobs_df=jobs_df, mode=mode)
+        return scores
 
 
-    def get_top_departments(self, text: str, top_n: int = 5, jobs_df: Any = None) -> List[Tuple[str, float]]:
+    def get_top_departments(self, text: str, top_n: int = 5, jobs_df: Any = None, mode: str = "full") -> List[Tuple[str, float]]:
         """Get top N departments by hybrid similarity."""
-        scores = self.classify(text, jobs_df=jobs_df)
+        scores = self.classify(text, jobs_df=jobs_df, mode=mode)
         sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
         return sorted_scores[:top_n] # type: ignore
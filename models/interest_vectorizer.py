@@ -1,139 +1,29 @@
-from .nlp_preprocessing import preprocess_text, get_bert_embedding # type: ignore
+from .nlp_preprocessing import ( # type: ignore
+    preprocess_text, get_bert_embedding, get_bert_embeddings_batch, get_static_embedding, split_sentences
+)
 import torch # type: ignore
 from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
 import numpy as np # type: ignore
 
-# Department keywords from extract_jobs.py (copied for independence)
-department_keywords = {
-    "Information Technology": [
-        "developer", "software", "ict", "data", "ai", "machine learning", "cyber", "programmer",
-        "analyst", "information technology", "computer", "network", "support", "systems",
-        "cloud", "security", "database", "web", "frontend", "backend", "fullstack",
-        "coding", "programming", "software engineering", "it", "hardware", "tech",
-        "apps", "mobile", "internet", "algorithm", "devops", "code", "coder", "website",
-        "python", "javascript", "java", "c#", "rust", "go", "php", "ruby", "sql", "flutter", "react",
-        "node", "typescript", "swift", "kotlin", "android", "ios", "aws", "azure", "docker", "kubernetes",
-        "artificial intelligence", "fintech", "edtech", "healthtech", "saas", "api", "microservices",
-        "blockchain", "nft", "web3", "chatbot", "llm", "gpt", "automation", "rpa", "erp", "crm",
-        "safaricom", "mpesa", "m-pesa", "ict authority", "konza", "silicon savannah"
-    ],
-    "Business": [
-        "business", "operations", "strategy", "manager", "consultant", "entrepreneur",
-        "logistics", "supply chain", "management", "administration", "leadership", "commerce", "startup",
-        "ceo", "director", "executive", "procurement", "tender", "kra", "nairobi stock exchange",
-        "nse", "import", "export", "trade", "distributor", "retailer", "wholesale", "franchisor",
-        "business plan", "pitch", "investor", "venture", "scaling", "growth hacking"
-    ],
-    "Education": [
-        "teacher", "lecturer", "education", "instructor", "tutor", "training",
-        "curriculum", "school", "dean", "academic", "principal", "teaching", "pedagogy", "training"
-    ],
-    "Finance & Accounting": [
-        "accountant", "finance", "auditor", "economist", "investment", "bookkeeper",
-        "financial", "tax", "cpa", "controller", "budget", "accounting", "banking", "audit", "money",
-        "cfa", "acca", "kra", "kenya revenue authority", "vat", "corporate tax", "payroll",
-        "equity bank", "kcb", "co-operative bank", "absa", "stanbic", "treasury",
-        "financial modelling", "cash flow", "balance sheet", "income statement", "forex",
-        "microfinance", "sacco", "insurance", "actuarial", "wealth management"
-    ],
-    "Healthcare & Medical": [
-        "nurse", "doctor", "pharmacist", "medical", "clinical", "health", "surgeon",
-        "therapist", "dental", "radiologist", "physician", "lab technician", "veterinary",
-        "nutritionist", "psychiatrist", "medicine", "dentistry", "pharmacy", "patient",
-        "care", "healthcare", "therapy", "hospital", "surgery", "anatomy", "biology",
-        "diseases", "pathology", "pharmaceuticals", "public health", "physiology",
-        "nursing", "midwifery", "diagnostics", "treatment", "human health", "biologist", "science",
-        "knh", "kenyatta national hospital", "aga khan", "nairobi hospital", "moi teaching",
-        "nhif", "ministry of health", "clinical officer", "community health", "hiv", "malaria",
-        "cancer", "oncology", "radiology", "ophthalmology", "ent", "paediatrics", "geriatrics",
-        "orthodontics", "teeth", "maxillofacial"
-    ],
-    "Engineering": [
-        "engineer", "mechanical", "civil", "electrical", "technician", "biomedical",
-        "mechatronic", "chemical", "project engineer", "structural",
-        "industrial", "automotive", "manufacturing", "telecommunication", "machinery",
-        "construction", "design", "robotics", "automation", "robot", "robots", "build", "building",
-        "electronics", "maintenance", "architecture", "system design", "engines"
-    ],
-    "Marketing & Sales": [
-        "marketing", "seo", "sales", "brand", "advertising", "digital", "content",
-        "promotion", "telemarketing", "social media", "copywriter", "account executive",
-        "market research", "public relations", "pr", "selling"
-    ],
-    "Administration & Support": [
-        "admin", "clerk", "secretary", "assistant", "receptionist", "office manager",
-        "front desk", "executive assistant", "records", "filing"
-    ],
-    "Human Resources": [
-        "human resources", "hr", "recruiter", "talent management", "personnel", "staffing",
-        "employee relations", "talent acquisition", "labor laws", "payroll", "onboarding", "hiring"
-    ],
-    "Law": [
-        "lawyer", "legal", "attorney", "advocate", "compliance", "legal officer", "paralegal",
-        "regulatory", "litigation", "corporate law", "law", "justice", "judiciary",
-        "courts", "arbitration", "jurisprudence"
-    ],
-    "Arts & Media": [
-        "artist", "musician", "painter", "graphic designer", "illustrator", "videographer",
-        "photographer", "media", "journalist", "writer", "editor", "communication",
-        "film", "animation", "content creator", "design", "creative", "theatre", "drawing"
-    ],
-    "Agriculture & Environmental": [
-        "agriculture", "horticulture", "environment", "climate", "forestry", "conservation",
-        "agronomist", "ecologist", "farm", "natural resources", "soil", "animal", "crop",
-        "farming", "livestock", "irrigation", "agribusiness", "vet"
-    ],
-    "Architecture & Construction": [
-        "architecture", "architect", "construction", "site supervisor", "planner",
-        "urban planning", "interior design", "landscape", "surveying", "quantity surveyor",
-        "draughtsman", "builder", "real estate development", "building"
-    ],
-    "Social Sciences & Community": [
-        "social worker", "sociologist", "community", "ngo", "development officer",
-        "humanitarian", "psychologist", "counselor", "activist", "gender", "youth worker",
-        "counseling", "anthropology"
-    ],
-    "Hospitality & Tourism": [
-        "hospitality", "tourism", "hotel", "chef", "cook", "housekeeping", "travel",
-        "airline", "waiter", "bartender", "event planner", "front office", "resort", "catering"
-    ],
-    "Security & Protective Services": [
-        "security", "guard", "military", "police", "defense", "intelligence", "forensic",
-        "safety", "firefighter", "rescue", "policing", "crimonology"
-    ],
-    "Data Science & Analytics": [
-        "data analyst", "data scientist", "big data", "statistics", "mathematics",
-        "tableau", "power bi", "sql", "excel", "visualization", "predictive modeling",
-        "machine learning", "data mining", "math", "analysis",
-        "r programming", "pandas", "numpy", "scikit-learn", "tensorflow", "keras", "pytorch",
-        "business intelligence", "etl", "data pipeline", "data warehouse", "data lake",
-        "a/b testing", "regression", "classification", "clustering", "neural network",
-        "natural language processing", "nlp", "computer vision", "deep learning",
-        "google analytics", "looker", "metabase", "data storytelling", "insight"
-    ],
-    "Project Management": [
-        "project manager", "pmp", "agile", "scrum", "stakeholder",
-        "budgeting", "coordination", "prince2", "project lifecycle"
-    ],
-    "Renewable Energy & Environment": [
-        "solar", "wind", "renewable", "energy", "sustainability", "environmental",
-        "climate change", "green energy", "conservation"
-    ],
-    "Real Estate & Property": [
-        "real estate", "property", "valuation", "realtor", "broker", "estate agent",
-        "leasing", "tenancy", "land", "property management"
-    ],
-    "Aviation & Logistics": [
-        "pilot", "aviation", "flight", "logistics", "warehouse", "transport",
-        "airline", "cargo", "fleet", "clearing", "forwarding"
-    ],
-    "Other": []
-}
+# Department keywords live in the shared taxonomy; re-exported here for existing imports
+from .taxonomy import DEPARTMENT_KEYWORDS as department_keywords # type: ignore
+
 
+# Embedding backends for the semantic layer: "bert" runs the DistilBERT forward
+# pass, "static" averages precomputed token vectors (no transformer at query time)
+EMBEDDING_MODES = {
+    "bert": get_bert_embedding,
+    "static": get_static_embedding,
+}
 
 
 class InterestVectorizer:
-    def __init__(self):
+    def __init__(self, embedding_mode: str = "bert"):
+        if embedding_mode not in EMBEDDING_MODES:
+            raise ValueError(f"Unknown embedding mode '{embedding_mode}', expected one of {list(EMBEDDING_MODES)}")
+        self.embedding_mode = embedding_mode
+        self._embed = EMBEDDING_MODES[embedding_mode]
+
         # Prepare corpus: each department's keywords as a document
         self.corpus = []
         self.departments = []
@@ -148,14 +38,24 @@ class InterestVectorizer:
         self.tfidf = TfidfVectorizer()
         self.tfidf_matrix = self.tfidf.fit_transform(self.corpus)
 
-        # Pre-compute BERT embeddings for department keywords
+        # Pre-compute department embeddings in the same space as student queries
         self.department_embeddings = {}
         for dept, text in zip(self.departments, self.corpus):
-            self.department_embeddings[dept] = get_bert_embedding(text)
+            self.department_embeddings[dept] = self._embed(text)
 
     def vectorize_bert(self, text: str):
-        """Vectorize text using BERT embedding."""
-        return get_bert_embedding(text)
+        """Vectorize text using the configured embedding mode (BERT by default)."""
+        return self._embed(text)
+
+    def vectorize_sentences(self, text: str):
+        """
+        One embedding per sentence of `text`, as an (n_sentences, dim) tensor.
+        In "bert" mode all sentences go through DistilBERT as one padded batch.
+        """
+        sentences = split_sentences(text) or [text]
+        if self.embedding_mode == "bert":
+            return get_bert_embeddings_batch(sentences, batch_size=len(sentences))
+        return torch.stack([self._embed(s).flatten() for s in sentences])
 
     def vectorize_tfidf(self, text: str):
         """Vectorize text using TF-IDF."""
@@ -0,0 +1,242 @@
+import os
+import math
+import heapq
+import pickle
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple # type: ignore
+import numpy as np # type: ignore
+
+# Posting identity lives in the shared core package; re-exported here for existing imports
+from core.job_keys import job_key # type: ignore
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'job_signal_index.pkl')
+
+
+class JobSignalIndex:
+    """
+    Incrementally maintained statistics behind the classifier's job-description layer.
+
+    Each department is one "document" made of all its postings' descriptions (the
+    same grouping the classifier used to refit on every snapshot). We keep raw
+    per-department term counts, corpus-wide term totals and department document
+    frequencies, and update them with the delta of added/removed/re-labelled jobs,
+    so a new snapshot only costs tokenizing the postings that changed.
+
+    `query_index()` turns the counts into the `(analyzer, vocab, idf, sublinear_tf,
+    dept_matrix_t)` tuple consumed by `interest_classifier._query_scores`, matching
+    `TfidfVectorizer(max_features, ngram_range=(1, 2), sublinear_tf=True)` fitted on
+    the grouped descriptions (bigrams never span two postings here).
+    """
+
+    def __init__(self, max_features: int = 3000, ngram_range: Tuple[int, int] = (1, 2), compact_every: int = 5000):
+        self.max_features = max_features
+        self.ngram_range = ngram_range
+        self.compact_every = compact_every
+
+        self.dept_term_counts: Dict[str, Counter] = {}
+        self.term_totals: Counter = Counter()
+        self.doc_freq: Counter = Counter()
+        self.dept_job_counts: Counter = Counter()
+        self.jobs: Dict[str, str] = {}  # job key -> department label
+
+        self._ops_since_compact = 0
+        self._analyzer = None
+        self._query_index = None
+
+    # ── Persistence ───────────────────────────────────────────────────
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The analyzer is a closure and the query index is derived data
+        state['_analyzer'] = None
+        state['_query_index'] = None
+        return state
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> str:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> Optional['JobSignalIndex']:
+        """Load a persisted index, or None if it is missing or unreadable."""
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+            return index if isinstance(index, cls) else None
+        except Exception:
+            return None
+
+    # ── Term counting ─────────────────────────────────────────────────
+    def _analyze(self, text: str) -> List[str]:
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
+            self._analyzer = TfidfVectorizer(ngram_range=self.ngram_range).build_analyzer()
+        return self._analyzer(text)
+
+    def _apply(self, dept: str, terms: Counter, sign: int):
+        counts = self.dept_term_counts.setdefault(dept, Counter())
+        for term, n in terms.items():
+            before = counts.get(term, 0)
+            after = max(before + sign * n, 0)
+            counts[term] = after
+            self.term_totals[term] = max(self.term_totals.get(term, 0) + (after - before), 0)
+            if before == 0 and after > 0:
+                self.doc_freq[term] += 1
+            elif before > 0 and after == 0:
+                self.doc_freq[term] -= 1
+        self.dept_job_counts[dept] += sign
+        self._ops_since_compact += 1
+        self._query_index = None
+
+    def add_job(self, key: str, dept: str, description: Any):
+        """Add one posting; re-adding a known key with a new department moves it."""
+        previous = self.jobs.get(key)
+        if previous == dept or (previous is None and not dept):
+            return
+        terms = Counter(self._analyze(str(description)))
+        if previous is not None:
+            self._apply(previous, terms, -1)
+            del self.jobs[key]
+        if dept:
+            self._apply(dept, terms, +1)
+            self.jobs[key] = dept
+
+    def remove_job(self, key: str, description: Any):
+        """Remove one posting; the description is needed to subtract its terms."""
+        dept = self.jobs.pop(key, None)
+        if dept is not None:
+            self._apply(dept, Counter(self._analyze(str(description))), -1)
+
+    # ── Deltas from job frames ────────────────────────────────────────
+    @staticmethod
+    def _keyed_rows(jobs_df: Any, label_col: str) -> Dict[str, Tuple[str, str]]:
+        """Map job key -> (department label, description) for every usable row."""
+        if jobs_df is None or jobs_df.empty or 'Description' not in jobs_df.columns:
+            return {}
+        titles = jobs_df['Job Title'] if 'Job Title' in jobs_df.columns else [''] * len(jobs_df)
+        companies = jobs_df['Company'] if 'Company' in jobs_df.columns else [''] * len(jobs_df)
+        labels = jobs_df[label_col] if label_col in jobs_df.columns else [''] * len(jobs_df)
+        rows = {}
+        for title, company, desc, label in zip(titles, companies, jobs_df['Description'], labels):
+            if desc is None or (isinstance(desc, float) and math.isnan(desc)):
+                continue
+            label = '' if label is None or (isinstance(label, float) and math.isnan(label)) else str(label)
+            rows[job_key(title, company, desc)] = (label, str(desc))
+        return rows
+
+    def apply_delta(self, previous_df: Any, current_df: Any, label_col: str = 'DeptNorm') -> Dict[str, int]:
+        """
+        Bring the index from the `previous_df` snapshot to `current_df`.
+
+        Postings only in `current_df` are added, postings only in `previous_df` are
+        subtracted using their old descriptions, and postings whose department label
+        changed are moved. Returns counts of each kind of change.
+        """
+        current = self._keyed_rows(current_df, label_col)
+        previous = self._keyed_rows(previous_df, label_col)
+        stats = {'added': 0, 'removed': 0, 'moved': 0}
+        for key, (_, desc) in previous.items():
+            if key not in current and key in self.jobs:
+                self.remove_job(key, desc)
+                stats['removed'] += 1
+        for key, (label, desc) in current.items():
+            if key not in self.jobs:
+                stats['added'] += 1
+            elif self.jobs[key] != label:
+                stats['moved'] += 1
+            self.add_job(key, label, desc)
+        self.maybe_compact()
+        return stats
+
+    def sync(self, jobs_df: Any, label_col: str = 'DeptNorm') -> Dict[str, int]:
+        """
+        Align the index with `jobs_df` when the previous snapshot is not at hand.
+
+        New and re-labelled postings are applied incrementally. Postings that
+        disappeared cannot be subtracted without their text, so in that case the
+        index is rebuilt from `jobs_df`.
+        """
+        current = self._keyed_rows(jobs_df, label_col)
+        if any(key not in current for key in self.jobs):
+            self.rebuild(jobs_df, label_col)
+            return {'added': len(self.jobs), 'removed': 0, 'moved': 0, 'rebuilt': 1}
+        stats = {'added': 0, 'removed': 0, 'moved': 0, 'rebuilt': 0}
+        for key, (label, desc) in current.items():
+            if key not in self.jobs:
+                stats['added'] += 1
+            elif self.jobs[key] != label:
+                stats['moved'] += 1
+            self.add_job(key, label, desc)
+        self.maybe_compact()
+        return stats
+
+    def rebuild(self, jobs_df: Any, label_col: str = 'DeptNorm'):
+        """Discard all statistics and recount `jobs_df` from scratch."""
+        self.__init__(self.max_features, self.ngram_range, self.compact_every)
+        for key, (label, desc) in self._keyed_rows(jobs_df, label_col).items():
+            self.add_job(key, label, desc)
+        self.compact()
+
+    # ── Maintenance ───────────────────────────────────────────────────
+    def compact(self):
+        """Drop zero counts and empty departments left behind by removals."""
+        for dept in list(self.dept_term_counts):
+            counts = self.dept_term_counts[dept]
+            if self.dept_job_counts.get(dept, 0) <= 0:
+                for term, n in counts.items():
+                    if n > 0:
+                        self.term_totals[term] -= n
+                        self.doc_freq[term] -= 1
+                del self.dept_term_counts[dept]
+                self.dept_job_counts.pop(dept, None)
+                continue
+            self.dept_term_counts[dept] = Counter({t: n for t, n in counts.items() if n > 0})
+        self.term_totals = Counter({t: n for t, n in self.term_totals.items() if n > 0})
+        self.doc_freq = Counter({t: n for t, n in self.doc_freq.items() if n > 0})
+        self._ops_since_compact = 0
+        self._query_index = None
+
+    def maybe_compact(self):
+        if self._ops_since_compact >= self.compact_every:
+            self.compact()
+
+    # ── Query side ────────────────────────────────────────────────────
+    def query_index(self) -> Optional[Tuple[Any, List[str]]]:
+        """
+        Return `(query_index, labels)` for `_query_scores`, or None if empty.
+        Rebuilt lazily after the statistics change.
+        """
+        if self._query_index is not None:
+            return self._query_index
+
+        labels = sorted(d for d, n in self.dept_job_counts.items() if n > 0 and self.dept_term_counts.get(d))
+        candidates = [(t, n) for t, n in self.term_totals.items() if n > 0]
+        if not labels or not candidates:
+            return None
+
+        if self.max_features and len(candidates) > self.max_features:
+            # Ties broken by term so incremental and from-scratch indices agree
+            candidates = heapq.nsmallest(self.max_features, candidates, key=lambda item: (-item[1], item[0]))
+        terms = sorted(t for t, _ in candidates)
+        vocab = {t: i for i, t in enumerate(terms)}
+
+        n_docs = len(labels)
+        df = np.array([self.doc_freq.get(t, 0) for t in terms], dtype=np.float64)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+
+        matrix = np.zeros((len(terms), n_docs))
+        for j, dept in enumerate(labels):
+            for term, n in self.dept_term_counts[dept].items():
+                i = vocab.get(term)
+                if i is not None and n > 0:
+                    matrix[i, j] = (1.0 + math.log(n)) * idf[i]
+            norm = np.linalg.norm(matrix[:, j])
+            if norm > 0:
+                matrix[:, j] /= norm
+
+        self._analyze('')  # make sure the analyzer exists after unpickling
+        self._query_index = ((self._analyzer, vocab, idf, True, matrix), labels)
+        return self._query_index
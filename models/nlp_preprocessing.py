@@ -1,5 +1,8 @@
 import nltk # type: ignore
+import os
 import re
+import unicodedata
+import numpy as np # type: ignore
 import torch # type: ignore
 from nltk.corpus import stopwords # type: ignore
 from nltk.tokenize import word_tokenize # type: ignore
@@ -17,13 +20,27 @@ _MODEL_CACHE = {}
 # Module-level cache for fallback vocabulary
 _FALLBACK_VOCAB = None
 
+# Static token-embedding table: (token -> row index, embedding matrix)
+_STATIC_TABLE = None
+
+# Stored in _STATIC_TABLE once loading has failed, so later calls fall back immediately
+_STATIC_UNAVAILABLE = object()
+
+# Pre-distilled per-token vectors, exported by scripts/export_static_vectors.py
+STATIC_VECTORS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'static_token_vectors.npz')
+
+# Stopword set and lemmatizer are reused across calls (reading the NLTK
+# stopword list from disk on every call dominated fast-path latency)
+_STOP_WORDS = None
+_LEMMATIZER = None
+
 def get_fallback_vector(text: str):
     """Keyword-based vectorizer as fallback when BERT fails"""
     global _FALLBACK_VOCAB
     
     if _FALLBACK_VOCAB is None:
         try:
-            from .interest_vectorizer import department_keywords # type: ignore
+            from .taxonomy import DEPARTMENT_KEYWORDS as department_keywords # type: ignore
             vocab = set()
             for keywords in department_keywords.values():
                 for k in keywords:
@@ -52,6 +69,16 @@ def get_fallback_vector(text: str):
     norm = torch.norm(vec)
     return vec / (norm + 1e-9) if norm > 0 else vec
 
+def _get_bert_assets(model_name: str = 'distilbert-base-uncased'):
+    """Load the DistilBERT tokenizer/model once and reuse them across calls."""
+    if not hasattr(get_bert_embedding, "_cached_assets"):
+        from transformers import AutoTokenizer, AutoModel # type: ignore
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name, low_cpu_mem_usage=False)
+        model.eval()
+        get_bert_embedding._cached_assets = (tokenizer, model)
+    return get_bert_embedding._cached_assets
+
 @torch.no_grad()
 def get_bert_embedding(text: str, model_name: str = 'distilbert-base-uncased'):
     """
@@ -59,14 +86,7 @@ def get_bert_embedding(text: str, model_name: str = 'distilbert-base-uncased'):
     """
     try:
         # Try to load model/tokenizer only once
-        if not hasattr(get_bert_embedding, "_cached_assets"):
-            from transformers import AutoTokenizer, AutoModel # type: ignore
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModel.from_pretrained(model_name, low_cpu_mem_usage=False)
-            model.eval()
-            get_bert_embedding._cached_assets = (tokenizer, model)
-        
-        tokenizer, model = get_bert_embedding._cached_assets
+        tokenizer, model = _get_bert_assets(model_name)
         device = torch.device('cpu')
         
         inputs = tokenizer(text, return_tensors='pt', truncation=True, padding=True, max_length=512)
@@ -83,6 +103,159 @@ def get_bert_embedding(text: str, model_name: str = 'distilbert-base-uncased'):
         # If ANYTHING goes wrong (OSError, ImportError, etc), do not crash.
         return get_fallback_vector(text)
 
+@torch.no_grad()
+def get_bert_embeddings_batch(texts: list, model_name: str = 'distilbert-base-uncased', batch_size: int = 32,
+                              fallback: bool = True):
+    """
+    Mean-pooled DistilBERT embeddings for many texts, `batch_size` at a time.
+
+    Padding tokens are masked out of the mean so each row matches what
+    `get_bert_embedding` returns for the text on its own. Returns an (n, 768)
+    tensor; falls back to keyword vectors if BERT cannot be loaded, or raises
+    when `fallback` is False (for vectors that are persisted as BERT vectors).
+    """
+    if not texts:
+        return torch.zeros((0, 768))
+    try:
+        tokenizer, model = _get_bert_assets(model_name)
+        rows = []
+        for start in range(0, len(texts), batch_size):
+            batch = [str(t) for t in texts[start:start + batch_size]]
+            inputs = tokenizer(batch, return_tensors='pt', truncation=True, padding=True, max_length=512)
+            hidden = model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            rows.append((hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1))
+        embeddings = torch.cat(rows)
+        if embeddings.device.type == 'meta':
+            raise RuntimeError("meta tensor")
+        return embeddings
+    except Exception:
+        if not fallback:
+            raise
+        return torch.stack([get_fallback_vector(t) for t in texts])
+
+def _load_static_table(model_name: str = 'distilbert-base-uncased'):
+    """
+    Load the static token-embedding table once.
+
+    Pre-distilled vectors in `STATIC_VECTORS_PATH` (arrays `tokens` and `vectors`)
+    are preferred; otherwise DistilBERT's input embedding table is used, which
+    only needs the model weights at load time, never a forward pass. A failed
+    load is remembered, so it is attempted only once per process.
+    """
+    global _STATIC_TABLE
+    if _STATIC_TABLE is _STATIC_UNAVAILABLE:
+        raise RuntimeError("Static token vectors are unavailable")
+    if _STATIC_TABLE is None:
+        try:
+            if os.path.exists(STATIC_VECTORS_PATH):
+                data = np.load(STATIC_VECTORS_PATH, allow_pickle=False)
+                vocab = {str(tok): i for i, tok in enumerate(data['tokens'])}
+                table = torch.from_numpy(data['vectors'].astype(np.float32))
+            else:
+                tokenizer, model = _get_bert_assets(model_name)
+                vocab = tokenizer.get_vocab()
+                table = model.get_input_embeddings().weight.detach().clone().float()
+        except Exception as e:
+            _STATIC_TABLE = _STATIC_UNAVAILABLE
+            print(f"Warning: Static token vectors unavailable, using keyword vectors instead: {e}")
+            raise
+        _STATIC_TABLE = (vocab, table)
+    return _STATIC_TABLE
+
+def embedding_available(embedding_mode: str) -> bool:
+    """
+    Whether the backend of `embedding_mode` ("bert" or "static") has been loaded.
+    When it has not, that mode's embeddings so far were keyword fallback vectors.
+    """
+    if embedding_mode == "static":
+        return isinstance(_STATIC_TABLE, tuple)
+    return hasattr(get_bert_embedding, "_cached_assets")
+
+def _wordpiece(word: str, vocab: dict) -> list:
+    """Greedy longest-match-first WordPiece split of one word (as in BERT's tokenizer)."""
+    if word in vocab:
+        return [word]
+    pieces = []
+    start = 0
+    while start < len(word):
+        end = len(word)
+        piece = None
+        while start < end:
+            candidate = word[start:end] if start == 0 else "##" + word[start:end]
+            if candidate in vocab:
+                piece = candidate
+                break
+            end -= 1
+        if piece is None:
+            return []  # Unknown word: contributes nothing (BERT would emit [UNK])
+        pieces.append(piece)
+        start = end
+    return pieces
+
+def static_tokenize(text: str, vocab: dict) -> list:
+    """Lowercase, strip accents, split on whitespace/punctuation and WordPiece each word."""
+    text = unicodedata.normalize('NFD', (text or '').lower())
+    text = ''.join(ch for ch in text if unicodedata.category(ch) != 'Mn')
+    tokens = []
+    for word in re.findall(r'\w+|[^\w\s]', text):
+        tokens.extend(_wordpiece(word, vocab))
+    return tokens
+
+def get_static_embedding(text: str, model_name: str = 'distilbert-base-uncased'):
+    """
+    Average of precomputed token vectors over the tokenized text.
+
+    A middle ground between `get_bert_embedding` (full transformer forward pass)
+    and `get_fallback_vector` (one-hot keywords): semantic-ish similarity at the
+    cost of a few dictionary lookups. Falls back to the keyword vector if no
+    embedding table can be loaded.
+    """
+    try:
+        vocab, table = _load_static_table(model_name)
+    except Exception:
+        return get_fallback_vector(text)
+
+    ids = [vocab[tok] for tok in static_tokenize(text, vocab)]
+    if not ids:
+        return torch.zeros(table.shape[1])
+    return table[ids].mean(dim=0)
+
+def export_static_token_vectors(output_path: str = STATIC_VECTORS_PATH,
+                                model_name: str = 'distilbert-base-uncased') -> str:
+    """
+    Write DistilBERT's input embedding table to `output_path` as float16 so the
+    static embedding mode can run without loading the transformer.
+    """
+    tokenizer, model = _get_bert_assets(model_name)
+    vocab = tokenizer.get_vocab()
+    tokens = sorted(vocab, key=vocab.get)
+    vectors = model.get_input_embeddings().weight.detach().cpu().numpy().astype(np.float16)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    np.savez(output_path, tokens=np.array(tokens), vectors=vectors)
+    return output_path
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+def split_sentences(text: str, min_words: int = 3, max_sentences: int = 32) -> list:
+    """
+    Split free text into sentences on ., !, ? and ; boundaries and line breaks.
+    Fragments shorter than `min_words` are folded into the previous sentence, and
+    anything past `max_sentences` is merged into the last one so batches stay bounded.
+    """
+    sentences = []
+    for part in _SENTENCE_BOUNDARY.split(text or ''):
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and len(part.split()) < min_words:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    if len(sentences) > max_sentences:
+        sentences = sentences[:max_sentences - 1] + [' '.join(sentences[max_sentences - 1:])]
+    return sentences
+
 def preprocess_text(text: str) -> str:
     """
     Preprocess student input text for NLP analysis.
@@ -100,6 +273,7 @@ def preprocess_text(text: str) -> str:
     Returns:
         str: Preprocessed text
     """
+    global _STOP_WORDS, _LEMMATIZER
     if not text:
         return ""
 
@@ -113,13 +287,16 @@ def preprocess_text(text: str) -> str:
     # Tokenize
     tokens = word_tokenize(text)
 
+    if _STOP_WORDS is None:
+        _STOP_WORDS = set(stopwords.words('english'))
+    if _LEMMATIZER is None:
+        _LEMMATIZER = WordNetLemmatizer()
+
     # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = [token for token in tokens if token not in stop_words]
+    tokens = [token for token in tokens if token not in _STOP_WORDS]
 
     # Lemmatize
-    lemmatizer = WordNetLemmatizer()
-    tokens = [lemmatizer.lemmatize(token) for token in tokens]
+    tokens = [_LEMMATIZER.lemmatize(token) for token in tokens]
 
     # Join back to string
     return ' '.join(tokens)
\ No newline at end of file
@@ -0,0 +1,145 @@
+import os
+import json
+import hashlib
+from typing import Dict, List, Any, Optional # type: ignore
+import numpy as np # type: ignore
+from scipy import sparse # type: ignore
+from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
+from sklearn.preprocessing import normalize # type: ignore
+from .eligibility_matrix import EligibilityMatrix, ELIGIBLE # type: ignore
+
+DEFAULT_GRAPH_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'programme_graph.npz')
+
+# Level and filler words are ignored in names so that e.g. a degree links to the
+# diploma in the same field rather than to every other degree
+_NAME_STOP_WORDS = [
+    'bachelor', 'bachelors', 'diploma', 'certificate', 'craft', 'degree', 'higher', 'national',
+    'of', 'in', 'and', 'with', 'the', 'for', 'science', 'arts', 'bsc', 'ba',
+]
+
+
+def build_programme_graph(matrix: EligibilityMatrix, k: int = 50, name_weight: float = 0.7,
+                          block_size: int = 512) -> Any:
+    """
+    Sparse top-k similarity graph over the requirement entries of `matrix`.
+
+    Similarity is the cosine similarity between programme names (word 1-2 gram
+    TF-IDF, level words removed), scaled up to 1/name_weight by the cosine
+    similarity of their subject requirement vectors (minimum points per subject
+    slot). Requirements only re-rank programmes whose names overlap; on their own
+    they would link every programme that asks for, say, Mathematics. Rows are
+    computed in blocks and only the k strongest neighbours (excluding self) are kept.
+
+    Returns:
+        scipy.sparse.csr_matrix of shape (n, n)
+    """
+    n = len(matrix.keys)
+    if n == 0:
+        return sparse.csr_matrix((0, 0))
+
+    names = [str(key).replace('\n', ' ').lower() for key in matrix.keys]
+    tfidf = TfidfVectorizer(ngram_range=(1, 2), stop_words=_NAME_STOP_WORDS, sublinear_tf=True)
+    try:
+        name_vecs = tfidf.fit_transform(names)
+    except ValueError:
+        name_vecs = sparse.csr_matrix((n, 1))
+    subject_vecs = normalize(sparse.csr_matrix(matrix.min_subject.astype(np.float32)))
+
+    rows, cols, vals = [], [], []
+    k = min(k, n - 1)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        name_sim = (name_vecs[start:stop] @ name_vecs.T).toarray()
+        subject_sim = (subject_vecs[start:stop] @ subject_vecs.T).toarray()
+        block = name_sim * (name_weight + (1 - name_weight) * subject_sim)
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # no self loops
+        if k <= 0:
+            continue
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        for i, neighbours in enumerate(top):
+            for j in neighbours:
+                if block[i, j] > 0:
+                    rows.append(start + i)
+                    cols.append(int(j))
+                    vals.append(float(block[i, j]))
+    return sparse.csr_matrix((vals, (rows, cols)), shape=(n, n), dtype=np.float32)
+
+
+def requirements_fingerprint(matrix: EligibilityMatrix) -> str:
+    """
+    Hash of everything the graph is built from: the programme names and the
+    per-subject minimum points (both similarity terms), so editing a subject
+    requirement makes a saved graph stale even if no name changes.
+    """
+    digest = hashlib.sha256(json.dumps([matrix.keys, matrix.slots]).encode('utf-8'))
+    digest.update(np.ascontiguousarray(matrix.min_subject, dtype=np.int16).tobytes())
+    return digest.hexdigest()
+
+
+def save_programme_graph(matrix: EligibilityMatrix, output_path: str = DEFAULT_GRAPH_PATH, k: int = 50) -> Any:
+    """
+    Build the graph for `matrix` and write it to `output_path`, keyed by the
+    fingerprint of the requirements it was built from. Run offline whenever the KUCCPS
+    requirements change (scripts/build_programme_graph.py, scripts/update_jobs.py).
+
+    Returns:
+        scipy.sparse.csr_matrix: the graph that was written
+    """
+    graph = build_programme_graph(matrix, k=k)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = output_path + '.tmp.npz'
+    np.savez(tmp_path, fingerprint=np.array(requirements_fingerprint(matrix)), indptr=graph.indptr, indices=graph.indices, data=graph.data)
+    os.replace(tmp_path, output_path)
+    return graph
+
+
+def load_programme_graph(matrix: EligibilityMatrix, path: str = DEFAULT_GRAPH_PATH) -> Any:
+    """
+    The graph saved at `path`, or None if it is missing, unreadable or was built
+    from different requirements (names or subject minimums) than `matrix`.
+    """
+    try:
+        if not path or not os.path.exists(path):
+            return None
+        data = np.load(path, allow_pickle=False)
+        if str(data['fingerprint']) != requirements_fingerprint(matrix):
+            return None
+        n = len(matrix.keys)
+        return sparse.csr_matrix((data['data'], data['indices'], data['indptr']), shape=(n, n))
+    except Exception:
+        return None
+
+
+class ProgrammeGraph:
+    """
+    Request-time side of the programme similarity graph: neighbour lookups on a
+    precomputed CSR matrix, filtered with the vectorized eligibility mask.
+
+    The graph is only loaded here; it is built offline by `save_programme_graph`.
+    Without a current graph at `cache_path` there are no alternatives to offer.
+    """
+
+    def __init__(self, matrix: EligibilityMatrix, cache_path: Optional[str] = DEFAULT_GRAPH_PATH):
+        self.matrix = matrix
+        self.graph = load_programme_graph(matrix, cache_path) if cache_path else None
+        if self.graph is None:
+            print(f"Warning: No current programme graph at {cache_path}; "
+                  "run scripts/build_programme_graph.py to enable alternative programmes")
+            n = len(matrix.keys)
+            self.graph = sparse.csr_matrix((n, n), dtype=np.float32)
+
+    def alternatives(self, program_name: str, codes: Any, n: int = 3) -> List[Dict[str, Any]]:
+        """
+        The `n` most similar programmes to `program_name` whose status in `codes`
+        (from `EligibilityMatrix.statuses`) is ELIGIBLE, best first.
+        """
+        row = self.matrix.lookup(program_name)
+        if row < 0:
+            return []
+        start, stop = self.graph.indptr[row], self.graph.indptr[row + 1]
+        neighbours = self.graph.indices[start:stop]
+        weights = self.graph.data[start:stop]
+        keep = codes[neighbours] == ELIGIBLE
+        neighbours, weights = neighbours[keep], weights[keep]
+        order = np.argsort(-weights, kind='stable')[:n]
+        return [{'programme': self.matrix.keys[neighbours[i]], 'similarity': round(float(weights[i]), 4)} for i in order]
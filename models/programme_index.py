@@ -0,0 +1,95 @@
+import os
+from typing import Dict, List, Any, Optional # type: ignore
+import numpy as np # type: ignore
+from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
+from .interest_classifier import _build_query_index, _query_scores # type: ignore
+from .dept_centroids import embed_texts # type: ignore
+
+DEFAULT_PROGRAMME_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'programme_index.npz')
+
+
+def programme_catalogue(kuccps_df: Any, requirements: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Every distinct programme from kuccps_courses.csv plus requirement entries not
+    already listed there, mapped to the text that represents it in the index
+    (programme name and its department).
+    """
+    catalogue: Dict[str, str] = {}
+    seen = set()
+    if kuccps_df is not None and 'Programme_Name' in kuccps_df.columns:
+        depts = kuccps_df['Department'] if 'Department' in kuccps_df.columns else [''] * len(kuccps_df)
+        for name, dept in zip(kuccps_df['Programme_Name'], depts):
+            if not isinstance(name, str) or not name.strip() or name in catalogue:
+                continue
+            dept = dept if isinstance(dept, str) else ''
+            catalogue[name] = f"{name.replace(chr(10), ' ')}. {dept}".strip()
+            seen.add(name.replace('\n', ' ').strip().lower())
+    for name in requirements:
+        if name.replace('\n', ' ').strip().lower() not in seen:
+            catalogue[name] = name.replace('\n', ' ')
+            seen.add(name.replace('\n', ' ').strip().lower())
+    return catalogue
+
+
+class ProgrammeIndex:
+    """
+    Programme-level retrieval: student text scored against every KUCCPS programme
+    in one matrix product per layer (TF-IDF over programme texts and dense
+    embeddings in the classifier's embedding space).
+
+    Embeddings are the only expensive part; they are cached in
+    `DEFAULT_PROGRAMME_INDEX_PATH` and rebuilt when the programme list or the
+    embedding mode changes.
+    """
+
+    def __init__(self, catalogue: Dict[str, str], embedding_mode: str = "bert",
+                 cache_path: Optional[str] = DEFAULT_PROGRAMME_INDEX_PATH, embedding_weight: float = 0.5):
+        self.names = list(catalogue)
+        self.texts = [catalogue[n] for n in self.names]
+        self.embedding_mode = embedding_mode
+        self.embedding_weight = embedding_weight
+
+        tfidf = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, stop_words='english')
+        tfidf_matrix = tfidf.fit_transform([t.lower() for t in self.texts])
+        self._tfidf_index = _build_query_index(tfidf, tfidf_matrix)
+
+        self.embeddings = self._load_embeddings(cache_path)
+        if self.embeddings is None:
+            try:
+                vectors = embed_texts(self.texts, embedding_mode)
+            except Exception as e:
+                # Without the embedding backend the index ranks by TF-IDF alone
+                print(f"Warning: Could not embed programmes, using TF-IDF only: {e}")
+                return
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self.embeddings = vectors / np.where(norms > 0, norms, 1.0)
+            if cache_path:
+                try:
+                    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+                    np.savez(cache_path, names=np.array(self.names), embeddings=self.embeddings.astype(np.float16),
+                             embedding_mode=np.array(embedding_mode))
+                except Exception as e:
+                    print(f"Warning: Could not cache programme embeddings: {e}")
+
+    def _load_embeddings(self, cache_path: Optional[str]) -> Any:
+        try:
+            if not cache_path or not os.path.exists(cache_path):
+                return None
+            data = np.load(cache_path, allow_pickle=False)
+            if str(data['embedding_mode']) != self.embedding_mode or data['names'].tolist() != self.names:
+                return None
+            return data['embeddings'].astype(np.float32)
+        except Exception:
+            return None
+
+    def score(self, text: str, query_vector: Any = None) -> Any:
+        """Blended similarity of `text` to every programme, aligned with `self.names`."""
+        scores = _query_scores(self._tfidf_index, text.lower())
+        if query_vector is None or self.embeddings is None:
+            return scores
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != self.embeddings.shape[1]:
+            return scores
+        semantic = self.embeddings @ (query / norm)
+        return (1 - self.embedding_weight) * scores + self.embedding_weight * semantic
@@ -0,0 +1,226 @@
+import re
+import math
+import bisect
+import heapq
+from typing import Dict, List, Any, Optional, Tuple # type: ignore
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Field weights: a hit in the programme name counts more than in the institution or department
+_FIELD_WEIGHTS = (("Programme_Name", 3.0), ("Institution_Name", 2.0), ("Department", 1.0))
+
+
+def _tokens(text: Any) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower()) if isinstance(text, str) else []
+
+
+def _infer_level(name: str) -> Optional[str]:
+    upper = name.upper()
+    if re.search(r'\bBACHELOR', upper):
+        return "Degree"
+    if re.search(r'\bDIPLOMA\b', upper):
+        return "Diploma"
+    if re.search(r'\b(CERTIFICATE|CRAFT)\b', upper):
+        return "Certificate"
+    return None
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.top: List[int] = []  # best programme ids completing this prefix
+
+
+class ProgrammeSearchIndex:
+    """
+    In-memory full-text search over kuccps_courses.csv (one document per
+    programme offering at an institution).
+
+    Built once with the recommender's data snapshot:
+    - an inverted index token -> {doc id: field-weighted term frequency},
+      scored BM25-style with the last query word matched as a prefix;
+    - a sorted vocabulary for prefix expansion (bisect, no scan);
+    - a character trie over programme-name words whose nodes keep the top
+      programme names for that prefix, so autocomplete is a walk of len(prefix) nodes;
+    - per-document level, institution and cutoff columns for filtering.
+    """
+
+    def __init__(self, kuccps_df: Any, requirements: Optional[Dict[str, Any]] = None, suggestions_per_node: int = 8):
+        # Level from the programme name, else from an exactly matching requirement entry
+        levels = {str(k).replace('\n', ' ').strip().lower(): (v or {}).get('level')
+                  for k, v in (requirements or {}).items()}
+        self.docs: List[Dict[str, Any]] = []
+        self.postings: Dict[str, Dict[int, float]] = {}
+        doc_lengths: List[float] = []
+
+        if kuccps_df is not None and 'Programme_Name' in kuccps_df.columns:
+            cutoff_cols = [c for c in ['Cutoff_2024', 'Cutoff_2023', 'Cutoff_2022'] if c in kuccps_df.columns]
+            for record in kuccps_df.to_dict('records'):
+                name = record.get('Programme_Name')
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                doc_id = len(self.docs)
+                length = 0.0
+                for field, weight in _FIELD_WEIGHTS:
+                    for tok in _tokens(record.get(field)):
+                        bucket = self.postings.setdefault(tok, {})
+                        bucket[doc_id] = bucket.get(doc_id, 0.0) + weight
+                        length += weight
+                doc_lengths.append(length)
+
+                cutoff = None
+                for col in cutoff_cols:
+                    try:
+                        value = float(record.get(col))
+                        if not math.isnan(value):
+                            cutoff = value
+                            break
+                    except (TypeError, ValueError):
+                        continue
+
+                level = levels.get(name.replace('\n', ' ').strip().lower())
+                self.docs.append({
+                    'programme': name,
+                    'institution': record['Institution_Name'].replace('\n', ' ') if isinstance(record.get('Institution_Name'), str) else '',
+                    'code': str(record.get('Program_Code', '') or ''),
+                    'department': record.get('Department', '') if isinstance(record.get('Department'), str) else '',
+                    'level': _infer_level(name) or level or "Degree",
+                    'cutoff': cutoff,
+                })
+
+        n_docs = len(self.docs)
+        self._avg_len = (sum(doc_lengths) / n_docs) if n_docs else 1.0
+        self._doc_lengths = doc_lengths
+        self._idf = {tok: math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for tok, p in self.postings.items()}
+        self._vocab = sorted(self.postings)
+
+        # Autocomplete trie over programme-name words; popularity = number of offerings
+        offerings: Dict[str, int] = {}
+        first_doc: Dict[str, int] = {}
+        for doc_id, doc in enumerate(self.docs):
+            offerings[doc['programme']] = offerings.get(doc['programme'], 0) + 1
+            first_doc.setdefault(doc['programme'], doc_id)
+        ranked = sorted(first_doc, key=lambda n: (-offerings[n], n))
+        # Same order, for multi-word prefixes that the trie alone cannot answer
+        self._ranked_names = [(first_doc[name], set(_tokens(name))) for name in ranked]
+        self._trie = _TrieNode()
+        for name in ranked:
+            doc_id = first_doc[name]
+            for word in set(_tokens(name)):
+                node = self._trie
+                for ch in word:
+                    node = node.children.setdefault(ch, _TrieNode())
+                    if len(node.top) < suggestions_per_node and doc_id not in node.top:
+                        node.top.append(doc_id)
+
+    # ── Autocomplete ──────────────────────────────────────────────────
+    def autocomplete(self, prefix: str, limit: int = 8) -> List[str]:
+        """
+        Programme names containing a word that starts with the last word of
+        `prefix` and every earlier word of it, most offered first.
+        """
+        words = _tokens(prefix)
+        if not words:
+            return []
+        node = self._trie
+        for ch in words[-1]:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        earlier = words[:-1]
+        if not earlier:
+            return [self.docs[i]['programme'] for i in node.top[:limit]]
+
+        # The node's top suggestions may lack the earlier words, so scan every name in
+        # the same order (unless an earlier word is not indexed at all)
+        if any(word not in self.postings for word in earlier):
+            return []
+        last = words[-1]
+        matches = []
+        for doc_id, name_words in self._ranked_names:
+            if (all(word in name_words for word in earlier) and any(w.startswith(last) for w in name_words)):
+                matches.append(self.docs[doc_id]['programme'])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    # ── Search ────────────────────────────────────────────────────────
+    def _expand_prefix(self, prefix: str, limit: int = 50) -> List[str]:
+        """
+        Up to `limit` indexed terms starting with `prefix`: the prefix itself if it
+        is a whole term, then the completions found in the most documents (not the
+        alphabetically first ones, which for short prefixes are mostly rare words).
+        """
+        start = bisect.bisect_left(self._vocab, prefix)
+        stop = bisect.bisect_left(self._vocab, prefix + '\uffff')
+        if stop - start <= limit:
+            return self._vocab[start:stop]
+        return heapq.nlargest(limit, self._vocab[start:stop],
+                              key=lambda term: (term == prefix, len(self.postings[term])))
+
+    def search(self, query: str, level: Optional[str] = None, institution: Optional[str] = None,
+               cutoff_min: Optional[float] = None, cutoff_max: Optional[float] = None,
+               k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked programme offerings for `query`. Every query word must match
+        (the last one as a prefix, for search-as-you-type); filters are exact on
+        level and institution (case-insensitive) and inclusive on cutoff.
+        An empty query with filters lists matching offerings, lowest cutoff first.
+        """
+        words = _tokens(query)
+        candidates: Optional[set] = None
+        word_terms: List[List[str]] = []
+        for i, word in enumerate(words):
+            terms = self._expand_prefix(word) if i == len(words) - 1 else ([word] if word in self.postings else [])
+            matched: set = set()
+            for term in terms:
+                matched.update(self.postings[term])
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return []
+            word_terms.append(terms)
+
+        # Score only the surviving candidates (BM25 over field-weighted term frequencies)
+        scores: Dict[int, float] = {}
+        k1, b = 1.2, 0.75
+        for terms in word_terms:
+            for term in terms:
+                idf = self._idf[term]
+                postings = self.postings[term]
+                for doc_id in candidates or ():
+                    tf = postings.get(doc_id)
+                    if tf:
+                        norm = tf + k1 * (1 - b + b * self._doc_lengths[doc_id] / self._avg_len)
+                        scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / norm
+
+        if candidates is None:
+            if level is None and institution is None and cutoff_min is None and cutoff_max is None:
+                return []
+            candidates = set(range(len(self.docs)))
+
+        inst = institution.lower() if institution else None
+        results: List[Tuple[float, int]] = []
+        for doc_id in candidates:
+            doc = self.docs[doc_id]
+            if level and doc['level'] != level:
+                continue
+            if inst and doc['institution'].lower() != inst:
+                continue
+            if cutoff_min is not None and (doc['cutoff'] is None or doc['cutoff'] < cutoff_min):
+                continue
+            if cutoff_max is not None and (doc['cutoff'] is None or doc['cutoff'] > cutoff_max):
+                continue
+            results.append((scores.get(doc_id, 0.0), doc_id))
+
+        if words:
+            results.sort(key=lambda item: (-item[0], item[1]))
+        else:
+            # Offerings without a cutoff go last
+            results.sort(key=lambda item: (self.docs[item[1]]['cutoff'] is None, self.docs[item[1]]['cutoff'] or 0.0, item[1]))
+        return [{**self.docs[doc_id], 'score': round(score, 4)} for score, doc_id in results[:k]]
+
+    def institutions(self) -> List[str]:
+        """Distinct institution names, for filter dropdowns."""
+        return sorted({d['institution'] for d in self.docs if d['institution']})
@@ -1,10 +1,39 @@
 # Career Recommender Engine - v2.1
 import pandas as pd # type: ignore
+import numpy as np # type: ignore
 import json
 import configparser
 import os, re
 from typing import List, Dict, Optional, Any, cast # type: ignore
 from .interest_classifier import InterestClassifier # type: ignore
+from .interest_vectorizer import EMBEDDING_MODES # type: ignore
+from .job_signal_index import JobSignalIndex # type: ignore
+from .dept_centroids import load_department_centroids # type: ignore
+from .semantic_job_index import SemanticJobIndex # type: ignore
+from .eligibility_matrix import EligibilityMatrix, STATUS_LABELS # type: ignore
+from .programme_index import ProgrammeIndex, programme_catalogue # type: ignore
+from .programme_graph import ProgrammeGraph # type: ignore
+from .programme_search import ProgrammeSearchIndex # type: ignore
+from .institution_index import InstitutionIndex # type: ignore
+from .taxonomy import get_taxonomy, DEPARTMENT_KEYWORDS as department_keywords, SKILL_MAP_ALIASES, DEMAND_ALIASES # type: ignore
+from core.job_keys import job_key # type: ignore
+from core.locations import normalize_location # type: ignore
+
+def _float_setting(cfg: Dict[str, str], key: str, default: float, section: str = 'classifier') -> float:
+    """Float config value, or `default` (with a warning) when it is missing or not a number."""
+    try:
+        return float(cfg.get(key, default))
+    except ValueError:
+        print(f"Warning: Invalid [{section}] {key} '{cfg[key]}' in config, using {default}")
+        return default
+
+def _choice_setting(cfg: Dict[str, str], key: str, choices: tuple, default: str, section: str = 'classifier') -> str:
+    """Lower-cased config value if it is one of `choices`, otherwise `default` (with a warning)."""
+    value = cfg.get(key, default).strip().lower()
+    if value not in choices:
+        print(f"Warning: Invalid [{section}] {key} '{value}' in config, using '{default}'")
+        return default
+    return value
 
 class CareerRecommender:
     GRADE_POINTS = {
@@ -18,10 +47,19 @@ class CareerRecommender:
         # Default fallback paths
         default_paths = {
             'demand_csv': 'data/job_demand_metrics.csv',
+            'regional_demand_csv': 'data/job_demand_regional.csv',
+            'demand_db': 'data/demand_history.db',
             'skill_map_json': 'data/career_skill_map.json',
             'jobs_csv': 'data/myjobmag_jobs.csv',
             'kuccps_csv': 'Kuccps/kuccps_courses.csv',
-            'requirements_json': 'Kuccps/kuccps_requirements.json'
+            'requirements_json': 'Kuccps/kuccps_requirements.json',
+            'job_signal_index': 'data/job_signal_index.pkl',
+            'dept_centroids': 'data/dept_job_centroids.npz',
+            'job_embeddings': 'data/job_embeddings.f16.npy',
+            'job_embeddings_meta': 'data/job_embeddings_meta.json',
+            'programme_index': 'data/programme_index.npz',
+            'programme_graph': 'data/programme_graph.npz',
+            'jobs_search_db': 'data/jobs_search.db'
         }
         
         try:
@@ -33,12 +71,65 @@ class CareerRecommender:
             print(f"Warning: Using default paths due to config error: {e}")
             paths = default_paths
 
-        self.classifier = InterestClassifier()
+        # Optional [classifier] section: mode = full | fast | cascade,
+        # cascade_margin / cascade_min_signal thresholds for the cascade, and
+        # embedding = bert | static for the semantic layer's vector space,
+        # centroid_weight for blending in offline real-job department centroids, and
+        # sentence_pooling = none | max | attention for per-sentence scoring of long essays
+        # Each setting is validated on its own, so one bad value only resets that setting
+        classifier_cfg = dict(config['classifier']) if 'classifier' in config else {}
+        self.classifier_mode = _choice_setting(classifier_cfg, 'mode', InterestClassifier.MODES, 'full')
+        sentence_pooling = _choice_setting(classifier_cfg, 'sentence_pooling', ('none', 'max', 'attention'), 'none')
+        self.classifier = InterestClassifier(
+            cascade_margin=_float_setting(classifier_cfg, 'cascade_margin', 0.05),
+            cascade_min_signal=_float_setting(classifier_cfg, 'cascade_min_signal', 0.10),
+            embedding_mode=_choice_setting(classifier_cfg, 'embedding', tuple(EMBEDDING_MODES), 'bert'),
+            job_signal_index=JobSignalIndex.load(paths.get('job_signal_index', '')),
+            dept_centroids=load_department_centroids(paths.get('dept_centroids', '')),
+            centroid_weight=_float_setting(classifier_cfg, 'centroid_weight', 0.3),
+            sentence_pooling=None if sentence_pooling == 'none' else sentence_pooling
+        )
         self.data_health = {}
 
+        # Memory-mapped job embedding index, opened on first search_jobs() call
+        self._semantic_index_paths = (paths.get('job_embeddings', ''), paths.get('job_embeddings_meta', ''))
+        self._semantic_index = None
+        self._job_rows_by_key = None
+        # SQLite FTS5 job store maintained by the ETL (etl/job_search_db.py)
+        self._jobs_search_db = paths.get('jobs_search_db', '')
+
+        # Programme-level index and vectorized eligibility, built on first recommend_programmes() call
+        self._programme_index_path = paths.get('programme_index', '')
+        self._programme_index = None
+        self._programme_req_rows = None
+        self._eligibility_matrix = None
+        self._programme_graph_path = paths.get('programme_graph', '')
+        self._programme_graph = None
+        self._institution_index = None
+
+        # [demand] window = all | <days>: with a number of days, demand is the postings first
+        # seen in that rolling window, served by the ETL's append-only DemandStore; the
+        # demand CSV is the fallback (and the source for "all")
+        demand_cfg = dict(config['demand']) if 'demand' in config else {}
+        window = demand_cfg.get('window', 'all').strip().lower()
+        try:
+            self.demand_window = None if window in ('', 'all') else max(int(window), 1)
+        except ValueError:
+            print(f"Warning: Invalid [demand] window '{window}' in config, using all-time demand")
+            self.demand_window = None
+
         # Load demand metrics
         try:
-            self.demand_df = pd.read_csv(paths.get('demand_csv', ''))
+            self.demand_df = None
+            if self.demand_window and os.path.exists(paths.get('demand_db', '')):
+                from .demand_store import DemandStore # type: ignore
+                with DemandStore(paths['demand_db']) as store:
+                    self.demand_df = store.demand(self.demand_window)
+                if self.demand_df.empty:
+                    print(f"Warning: No postings in the last {self.demand_window} days of demand history, using the demand CSV")
+                    self.demand_df = None
+            if self.demand_df is None:
+                self.demand_df = pd.read_csv(paths.get('demand_csv', ''))
             if 'Department' in self.demand_df.columns:
                 self.demand_df.set_index('Department', inplace=True)
             self.max_demand = self.demand_df['job_count'].max() if 'job_count' in self.demand_df.columns and not self.demand_df.empty else 0
@@ -49,6 +140,17 @@ class CareerRecommender:
             self.max_demand = 0
             self.data_health['demand_ok'] = False
 
+        # Regional demand cube {region: {department: (job_count, demand_score)}}; the
+        # [demand] regional_weight setting is the share of demand taken from the region
+        self.regional_weight = min(max(_float_setting(demand_cfg, 'regional_weight', 0.5, 'demand'), 0.0), 1.0)
+        self.regional_demand: Dict[str, Dict[str, tuple]] = {}
+        try:
+            regional_df = pd.read_csv(paths.get('regional_demand_csv', ''))
+            for dept, region, count, score in regional_df[['Department', 'Region', 'job_count', 'demand_score']].itertuples(index=False):
+                self.regional_demand.setdefault(region, {})[dept] = (int(count), float(score))
+        except Exception as e:
+            print(f"Warning: Could not load regional demand metrics: {e}")
+
         # Load skill map
         try:
             with open(paths.get('skill_map_json', ''), 'r') as f:
@@ -62,44 +164,9 @@ class CareerRecommender:
         # Load scraped jobs
         try:
             self.jobs_df = pd.read_csv(paths.get('jobs_csv', ''))
-            # Normalize job categories to internal department taxonomy
-            job_category_mapping = {
-                # IT
-                'IT': 'Information Technology', 'I.T.': 'Information Technology', 'Information Tech': 'Information Technology',
-                # Business family
-                'Sales & Marketing': 'Marketing & Sales', 'Sales/Marketing': 'Marketing & Sales', 'Marketing': 'Marketing & Sales', 'Sales': 'Marketing & Sales',
-                'Accounting/Finance': 'Finance & Accounting', 'Finance': 'Finance & Accounting', 'Accounting': 'Finance & Accounting',
-                'Admin & Support': 'Administration & Support', 'Administration': 'Administration & Support',
-                'Business Development': 'Business', 'Operations': 'Business', 'Customer Service': 'Business',
-                'Real Estate': 'Real Estate & Property', 'Property': 'Real Estate & Property',
-                # Education
-                'Education/Teaching': 'Education', 'Teaching': 'Education', 'Education': 'Education', 'Teacher': 'Education', 'Lecturer': 'Education',
-                # Data / Analytics
-                'Data/Analytics': 'Data Science & Analytics', 'Data Science': 'Data Science & Analytics', 'Analytics': 'Data Science & Analytics',
-                # Project Management
-                'Project/Program Management': 'Project Management', 'Programme Management': 'Project Management',
-                # Agriculture & Environment
-                'Agriculture': 'Agriculture & Environmental', 'Environment': 'Agriculture & Environmental', 'Environmental': 'Agriculture & Environmental', 'Horticulture': 'Agriculture & Environmental', 'Livestock': 'Agriculture & Environmental',
-                # Law
-                'Legal': 'Law', 'Legal & Compliance': 'Law', 'Law': 'Law',
-                # Healthcare
-                'Healthcare': 'Healthcare & Medical', 'Medical': 'Healthcare & Medical', 'Nursing': 'Healthcare & Medical', 'Pharmacy': 'Healthcare & Medical', 'Dentistry': 'Healthcare & Medical', 'Veterinary': 'Healthcare & Medical',
-                # HR
-                'Human Resource': 'Human Resources', 'Human Resources': 'Human Resources', 'HR': 'Human Resources',
-                # Renewable Energy & Environment
-                'Renewable Energy': 'Renewable Energy & Environment', 'Environment & Conservation': 'Renewable Energy & Environment'
-            }
-            # Merge external admin-defined mappings if present
-            try:
-                project_root = os.path.dirname(os.path.dirname(__file__))
-                cat_map_path = os.path.join(project_root, 'data', 'category_mappings.json')
-                if os.path.exists(cat_map_path):
-                    with open(cat_map_path, 'r', encoding='utf-8') as f:
-                        ext_map = json.load(f)
-                        if isinstance(ext_map, dict):
-                            job_category_mapping.update(ext_map)
-            except Exception as e:
-                print(f"Warning: Could not load external category mappings: {e}")
+            # Normalize job categories to internal department taxonomy (built-in aliases + admin overrides)
+            taxonomy = get_taxonomy()
+            job_category_mapping = taxonomy.category_map
 
             if 'Department' in self.jobs_df.columns:
                 self.jobs_df['DeptNorm'] = self.jobs_df['Department'].map(job_category_mapping).fillna(self.jobs_df['Department'])
@@ -123,27 +190,8 @@ class CareerRecommender:
                         str(row.get('Department', '')),
                         str(row.get('Category', '')),
                         str(row.get('Job Title', ''))
-                    ]).lower()
-                    patterns = [
-                        (r'nurs|pharm|dent|clinic|medical|health|vet', 'Healthcare & Medical'),
-                        (r'human resource|\bhr\b|recruit|talent', 'Human Resources'),
-                        (r'teacher|lectur|education|tsc|school', 'Education'),
-                        (r'sales|marketing|brand|seo|sem|growth', 'Marketing & Sales'),
-                        (r'agri|farm|horti|soil|crop|livestock', 'Agriculture & Environmental'),
-                        (r'environ|ecolog|conserv|renewable|solar|wind|energy', 'Renewable Energy & Environment'),
-                        (r'data|analytics?|machine learning|\bml\b|\bai\b|business intelligence|\bbi\b', 'Data Science & Analytics'),
-                        (r'project manager|program manager|\bpmo\b|project', 'Project Management'),
-                        (r'law|legal|advocate|attorney|compliance', 'Law'),
-                        (r'account|finance|auditor|\bcpa\b|bookkeep|treasury', 'Finance & Accounting'),
-                        (r'software|developer|engineer|\bit\b|systems|network|cyber|cloud|devops', 'Information Technology'),
-                    ]
-                    for pat, dep in patterns:
-                        try:
-                            if re.search(pat, source):
-                                return dep
-                        except Exception:
-                            continue
-                    return dn
+                    ])
+                    return taxonomy.infer_department(source) or dn
                 try:
                     self.jobs_df['DeptNorm'] = self.jobs_df.apply(_infer_dept, axis=1)
                 except Exception:
@@ -157,6 +205,7 @@ class CareerRecommender:
         # Load KUCCPS University Mapping
         try:
             kuccps_df = pd.read_csv(paths.get('kuccps_csv', ''))
+            self.kuccps_df = kuccps_df
             # Remove duplicates and group
             self.university_map = kuccps_df.groupby('Programme_Name')['Institution_Name'].apply(lambda x: list(set(x))).to_dict()
             
@@ -182,6 +231,7 @@ class CareerRecommender:
             self.data_health['kuccps_map_ok'] = True
         except Exception as e:
             print(f"Warning: Could not load KUCCPS CSV: {e}")
+            self.kuccps_df = pd.DataFrame(columns=['Programme_Name', 'Institution_Name'])
             self.university_map = {}
             self.cutoff_map = {}
             self.data_health['kuccps_map_ok'] = False
@@ -196,6 +246,141 @@ class CareerRecommender:
             self.kuccps_requirements = {}
             self.data_health['kuccps_requirements_ok'] = False
 
+        # Programme search (inverted index + autocomplete), built once per data snapshot
+        try:
+            self.programme_search = ProgrammeSearchIndex(self.kuccps_df, self.kuccps_requirements)
+        except Exception as e:
+            print(f"Warning: Could not build programme search index: {e}")
+            self.programme_search = ProgrammeSearchIndex(None)
+
+    @property
+    def eligibility_matrix(self) -> EligibilityMatrix:
+        """Vectorized eligibility over all requirement entries (compiled once)."""
+        if self._eligibility_matrix is None:
+            self._eligibility_matrix = EligibilityMatrix(self.kuccps_requirements, self.GRADE_POINTS)
+        return self._eligibility_matrix
+
+    @property
+    def programme_graph(self) -> ProgrammeGraph:
+        """Top-k programme similarity graph (loaded from cache or built once)."""
+        if self._programme_graph is None:
+            self._programme_graph = ProgrammeGraph(self.eligibility_matrix, cache_path=self._programme_graph_path or None)
+        return self._programme_graph
+
+    @property
+    def institution_index(self) -> InstitutionIndex:
+        """Institution -> programme offerings reverse index (built once)."""
+        if self._institution_index is None:
+            self._institution_index = InstitutionIndex(self.kuccps_df, self.eligibility_matrix, self.kuccps_requirements)
+        return self._institution_index
+
+    def programmes_at_institution(self, institution: str, kcse_results: Optional[dict] = None,
+                                  statuses: Optional[List[str]] = None, level: Optional[str] = None):
+        """
+        Programmes offered at `institution`, with level, cutoffs and requirement key.
+        With `kcse_results`, each carries an 'eligibility' label and `statuses`
+        (e.g. ["ELIGIBLE"]) keeps only those outcomes.
+        """
+        try:
+            index = self.institution_index
+            if kcse_results is None:
+                return index.programmes_at(institution, level=level)
+            codes = self.eligibility_matrix.statuses(kcse_results)
+            allowed = [c for c, label in STATUS_LABELS.items() if label in statuses] if statuses else None
+            return index.programmes_at(institution, codes=codes, statuses=allowed, level=level)
+        except Exception as e:
+            print(f"Warning: Institution lookup failed: {e}")
+            return []
+
+    def rank_institutions(self, kcse_results: Optional[dict], level: Optional[str] = None,
+                          status: str = "ELIGIBLE", top_n: Optional[int] = 10):
+        """Institutions ranked by how many of their programmes the student is `status` for."""
+        if kcse_results is None:
+            return []
+        try:
+            code = next(c for c, label in STATUS_LABELS.items() if label == status)
+            codes = self.eligibility_matrix.statuses(kcse_results)
+            return self.institution_index.rank_institutions(codes, status=code, level=level, top_n=top_n)
+        except Exception as e:
+            print(f"Warning: Institution ranking failed: {e}")
+            return []
+
+    def find_eligible_alternatives(self, program_name: str, kcse_results: Optional[dict], n: int = 3,
+                                   codes: Any = None):
+        """
+        Programmes most similar to `program_name` (by name and subject requirements)
+        that the student is ELIGIBLE for. Pass `codes` from
+        `eligibility_matrix.statuses(kcse_results)` to reuse them across programmes.
+        """
+        if kcse_results is None:
+            return []
+        try:
+            if codes is None:
+                codes = self.eligibility_matrix.statuses(kcse_results)
+            alternatives = self.programme_graph.alternatives(program_name, codes, n=n)
+            for alt in alternatives:
+                alt['level'] = self.kuccps_requirements.get(alt['programme'], {}).get('level', 'Unknown')
+            return alternatives
+        except Exception as e:
+            print(f"Warning: Could not look up alternative programmes: {e}")
+            return []
+
+    def recommend_programmes(self, student_text: str, kcse_results: Optional[dict] = None, k: int = 10,
+                             statuses: Optional[List[str]] = None):
+        """
+        Map student text straight to KUCCPS programmes, skipping the department step.
+
+        Every programme is scored in one pass (TF-IDF + embedding similarity) and
+        joined with vectorized eligibility for `kcse_results`. `statuses`, e.g.
+        ["ELIGIBLE", "ASPIRATIONAL"], keeps only programmes with those outcomes.
+        """
+        try:
+            if self._programme_index is None:
+                self._programme_index = ProgrammeIndex(
+                    programme_catalogue(self.kuccps_df, self.kuccps_requirements),
+                    embedding_mode=self.classifier.vectorizer.embedding_mode,
+                    cache_path=self._programme_index_path or None
+                )
+                self._programme_req_rows = np.array(
+                    [self.eligibility_matrix.lookup(n) for n in self._programme_index.names], dtype=np.int64
+                )
+            index = self._programme_index
+            if not index.names:
+                return []
+
+            query_vector = self.embed_query(student_text)
+            scores = np.asarray(index.score(student_text, query_vector), dtype=np.float64)
+            codes = self.eligibility_matrix.statuses_for_rows(self._programme_req_rows, kcse_results)
+
+            if statuses:
+                allowed = [c for c, label in STATUS_LABELS.items() if label in statuses]
+                scores = np.where(np.isin(codes, allowed), scores, -np.inf)
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+
+            results = []
+            for i in top:
+                # No overlap at all with the student text is not a recommendation
+                if not np.isfinite(scores[i]) or scores[i] <= 0:
+                    continue
+                name = index.names[i]
+                req_row = self._programme_req_rows[i]
+                req = self.kuccps_requirements[self.eligibility_matrix.keys[req_row]] if req_row >= 0 else {}
+                results.append({
+                    'programme': name,
+                    'score': round(float(scores[i]), 4),
+                    'eligibility': STATUS_LABELS[int(codes[i])],
+                    'level': req.get('level', 'Unknown'),
+                    'universities': self.university_map.get(name, []),
+                    'cutoff': self.cutoff_map.get(name, 'N/A'),
+                })
+            return results
+        except Exception as e:
+            print(f"Warning: Programme recommendation failed: {e}")
+            return []
+
     def check_eligibility(self, program_name: str, student_results: Optional[dict]):
         """
         Validate student eligibility for a specific program with detailed feedback.
@@ -353,18 +538,94 @@ class CareerRecommender:
         except Exception:
             return []
 
-    def recommend(self, student_text: str, top_n: int = 5, alpha: float = 0.75, beta: float = 0.25, kcse_results: Optional[dict] = None, target_level: str = "All"):
+    def embed_query(self, student_text: str):
+        """Student text in the classifier's embedding space, as a numpy vector."""
+        return self.classifier.vectorizer.vectorize_bert(student_text).detach().cpu().numpy()
+
+    def semantic_job_index(self) -> Optional[SemanticJobIndex]:
+        """The offline job embedding index, or None if it is missing or was built in another embedding space."""
+        if self._semantic_index is None:
+            self._semantic_index = SemanticJobIndex.load(*self._semantic_index_paths) or False
+        index = self._semantic_index
+        if not index or index.embedding_mode != self.classifier.vectorizer.embedding_mode:
+            return None
+        return index
+
+    def search_jobs(self, student_text: str, dept: Optional[str] = None, k: int = 10, query_vector: Any = None):
+        """
+        Postings closest to what the student wrote, from the offline job embedding
+        index (models/semantic_job_index.py), optionally restricted to one department.
+        Each record carries a 'match_score'. Falls back to `get_top_jobs` when the
+        index is missing or was built in another embedding space.
+        Pass `query_vector` (from `embed_query`) to reuse one embedding of the
+        text across several searches.
+        """
+        lookup_dept = 'Information Technology' if dept == 'IT' else dept
+        try:
+            index = self.semantic_job_index()
+            if index is None:
+                return self.get_top_jobs(dept, top_n=k) if dept else []
+
+            if self._job_rows_by_key is None:
+                self._job_rows_by_key = {
+                    job_key(t, c, d): i for i, (t, c, d) in enumerate(zip(
+                        self.jobs_df.get('Job Title', pd.Series([''] * len(self.jobs_df))),
+                        self.jobs_df.get('Company', pd.Series([''] * len(self.jobs_df))),
+                        self.jobs_df.get('Description', pd.Series([''] * len(self.jobs_df)))
+                    ))
+                }
+
+            query = self.embed_query(student_text) if query_vector is None else query_vector
+            cols = [c for c in ['Job Title', 'Company', 'Description', 'Skillmentequired'] if c in self.jobs_df.columns]
+            results = []
+            # Over-fetch: postings dropped from the current CSV may still be in the index
+            for key, score in index.search(query, dept=lookup_dept, k=k * 2):
+                row = self._job_rows_by_key.get(key)
+                if row is None:
+                    continue
+                record = self.jobs_df.iloc[row][cols].to_dict()
+                record['match_score'] = round(score, 4)
+                results.append(record)
+                if len(results) >= k:
+                    break
+            if not results and dept:
+                return self.get_top_jobs(dept, top_n=k)
+            return results
+        except Exception as e:
+            print(f"Warning: Semantic job search failed, using department sample: {e}")
+            return self.get_top_jobs(dept, top_n=k) if dept else []
+
+    def keyword_search_jobs(self, query: str, dept: Optional[str] = None, k: int = 20,
+                            seen_since: Optional[str] = None):
+        """
+        Ranked (bm25) keyword search over every posting the ETL has stored in the
+        SQLite full-text job database, without loading it into memory. Each record
+        carries a 'score' (higher is better) and 'last_seen'. Returns [] when the
+        database has not been built yet.
+        """
+        from etl.job_search_db import search_jobs as _fts_search # type: ignore
+        lookup_dept = 'Information Technology' if dept == 'IT' else dept
+        try:
+            return _fts_search(query, department=lookup_dept, limit=k, seen_since=seen_since,
+                               db_path=self._jobs_search_db)
+        except Exception as e:
+            print(f"Warning: Job keyword search failed: {e}")
+            return []
+
+    def recommend(self, student_text: str, top_n: int = 5, alpha: float = 0.75, beta: float = 0.25, kcse_results: Optional[dict] = None, target_level: str = "All", classifier_mode: Optional[str] = None, region: Optional[str] = None):
         """
         Recommend careers based on student's target academic level (Degree/Diploma/Certificate).
         Enhanced with level filtering and bridge suggestions.
+        `classifier_mode` overrides the configured classifier mode ("full", "fast" or "cascade") for this call.
+        `region` (a county or town, e.g. "Kisumu" or "Eldoret") blends that region's demand into the demand score.
         """
-        from .interest_vectorizer import department_keywords # type: ignore
         from .nlp_preprocessing import preprocess_text # type: ignore
         
         # Get interest scores — pass live job data for 3rd-layer semantic matching
-        interest_scores = self.classifier.classify(
+        interest_scores, classifier_path = self.classifier.classify_with_path(
             student_text,
-            jobs_df=self.jobs_df if not self.jobs_df.empty else None
+            jobs_df=self.jobs_df if not self.jobs_df.empty else None,
+            mode=classifier_mode or self.classifier_mode
         )
         
         # Preprocess user text for explanation generation
@@ -372,54 +633,9 @@ class CareerRecommender:
 
         recommendations = []
         
-        # Map Vectorizer/Demand keys to Skill Map keys
-        dept_mapping = {
-            "Information Technology": "IT",
-            "Healthcare & Medical": "Health Sciences",
-            "Finance & Accounting": "Business",
-            "Marketing & Sales": "Business",
-            "Human Resources": "Business",
-            "Administration & Support": "Business",
-            "Law": "Law",
-            "Arts & Media": "Arts & Humanities",
-            "Agriculture & Environmental": "Agriculture",
-            "Architecture & Construction": "Architecture & Built Environment",
-            "Social Sciences & Community": "Arts & Humanities",
-            "Security & Protective Services": "Arts & Humanities",
-            "Data Science & Analytics": "IT",
-            "Project Management": "Project Management",
-            "Renewable Energy & Environment": "Environmental Studies",
-            "Real Estate & Property": "Business",
-            "Aviation & Logistics": "Aviation & Logistics"
-        }
-        
-        # Reverse mapping for demand metrics if names differ
-        demand_mapping = {
-            # Law
-            "Law": "Legal & Compliance",
-            # Business and related
-            "Marketing & Sales": "Sales & Marketing",
-            "Finance & Accounting": "Accounting/Finance",
-            "Administration & Support": "Admin & Support",
-            "Real Estate & Property": "Real Estate",
-            # IT is often already aligned; keep as-is
-            # Education
-            "Education": "Education/Teaching",
-            # Data / Analytics
-            "Data Science & Analytics": "Data/Analytics",
-            # Project Management
-            "Project Management": "Project/Program Management",
-            # Agriculture & Environmental
-            "Agriculture & Environmental": "Agriculture",
-            # Healthcare & Medical
-            "Healthcare & Medical": "Healthcare & Medical",
-            # Human Resources
-            "Human Resources": "Human Resources",
-            # Renewable Energy & Environment
-            "Renewable Energy & Environment": "Renewable Energy & Environment",
-            # Social Sciences & Community
-            "Social Sciences & Community": "Social Sciences & Community"
-        }
+        # Map Vectorizer keys to Skill Map keys and to demand metric labels
+        dept_mapping = SKILL_MAP_ALIASES
+        demand_mapping = DEMAND_ALIASES
 
         # Calculate variance to detect Mixed/Uncertain interests
         scores_list = list(interest_scores.values())
@@ -459,7 +675,11 @@ class CareerRecommender:
         market_baseline = self.demand_df.sort_values('job_count', ascending=False).head(5).index.tolist()
 
         # Calculate scores
-        scores = self._calculate_scores(interest_scores, is_low_signal, alpha, beta, demand_mapping)
+        region_key = self.resolve_region(region)
+        scores = self._calculate_scores(interest_scores, is_low_signal, alpha, beta, demand_mapping, region=region_key)
+
+        # Eligibility of every programme for this student, shared by the alternative lookups below
+        alternative_codes = self.eligibility_matrix.statuses(kcse_results) if kcse_results else None
 
         for dept, score_data in scores.items():
             # DATA RETRIEVAL (Skills & Programs)
@@ -525,6 +745,11 @@ class CareerRecommender:
                 for prog in programs:
                     status, reason, details = self.check_eligibility(prog, kcse_results)
                     eligibility_map[prog] = {"status": status, "reason": reason, "details": details}
+                    if status in ["NOT ELIGIBLE", "ASPIRATIONAL"]:
+                        # Nearest programmes the student already qualifies for
+                        eligibility_map[prog]["alternatives"] = self.find_eligible_alternatives(
+                            prog, kcse_results, codes=alternative_codes
+                        )
                     
                     if status == "ELIGIBLE":
                         # Check if this is a hybrid/alternative program
@@ -641,6 +866,7 @@ class CareerRecommender:
             demand_score = score_data['demand_score']
             final_score = score_data['final_score']
             job_count = score_data['job_count']
+            regional_job_count = score_data.get('regional_job_count')
             interest_contribution = score_data['interest_contribution']
             market_contribution = score_data['market_contribution']
 
@@ -690,10 +916,13 @@ class CareerRecommender:
                 'market_advice': market_advice,
                 'market_outlook': market_outlook,
                 'job_count': job_count,
+                'region': region_key,
+                'regional_job_count': regional_job_count,
                 'is_mixed': is_mixed_interest,
                 'is_low_signal': is_low_signal,
                 'dept_status': dept_status,
                 'eligibility': eligibility_map,
+                'classifier_path': classifier_path,
                 'baselines': {
                     'interest_only': interest_baseline_names,
                     'market_only': market_baseline,
@@ -728,6 +957,7 @@ class CareerRecommender:
                     'job_count': job_count,
                     'is_mixed': True,
                     'is_low_signal': True,
+                    'classifier_path': classifier_path,
                     'baselines': {
                         'interest_only': interest_baseline_names,
                         'market_only': market_baseline,
@@ -797,10 +1027,22 @@ class CareerRecommender:
         """
         return self.skill_map.get(department, {}).get("programs", [])
 
-    def _calculate_scores(self, interest_scores, is_low_signal, alpha, beta, demand_mapping):
+    def resolve_region(self, region: Optional[str]) -> Optional[str]:
+        """Region key in the demand cube for a county/town name, or None if unknown."""
+        if not region:
+            return None
+        if region in self.regional_demand:
+            return region
+        county = normalize_location(region)
+        return county if county in self.regional_demand else None
+
+    def _calculate_scores(self, interest_scores, is_low_signal, alpha, beta, demand_mapping, region=None):
         """
         Calculates the interest, demand, and final scores for each department.
+        With a `region` from the demand cube, demand is a `regional_weight` blend
+        of the national and regional demand scores.
         """
+        regional = self.regional_demand.get(region, {}) if region else {}
         scores = {}
         for dept, interest_score in interest_scores.items():
             threshold = 0.02 if is_low_signal else 0.08
@@ -810,6 +1052,10 @@ class CareerRecommender:
             demand_key = demand_mapping.get(dept, dept)
             job_count = int(self.demand_df.loc[demand_key, 'job_count']) if demand_key in self.demand_df.index else 0
             demand_score = job_count / self.max_demand if self.max_demand > 0 else 0
+            regional_job_count = None
+            if region:
+                regional_job_count, regional_score = regional.get(demand_key, (0, 0.0))
+                demand_score = (1 - self.regional_weight) * demand_score + self.regional_weight * regional_score
 
             effective_alpha = 0.3 if is_low_signal else alpha
             effective_beta = 0.7 if is_low_signal else beta
@@ -821,6 +1067,7 @@ class CareerRecommender:
                 'demand_score': demand_score,
                 'final_score': final_score,
                 'job_count': job_count,
+                'regional_job_count': regional_job_count,
                 'interest_contribution': effective_alpha * interest_score,
                 'market_contribution': effective_beta * demand_score
             }
@@ -0,0 +1,151 @@
+import os
+import json
+import secrets
+from typing import Dict, List, Any, Optional, Tuple # type: ignore
+import numpy as np # type: ignore
+from .dept_centroids import embed_texts # type: ignore
+from core.job_keys import job_key # type: ignore
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+DEFAULT_MATRIX_PATH = os.path.join(DATA_DIR, 'job_embeddings.f16.npy')
+DEFAULT_META_PATH = os.path.join(DATA_DIR, 'job_embeddings_meta.json')
+
+# Rows are scored this many at a time so a large matrix is never upcast in one go
+_SEARCH_CHUNK = 65536
+# Build ids are this many uint16 words, stored in both files (see build_semantic_job_index)
+_BUILD_ID_WORDS = 4
+
+
+def _build_id_row(build_id: str, dim: int) -> Any:
+    """float16 row whose bits hold the build id (truncated to the row if `dim` is tiny)."""
+    row = np.zeros(dim, dtype=np.uint16)
+    words = np.frombuffer(bytes.fromhex(build_id), dtype=np.uint16)[:dim]
+    row[:len(words)] = words
+    return row.view(np.float16)
+
+
+def _job_text(title: Any, description: Any) -> str:
+    parts = [str(v) for v in (title, description) if v is not None and str(v) != 'nan']
+    return '. '.join(parts)
+
+
+def build_semantic_job_index(jobs_df: Any, matrix_path: str = DEFAULT_MATRIX_PATH, meta_path: str = DEFAULT_META_PATH,
+                             embedding_mode: str = "bert", batch_size: int = 32) -> Any:
+    """
+    Embed every posting (title + description) offline and write the index.
+
+    The matrix is stored as unit-normalised float16 rows in a .npy file that
+    readers memory-map, with rows grouped by DeptNorm so a department filter is
+    a contiguous slice. The sidecar JSON holds the id->row table (job keys, see
+    `core.job_keys.job_key`), the per-department row ranges and the embedding
+    mode. Both files are replaced atomically and carry the same random build
+    id (the matrix in its first row), so a reader that opens them between the
+    two replaces sees the mismatch instead of a wrong id table.
+
+    Returns:
+        float32 unit vectors aligned with the rows of `jobs_df`, so other offline
+        steps (e.g. department centroids) can reuse them.
+    """
+    titles = jobs_df['Job Title'] if 'Job Title' in jobs_df.columns else [''] * len(jobs_df)
+    companies = jobs_df['Company'] if 'Company' in jobs_df.columns else [''] * len(jobs_df)
+    descriptions = jobs_df['Description'] if 'Description' in jobs_df.columns else [''] * len(jobs_df)
+    depts = (jobs_df['DeptNorm'].fillna('').astype(str).tolist()
+             if 'DeptNorm' in jobs_df.columns else [''] * len(jobs_df))
+
+    texts = [_job_text(t, d) for t, d in zip(titles, descriptions)]
+    vectors = embed_texts(texts, embedding_mode, batch_size)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+    keys = [job_key(t, c, d) for t, c, d in zip(titles, companies, descriptions)]
+    order = sorted(range(len(keys)), key=lambda i: depts[i])
+
+    ranges: Dict[str, List[int]] = {}
+    for row, i in enumerate(order):
+        ranges.setdefault(depts[i], [row, row])[1] = row + 1
+
+    dim = int(vectors.shape[1]) if vectors.ndim == 2 else 0
+    build_id = secrets.token_hex(2 * _BUILD_ID_WORDS)
+    os.makedirs(os.path.dirname(matrix_path) or '.', exist_ok=True)
+    tmp_matrix = matrix_path + '.tmp.npy'
+    np.save(tmp_matrix, np.vstack([_build_id_row(build_id, dim), vectors[order].astype(np.float16)]))
+
+    meta = {
+        'build_id': build_id,
+        'embedding_mode': embedding_mode,
+        'dim': dim,
+        'ids': [keys[i] for i in order],
+        'departments': ranges,
+    }
+    tmp_meta = meta_path + '.tmp'
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_matrix, matrix_path)
+    os.replace(tmp_meta, meta_path)
+    return vectors
+
+
+class SemanticJobIndex:
+    """
+    Read side of the job embedding index.
+
+    The matrix is opened with `mmap_mode='r'`, so every process (Streamlit
+    workers, admin tools) reads the same OS page cache instead of holding its
+    own copy. Search is exact: a chunked float16 -> float32 dot product over the
+    selected rows followed by a partial sort.
+    """
+
+    def __init__(self, matrix_path: str = DEFAULT_MATRIX_PATH, meta_path: str = DEFAULT_META_PATH):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.embedding_mode = meta['embedding_mode']
+        self.ids = meta['ids']
+        self.departments = {d: tuple(r) for d, r in meta['departments'].items()}
+        stored = np.load(matrix_path, mmap_mode='r')
+        # Compare bits: a build id row can decode to NaNs as float16
+        if (stored.ndim != 2 or len(stored) - 1 != len(self.ids) or 'build_id' not in meta
+                or not np.array_equal(np.asarray(stored[0]).view(np.uint16),
+                                      _build_id_row(meta['build_id'], stored.shape[1]).view(np.uint16))):
+            raise ValueError("Job embedding matrix and id table are out of sync")
+        # The first row holds the build id
+        self.matrix = stored[1:]
+
+    @classmethod
+    def load(cls, matrix_path: str = DEFAULT_MATRIX_PATH, meta_path: str = DEFAULT_META_PATH) -> Optional['SemanticJobIndex']:
+        """Open the index, or None if it has not been built."""
+        try:
+            return cls(matrix_path, meta_path)
+        except Exception:
+            return None
+
+    def search(self, query_vector: Any, dept: Optional[str] = None, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k postings by cosine similarity to `query_vector`.
+
+        Returns:
+            list of (job key, score), best first.
+        """
+        if dept is not None:
+            start, end = self.departments.get(dept, (0, 0))
+        else:
+            start, end = 0, self.matrix.shape[0]
+        if end <= start or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.matrix.shape[1]:
+            return []
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        scores = np.empty(end - start, dtype=np.float32)
+        for offset in range(start, end, _SEARCH_CHUNK):
+            stop = min(offset + _SEARCH_CHUNK, end)
+            scores[offset - start:stop - start] = self.matrix[offset:stop].astype(np.float32) @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[start + i], float(scores[i])) for i in top]
@@ -0,0 +1,421 @@
+"""
+Single source of truth for the department taxonomy.
+
+Holds the canonical department keyword lists, the alias maps between the
+vocabularies used across the app (scraped job categories, career skill map
+departments, demand metric labels) and the regex fallbacks for inferring a
+department from free text. `get_taxonomy()` returns one shared, precompiled
+instance with the admin overrides from data/category_mappings.json merged in.
+"""
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Pattern, Tuple # type: ignore
+import numpy as np # type: ignore
+from scipy import sparse # type: ignore
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORY_MAPPINGS_PATH = os.path.join(PROJECT_ROOT, 'data', 'category_mappings.json')
+
+# Canonical department keywords (classifier vocabulary, job classification, skill map):
+# the union of the lists the classifier, the ETL and the skill-map script each kept,
+# except the skill map's "people operations": the classifier's TF-IDF splits it into
+# unigrams, and "people" alone pulls any "helping people" interest towards HR
+DEPARTMENT_KEYWORDS: Dict[str, List[str]] = {
+    "Information Technology": [
+        "developer", "software", "ict", "data", "ai", "machine learning", "cyber", "programmer",
+        "analyst", "information technology", "computer", "network", "support", "systems",
+        "cloud", "security", "database", "web", "frontend", "backend", "fullstack",
+        "coding", "programming", "software engineering", "it", "hardware", "tech",
+        "apps", "mobile", "internet", "algorithm", "devops", "code", "coder", "website",
+        "python", "javascript", "java", "c#", "rust", "go", "php", "ruby", "sql", "flutter", "react",
+        "node", "typescript", "swift", "kotlin", "android", "ios", "aws", "azure", "docker", "kubernetes",
+        "artificial intelligence", "fintech", "edtech", "healthtech", "saas", "api", "microservices",
+        "blockchain", "nft", "web3", "chatbot", "llm", "gpt", "automation", "rpa", "erp", "crm",
+        "safaricom", "mpesa", "m-pesa", "ict authority", "konza", "silicon savannah"
+    ],
+    "Business": [
+        "business", "operations", "strategy", "manager", "consultant", "entrepreneur",
+        "logistics", "supply chain", "management", "administration", "leadership", "commerce", "startup",
+        "ceo", "director", "executive", "procurement", "tender", "kra", "nairobi stock exchange",
+        "nse", "import", "export", "trade", "distributor", "retailer", "wholesale", "franchisor",
+        "business plan", "pitch", "investor", "venture", "scaling", "growth hacking"
+    ],
+    "Education": [
+        "teacher", "lecturer", "education", "instructor", "tutor", "training",
+        "curriculum", "school", "dean", "academic", "principal", "teaching", "pedagogy", "training"
+    ],
+    "Finance & Accounting": [
+        "accountant", "finance", "auditor", "economist", "investment", "bookkeeper",
+        "financial", "tax", "cpa", "controller", "budget", "accounting", "banking", "audit", "money",
+        "cfa", "acca", "kra", "kenya revenue authority", "vat", "corporate tax", "payroll",
+        "equity bank", "kcb", "co-operative bank", "absa", "stanbic", "treasury",
+        "financial modelling", "cash flow", "balance sheet", "income statement", "forex",
+        "microfinance", "sacco", "insurance", "actuarial", "wealth management"
+    ],
+    "Healthcare & Medical": [
+        "nurse", "doctor", "pharmacist", "medical", "clinical", "health", "surgeon",
+        "therapist", "dental", "radiologist", "physician", "lab technician", "veterinary",
+        "nutritionist", "psychiatrist", "medicine", "dentistry", "pharmacy", "patient",
+        "care", "healthcare", "therapy", "hospital", "surgery", "anatomy", "biology",
+        "diseases", "pathology", "pharmaceuticals", "public health", "physiology",
+        "nursing", "midwifery", "diagnostics", "treatment", "human health", "biologist", "science",
+        "knh", "kenyatta national hospital", "aga khan", "nairobi hospital", "moi teaching",
+        "nhif", "ministry of health", "clinical officer", "community health", "hiv", "malaria",
+        "cancer", "oncology", "radiology", "ophthalmology", "ent", "paediatrics", "geriatrics",
+        "orthodontics", "teeth", "maxillofacial"
+    ],
+    "Engineering": [
+        "engineer", "mechanical", "civil", "electrical", "technician", "biomedical",
+        "mechatronic", "chemical", "project engineer", "structural",
+        "industrial", "automotive", "manufacturing", "telecommunication", "machinery",
+        "construction", "design", "robotics", "automation", "robot", "robots", "build", "building",
+        "electronics", "maintenance", "architecture", "system design", "engines"
+    ],
+    "Marketing & Sales": [
+        "marketing", "seo", "sales", "brand", "advertising", "digital", "content",
+        "promotion", "telemarketing", "social media", "copywriter", "account executive",
+        "market research", "public relations", "pr", "selling"
+    ],
+    "Administration & Support": [
+        "admin", "clerk", "secretary", "assistant", "receptionist", "office manager",
+        "front desk", "executive assistant", "records", "filing"
+    ],
+    "Human Resources": [
+        "human resources", "hr", "recruiter", "talent management", "personnel", "staffing",
+        "employee relations", "talent acquisition", "labor laws", "payroll", "onboarding", "hiring",
+        "human resource", "talent"
+    ],
+    "Law": [
+        "lawyer", "legal", "attorney", "advocate", "compliance", "legal officer", "paralegal",
+        "regulatory", "litigation", "corporate law", "law", "justice", "judiciary",
+        "courts", "arbitration", "jurisprudence", "contract"
+    ],
+    "Arts & Media": [
+        "artist", "musician", "painter", "graphic designer", "illustrator", "videographer",
+        "photographer", "media", "journalist", "writer", "editor", "communication",
+        "film", "animation", "content creator", "design", "creative", "theatre", "drawing"
+    ],
+    "Agriculture & Environmental": [
+        "agriculture", "horticulture", "environment", "climate", "forestry", "conservation",
+        "agronomist", "ecologist", "farm", "natural resources", "soil", "animal", "crop",
+        "farming", "livestock", "irrigation", "agribusiness", "vet"
+    ],
+    "Architecture & Construction": [
+        "architecture", "architect", "construction", "site supervisor", "planner",
+        "urban planning", "interior design", "landscape", "surveying", "quantity surveyor",
+        "draughtsman", "builder", "real estate development", "building"
+    ],
+    "Social Sciences & Community": [
+        "social worker", "sociologist", "community", "ngo", "development officer",
+        "humanitarian", "psychologist", "counselor", "activist", "gender", "youth worker",
+        "counseling", "anthropology"
+    ],
+    "Hospitality & Tourism": [
+        "hospitality", "tourism", "hotel", "chef", "cook", "housekeeping", "travel",
+        "airline", "waiter", "bartender", "event planner", "front office", "resort", "catering"
+    ],
+    "Security & Protective Services": [
+        "security", "guard", "military", "police", "defense", "intelligence", "forensic",
+        "safety", "firefighter", "rescue", "policing", "crimonology"
+    ],
+    "Data Science & Analytics": [
+        "data analyst", "data scientist", "big data", "statistics", "mathematics",
+        "tableau", "power bi", "sql", "excel", "visualization", "predictive modeling",
+        "machine learning", "data mining", "math", "analysis",
+        "r programming", "pandas", "numpy", "scikit-learn", "tensorflow", "keras", "pytorch",
+        "business intelligence", "etl", "data pipeline", "data warehouse", "data lake",
+        "a/b testing", "regression", "classification", "clustering", "neural network",
+        "natural language processing", "nlp", "computer vision", "deep learning",
+        "google analytics", "looker", "metabase", "data storytelling", "insight"
+    ],
+    "Project Management": [
+        "project manager", "pmp", "agile", "scrum", "stakeholder",
+        "budgeting", "coordination", "prince2", "project lifecycle",
+        "planning", "delivery", "implementation"
+    ],
+    "Renewable Energy & Environment": [
+        "solar", "wind", "renewable", "energy", "sustainability", "environmental",
+        "climate change", "green energy", "conservation"
+    ],
+    "Real Estate & Property": [
+        "real estate", "property", "valuation", "realtor", "broker", "estate agent",
+        "leasing", "tenancy", "land", "property management"
+    ],
+    "Aviation & Logistics": [
+        "pilot", "aviation", "flight", "logistics", "warehouse", "transport",
+        "airline", "cargo", "fleet", "clearing", "forwarding"
+    ],
+    "Other": []
+}
+
+# Scraped job category / department labels -> internal department
+JOB_CATEGORY_ALIASES: Dict[str, str] = {
+    # IT
+    'IT': 'Information Technology', 'I.T.': 'Information Technology', 'Information Tech': 'Information Technology',
+    # Business family
+    'Sales & Marketing': 'Marketing & Sales', 'Sales/Marketing': 'Marketing & Sales', 'Marketing': 'Marketing & Sales', 'Sales': 'Marketing & Sales',
+    'Accounting/Finance': 'Finance & Accounting', 'Finance': 'Finance & Accounting', 'Accounting': 'Finance & Accounting',
+    'Admin & Support': 'Administration & Support', 'Administration': 'Administration & Support',
+    'Business Development': 'Business', 'Operations': 'Business', 'Customer Service': 'Business',
+    'Real Estate': 'Real Estate & Property', 'Property': 'Real Estate & Property',
+    # Education
+    'Education/Teaching': 'Education', 'Teaching': 'Education', 'Education': 'Education', 'Teacher': 'Education', 'Lecturer': 'Education',
+    # Data / Analytics
+    'Data/Analytics': 'Data Science & Analytics', 'Data Science': 'Data Science & Analytics', 'Analytics': 'Data Science & Analytics',
+    # Project Management
+    'Project/Program Management': 'Project Management', 'Programme Management': 'Project Management',
+    # Agriculture & Environment
+    'Agriculture': 'Agriculture & Environmental', 'Environment': 'Agriculture & Environmental', 'Environmental': 'Agriculture & Environmental', 'Horticulture': 'Agriculture & Environmental', 'Livestock': 'Agriculture & Environmental',
+    # Law
+    'Legal': 'Law', 'Legal & Compliance': 'Law', 'Law': 'Law',
+    # Healthcare
+    'Healthcare': 'Healthcare & Medical', 'Medical': 'Healthcare & Medical', 'Nursing': 'Healthcare & Medical', 'Pharmacy': 'Healthcare & Medical', 'Dentistry': 'Healthcare & Medical', 'Veterinary': 'Healthcare & Medical',
+    # HR
+    'Human Resource': 'Human Resources', 'Human Resources': 'Human Resources', 'HR': 'Human Resources',
+    # Renewable Energy & Environment
+    'Renewable Energy': 'Renewable Energy & Environment', 'Environment & Conservation': 'Renewable Energy & Environment'
+}
+
+# Internal department -> career_skill_map.json department
+SKILL_MAP_ALIASES: Dict[str, str] = {
+    "Information Technology": "IT",
+    "Healthcare & Medical": "Health Sciences",
+    "Finance & Accounting": "Business",
+    "Marketing & Sales": "Business",
+    "Human Resources": "Business",
+    "Administration & Support": "Business",
+    "Law": "Law",
+    "Arts & Media": "Arts & Humanities",
+    "Agriculture & Environmental": "Agriculture",
+    "Architecture & Construction": "Architecture & Built Environment",
+    "Social Sciences & Community": "Arts & Humanities",
+    "Security & Protective Services": "Arts & Humanities",
+    "Data Science & Analytics": "IT",
+    "Project Management": "Project Management",
+    "Renewable Energy & Environment": "Environmental Studies",
+    "Real Estate & Property": "Business",
+    "Aviation & Logistics": "Aviation & Logistics"
+}
+
+# Internal department -> label used in job_demand_metrics.csv
+DEMAND_ALIASES: Dict[str, str] = {
+    # Law
+    "Law": "Legal & Compliance",
+    # Business and related
+    "Marketing & Sales": "Sales & Marketing",
+    "Finance & Accounting": "Accounting/Finance",
+    "Administration & Support": "Admin & Support",
+    "Real Estate & Property": "Real Estate",
+    # IT is often already aligned; keep as-is
+    # Education
+    "Education": "Education/Teaching",
+    # Data / Analytics
+    "Data Science & Analytics": "Data/Analytics",
+    # Project Management
+    "Project Management": "Project/Program Management",
+    # Agriculture & Environmental
+    "Agriculture & Environmental": "Agriculture",
+    # Healthcare & Medical
+    "Healthcare & Medical": "Healthcare & Medical",
+    # Human Resources
+    "Human Resources": "Human Resources",
+    # Renewable Energy & Environment
+    "Renewable Energy & Environment": "Renewable Energy & Environment",
+    # Social Sciences & Community
+    "Social Sciences & Community": "Social Sciences & Community"
+}
+
+# Ordered regex fallbacks for inferring a department from free text
+INFERENCE_PATTERNS: List[Tuple[str, str]] = [
+    (r'nurs|pharm|dent|clinic|medical|health|vet', 'Healthcare & Medical'),
+    (r'human resource|\bhr\b|recruit|talent', 'Human Resources'),
+    (r'teacher|lectur|education|tsc|school', 'Education'),
+    (r'sales|marketing|brand|seo|sem|growth', 'Marketing & Sales'),
+    (r'agri|farm|horti|soil|crop|livestock', 'Agriculture & Environmental'),
+    (r'environ|ecolog|conserv|renewable|solar|wind|energy', 'Renewable Energy & Environment'),
+    (r'data|analytics?|machine learning|\bml\b|\bai\b|business intelligence|\bbi\b', 'Data Science & Analytics'),
+    (r'project manager|program manager|\bpmo\b|project', 'Project Management'),
+    (r'law|legal|advocate|attorney|compliance', 'Law'),
+    (r'account|finance|auditor|\bcpa\b|bookkeep|treasury', 'Finance & Accounting'),
+    (r'software|developer|engineer|\bit\b|systems|network|cyber|cloud|devops', 'Information Technology'),
+]
+
+
+def load_category_overrides(path: str = CATEGORY_MAPPINGS_PATH) -> Dict[str, str]:
+    """Admin-defined category -> department mappings ({} if missing or invalid)."""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+    except Exception as e:
+        print(f"Warning: Could not load external category mappings: {e}")
+    return {}
+
+
+class Taxonomy:
+    """
+    Department taxonomy compiled once: keyword patterns per department, the
+    merged category alias map and the inference regexes.
+    """
+
+    def __init__(self, overrides_path: Optional[str] = CATEGORY_MAPPINGS_PATH):
+        self.overrides_path = overrides_path
+        self.department_keywords = DEPARTMENT_KEYWORDS
+        self.departments = [d for d in DEPARTMENT_KEYWORDS if d != "Other"]
+        # Word-bounded pattern per keyword (duplicates kept: they count twice in scoring)
+        self.keyword_patterns: Dict[str, List[Pattern]] = {
+            dept: [re.compile(r'\b' + re.escape(kw.lower()) + r'\b') for kw in keywords]
+            for dept, keywords in DEPARTMENT_KEYWORDS.items()
+        }
+        self.inference_patterns: List[Tuple[Pattern, str]] = [(re.compile(p), d) for p, d in INFERENCE_PATTERNS]
+        self._compile_keyword_scanner()
+        self.reload()
+
+    def _compile_keyword_scanner(self):
+        """
+        Fixed keyword vocabulary for batch classification: a (vocabulary x
+        department) weight matrix (a keyword listed twice counts twice) and a single
+        scanner regex that reports, at every position, the longest keyword that
+        matches there with word boundaries on both sides.
+        """
+        self.vocabulary: List[str] = []
+        index: Dict[str, int] = {}
+        rows, cols = [], []
+        for col, keywords in enumerate(DEPARTMENT_KEYWORDS.values()):
+            for kw in keywords:
+                kw = kw.lower()
+                if kw not in index:
+                    index[kw] = len(self.vocabulary)
+                    self.vocabulary.append(kw)
+                rows.append(index[kw])
+                cols.append(col)
+        self._vocab_index = index
+        self._dept_names = list(DEPARTMENT_KEYWORDS)
+        self.keyword_weights = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.vocabulary), len(self._dept_names))
+        )
+        by_length = sorted(self.vocabulary, key=len, reverse=True)
+        self._keyword_scanner = re.compile(r'(?=\b(' + '|'.join(re.escape(k) for k in by_length) + r')\b)')
+
+        # A shorter keyword matches at the same position exactly when it is a prefix of
+        # the longest match and that prefix ends on a word boundary inside the longer one
+        def _is_word(ch):
+            return ch.isalnum() or ch == '_'
+        self._boundary_prefixes: Dict[int, List[int]] = {}
+        for kw, i in index.items():
+            self._boundary_prefixes[i] = [
+                index[kw[:n]] for n in range(1, len(kw))
+                if kw[:n] in index and _is_word(kw[n - 1]) != _is_word(kw[n])
+            ]
+
+    def _overrides_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the overrides file, or None if there is none."""
+        if not self.overrides_path:
+            return None
+        try:
+            st = os.stat(self.overrides_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def reload(self):
+        """Re-read the admin overrides on top of the built-in category aliases."""
+        self._overrides_sig = self._overrides_signature()
+        self._category_map = {**JOB_CATEGORY_ALIASES, **(load_category_overrides(self.overrides_path) if self.overrides_path else {})}
+
+    @property
+    def category_map(self) -> Dict[str, str]:
+        """
+        Built-in aliases merged with the admin overrides. The merged map is cached
+        and only rebuilt when the overrides file's mtime/size changes, so edits made
+        by another process (e.g. the admin dashboard) are picked up on the next
+        lookup without re-reading the JSON for every job.
+        """
+        if self._overrides_signature() != self._overrides_sig:
+            self.reload()
+        return self._category_map
+
+    def normalize_category(self, raw: str) -> str:
+        """Internal department for a scraped category label (the label itself if unmapped)."""
+        return self.category_map.get(raw, raw)
+
+    def infer_department(self, text: str) -> str:
+        """First department whose inference pattern matches `text`, or ''."""
+        s = (text or '').lower()
+        for pattern, dept in self.inference_patterns:
+            if pattern.search(s):
+                return dept
+        return ''
+
+    def classify(self, job_title: str, description: str = "", skills: str = "") -> str:
+        """
+        Department with the most keyword hits in the posting; a hit in the title
+        counts 6 (1 + 5), elsewhere 1. "Other" when nothing matches.
+        """
+        text = f"{job_title} {description} {skills}".lower()
+        title_lower = job_title.lower()
+
+        best_dept = "Other"
+        max_score = 0
+        for dept, patterns in self.keyword_patterns.items():
+            score = 0
+            for pattern in patterns:
+                if pattern.search(text):
+                    score += 1
+                    if pattern.search(title_lower):
+                        score += 5
+            if score > max_score:
+                max_score = score
+                best_dept = dept
+        return best_dept
+
+    def keyword_hits(self, texts: List[str]) -> Any:
+        """Binary (n_texts x vocabulary) CSR matrix: which keywords occur (word-bounded) in each text."""
+        indptr, indices = [0], []
+        for text in texts:
+            found = set()
+            for match in self._keyword_scanner.finditer(text.lower()):
+                i = self._vocab_index[match.group(1)]
+                found.add(i)
+                found.update(self._boundary_prefixes[i])
+            indices.extend(sorted(found))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(texts), len(self.vocabulary))
+        )
+
+    def classify_batch(self, titles: List[str], texts: List[str]) -> List[str]:
+        """
+        `classify` for many postings at once. `texts` are the full
+        "title description skills" strings. Keyword hits for titles and texts
+        become two sparse matrices, and department scores come from one multiply:
+        (text_hits + 5 * title_hits) @ keyword_weights. The argmax picks the first
+        department on ties, like the per-posting loop.
+        """
+        if not texts:
+            return []
+        hits = self.keyword_hits(texts) + 5 * self.keyword_hits(titles)
+        scores = (hits @ self.keyword_weights).toarray()
+        best = scores.argmax(axis=1)
+        return [self._dept_names[b] if scores[row, b] > 0 else "Other" for row, b in enumerate(best)]
+
+    def skill_map_key(self, dept: str) -> str:
+        return SKILL_MAP_ALIASES.get(dept, dept)
+
+    def demand_key(self, dept: str) -> str:
+        return DEMAND_ALIASES.get(dept, dept)
+
+
+_TAXONOMY: Optional[Taxonomy] = None
+
+
+def get_taxonomy() -> Taxonomy:
+    """The shared Taxonomy instance (built on first use)."""
+    global _TAXONOMY
+    if _TAXONOMY is None:
+        _TAXONOMY = Taxonomy()
+    return _TAXONOMY
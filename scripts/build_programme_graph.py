@@ -0,0 +1,40 @@
+import sys
+import os
+import json
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.recommender import CareerRecommender # type: ignore
+from models.eligibility_matrix import EligibilityMatrix # type: ignore
+from models.programme_graph import save_programme_graph, load_programme_graph, DEFAULT_GRAPH_PATH # type: ignore
+
+DEFAULT_REQUIREMENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         'Kuccps', 'kuccps_requirements.json')
+
+# Builds the programme similarity graph behind "eligible alternatives" offline,
+# so the recommender only loads it. Re-run whenever the KUCCPS requirements change
+# (scripts/update_jobs.py does this as part of the data refresh).
+
+def build_programme_graph_cache(requirements_path: str = DEFAULT_REQUIREMENTS_PATH,
+                                output_path: str = DEFAULT_GRAPH_PATH, k: int = 50, force: bool = False):
+    """
+    Build and save the graph for the requirements file, unless the saved graph
+    was built from the same programme names and subject requirements (or `force`). Returns (number of edges, whether it was rebuilt).
+    """
+    with open(requirements_path, 'r') as f:
+        requirements = json.load(f)
+    matrix = EligibilityMatrix(requirements, CareerRecommender.GRADE_POINTS)
+    graph = None if force else load_programme_graph(matrix, output_path)
+    if graph is not None:
+        return graph.nnz, False
+    return save_programme_graph(matrix, output_path, k=k).nnz, True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the KUCCPS programme similarity graph.")
+    parser.add_argument('--requirements', default=DEFAULT_REQUIREMENTS_PATH, help="KUCCPS requirements JSON")
+    parser.add_argument('--output', default=DEFAULT_GRAPH_PATH, help="Destination .npz file")
+    parser.add_argument('-k', type=int, default=50, help="Neighbours kept per programme")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the saved graph is current")
+    args = parser.parse_args()
+
+    edges, rebuilt = build_programme_graph_cache(args.requirements, args.output, args.k, args.force)
+    print(f"Programme graph with {edges:,} edges {'written to' if rebuilt else 'already current at'} {args.output}")
@@ -33,7 +33,8 @@ def create_table():
                 Location TEXT,
                 Work_Type TEXT,
                 Years_of_Experience TEXT,
-                Department TEXT
+                Department TEXT,
+                content_hash TEXT UNIQUE
             )
         """)
         
@@ -0,0 +1,19 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.nlp_preprocessing import export_static_token_vectors, STATIC_VECTORS_PATH # type: ignore
+
+# Exports DistilBERT's input embedding table so the "static" embedding mode
+# ([classifier] embedding = static in config.ini) can run without loading the model.
+# Any (tokens, vectors) table saved in the same .npz layout, e.g. distilled
+# per-token vectors, can be dropped in at the same path instead.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export static token vectors for the interest classifier.")
+    parser.add_argument('--output', default=STATIC_VECTORS_PATH, help="Destination .npz file")
+    parser.add_argument('--model', default='distilbert-base-uncased', help="HuggingFace model name")
+    args = parser.parse_args()
+
+    path = export_static_token_vectors(args.output, args.model)
+    print(f"Static token vectors written to {path}")
@@ -0,0 +1,288 @@
+import sys
+import os
+import json
+import argparse
+import configparser
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.taxonomy import DEPARTMENT_KEYWORDS, JOB_CATEGORY_ALIASES, SKILL_MAP_ALIASES # type: ignore
+from core.locations import KENYA_COUNTIES, build_regional_demand # type: ignore
+
+# Generates schema-faithful synthetic copies of the app's data files at any size,
+# for benchmarks and load tests:
+#   myjobmag_jobs.csv, kuccps_courses.csv, kuccps_requirements.json,
+#   career_skill_map.json, kcse_profiles.json, interest_texts.json and a
+#   config.ini whose [paths] point CareerRecommender at them.
+# Real files are used as seeds where available (requirement templates, KCSE profiles).
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "D-", "E"]  # 12 .. 1 points
+
+JOB_COLUMNS = ['Job Title', 'Company', 'Description', 'Minimum Qualification', 'Skills Required', 'Skillmentequired',
+               'Location', 'Work Type', 'Years of Experience', 'Category', 'Department', 'DeptNorm', 'Url', 'Source']
+COURSE_COLUMNS = ['Program_Code', 'Institution_Name', 'Programme_Name', 'Cutoff_2023', 'Cutoff_2022',
+                  'Subject_1', 'Subject_2', 'Subject_3', 'Subject_4', 'Department', 'Cutoff_2024']
+
+_ROLES = ["Officer", "Manager", "Assistant", "Specialist", "Intern", "Lead", "Coordinator", "Associate", "Consultant"]
+_COMPANY_WORDS = ["Savannah", "Rift", "Jamii", "Baraka", "Umoja", "Tana", "Kilima", "Pwani", "Zawadi", "Mwangaza",
+                  "Highland", "Lakeside", "Acacia", "Simba", "Neema", "Amani"]
+_COMPANY_SUFFIXES = ["Limited", "Group", "Solutions", "Holdings", "Foundation", "Bank", "Hospital", "Consulting"]
+_INSTITUTION_KINDS = ["UNIVERSITY", "UNIVERSITY COLLEGE", "NATIONAL POLYTECHNIC", "TECHNICAL TRAINING INSTITUTE"]
+_LEVEL_PREFIX = {"Degree": "BACHELOR OF SCIENCE", "Diploma": "DIPLOMA IN", "Certificate": "CERTIFICATE IN"}
+_LEVEL_MIN_MEAN = {"Degree": "C+", "Diploma": "C-", "Certificate": "D"}
+_SUBJECT_CODES = ["MAT A", "ENG", "KIS", "BIO", "CHE", "PHY", "GEO", "HIS", "BST", "CST", "AGR"]
+_TEXT_TEMPLATES = [
+    "I enjoy {a} and {b}.",
+    "My dream is to build a career in {a}.",
+    "In school I was always curious about {a}, especially {b}.",
+    "I would love to work with {a} one day.",
+    "People say I am good at {a}.",
+]
+
+
+def _dept_weights(departments, skew, rng):
+    """Zipf-like department distribution; skew=0 is uniform, higher is more concentrated."""
+    ranks = np.arange(1, len(departments) + 1, dtype=float)
+    weights = ranks ** -skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def _load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def generate_jobs(n, departments, weights, rng):
+    counties = np.array(KENYA_COUNTIES)
+    county_w = np.ones(len(counties))
+    county_w[list(counties).index("Nairobi")] = 30.0  # postings concentrate in Nairobi
+    county_w[list(counties).index("Mombasa")] = 5.0
+    county_w[list(counties).index("Kisumu")] = 3.0
+    county_w /= county_w.sum()
+
+    dept_idx = rng.choice(len(departments), size=n, p=weights)
+    locations = rng.choice(counties, size=n, p=county_w)
+    raw_labels = {d: [k for k, v in JOB_CATEGORY_ALIASES.items() if v == d] or [d] for d in departments}
+    rows = []
+    for i, (d, loc) in enumerate(zip(dept_idx, locations)):
+        dept = departments[d]
+        keywords = DEPARTMENT_KEYWORDS[dept]
+        kws = rng.choice(keywords, size=min(5, len(keywords)), replace=False)
+        company = f"{rng.choice(_COMPANY_WORDS)} {rng.choice(_COMPANY_WORDS)} {rng.choice(_COMPANY_SUFFIXES)}"
+        title = f"{kws[0].title()} {rng.choice(_ROLES)}"
+        description = (
+            f"We are looking for a {title} to join our team in {loc}. "
+            f"The role covers {kws[1]} and {kws[2]} across our operations. "
+            f"Experience with {kws[3]} is an advantage. Job ref {i}."
+        )
+        skills = ", ".join(kws[1:])
+        rows.append({
+            'Job Title': f"{title} at {company}",
+            'Company': company,
+            'Description': description,
+            'Minimum Qualification': rng.choice(["Degree", "Diploma", "Certificate", "KCSE"], p=[0.55, 0.3, 0.1, 0.05]),
+            'Skills Required': skills,
+            'Skillmentequired': skills,
+            'Location': f"{loc}, Kenya",
+            'Work Type': rng.choice(["Full Time", "Contract", "Internship", "Part Time"], p=[0.7, 0.2, 0.07, 0.03]),
+            'Years of Experience': rng.choice(["0 - 1 year", "1 - 3 years", "3 - 5 years", "5+ years"]),
+            'Category': rng.choice(raw_labels[dept]),
+            'Department': dept,
+            'DeptNorm': dept,
+            'Url': f"https://example.invalid/jobs/{i}",
+            'Source': "Synthetic",
+        })
+    return pd.DataFrame(rows, columns=JOB_COLUMNS)
+
+
+def generate_programmes(n_programmes, n_institutions, offerings_per_programme, departments, weights,
+                        level_mix, requirement_templates, rng):
+    """kuccps_courses.csv rows, kuccps_requirements.json and career_skill_map.json."""
+    institutions = [f"{rng.choice(_COMPANY_WORDS).upper()} {rng.choice(_INSTITUTION_KINDS)} {i + 1}"
+                    for i in range(n_institutions)]
+    levels = list(_LEVEL_PREFIX)
+    templates_by_level = {lv: [t for t in requirement_templates if t.get('level') == lv] for lv in levels}
+
+    rows, requirements, skill_map = [], {}, {}
+    dept_idx = rng.choice(len(departments), size=n_programmes, p=weights)
+    level_idx = rng.choice(len(levels), size=n_programmes, p=level_mix)
+    for p, (d, lv) in enumerate(zip(dept_idx, level_idx)):
+        dept, level = departments[d], levels[lv]
+        field = rng.choice(DEPARTMENT_KEYWORDS[dept]).upper()
+        name = f"{_LEVEL_PREFIX[level]} ({field} STUDIES {p + 1})"
+
+        templates = templates_by_level.get(level) or requirement_templates
+        if templates:
+            template = templates[rng.integers(len(templates))]
+            requirements[name] = {
+                'min_mean_grade': template.get('min_mean_grade', _LEVEL_MIN_MEAN[level]),
+                'required_subjects': dict(template.get('required_subjects', {}) or {}),
+                'level': level,
+            }
+        else:
+            requirements[name] = {'min_mean_grade': _LEVEL_MIN_MEAN[level], 'required_subjects': {}, 'level': level}
+
+        skill_dept = SKILL_MAP_ALIASES.get(dept, dept)
+        entry = skill_map.setdefault(skill_dept, {'skills': [], 'programs': []})
+        entry['programs'].append(name)
+        for kw in DEPARTMENT_KEYWORDS[dept][:10]:
+            if kw not in entry['skills']:
+                entry['skills'].append(kw)
+
+        n_offer = max(1, int(rng.poisson(offerings_per_programme)))
+        base_cutoff = {"Degree": 30.0, "Diploma": 20.0, "Certificate": 12.0}[level]
+        subjects = rng.choice(_SUBJECT_CODES, size=4, replace=False)
+        for o, inst in enumerate(rng.choice(n_institutions, size=min(n_offer, n_institutions), replace=False)):
+            cutoff = float(np.clip(rng.normal(base_cutoff, 6.0), 8.0, 46.0))
+            rows.append({
+                'Program_Code': f"{9000000 + p * 100 + o}",
+                'Institution_Name': institutions[inst],
+                'Programme_Name': name,
+                'Cutoff_2023': f"{cutoff + rng.normal(0, 1.5):.3f}",
+                'Cutoff_2022': f"{cutoff + rng.normal(0, 2.0):.3f}",
+                'Subject_1': f"{subjects[0]}:C+", 'Subject_2': f"{subjects[1]}:C",
+                'Subject_3': f"{subjects[2]}:C", 'Subject_4': f"{subjects[3]}:C-",
+                'Department': skill_dept,
+                'Cutoff_2024': f"{cutoff:.3f}",
+            })
+    return pd.DataFrame(rows, columns=COURSE_COLUMNS), requirements, skill_map
+
+
+def generate_profiles(n, seed_profiles, rng):
+    """KCSE profiles derived from the sample profiles with each grade shifted by up to two steps."""
+    seeds = seed_profiles or [{"mean_grade": "C+", "subjects": {"Mathematics": "C+", "English": "B-", "Kiswahili": "C+"}}]
+    profiles = []
+    for i in range(n):
+        base = seeds[rng.integers(len(seeds))]
+        subjects = {}
+        for sub, grade in base.get('subjects', {}).items():
+            idx = GRADES.index(grade) if grade in GRADES else 6
+            subjects[sub] = GRADES[int(np.clip(idx + rng.integers(-2, 3), 0, len(GRADES) - 1))]
+        mean_idx = round(float(np.mean([GRADES.index(g) for g in subjects.values()]))) if subjects else 6
+        profiles.append({'student_id': f"SYN_{i + 1:06d}", 'mean_grade': GRADES[mean_idx], 'subjects': subjects})
+    return profiles
+
+
+def generate_interest_texts(n, departments, weights, rng):
+    """Interest statements with the department they were generated from (first one for mixed texts)."""
+    texts = []
+    for _ in range(n):
+        picks = rng.choice(len(departments), size=2 if rng.random() < 0.3 else 1, replace=False, p=weights)
+        sentences = []
+        for d in picks:
+            keywords = DEPARTMENT_KEYWORDS[departments[d]]
+            a, b = rng.choice(keywords, size=2, replace=len(keywords) < 2)
+            sentences.append(str(rng.choice(_TEXT_TEMPLATES)).format(a=a, b=b))
+        texts.append({'text': " ".join(sentences), 'expected_dept': departments[picks[0]]})
+    return texts
+
+
+def generate(output_dir, jobs=3000, programmes=1100, institutions=70, offerings_per_programme=4.5,
+             profiles=500, texts=500, dept_skew=1.0, level_mix=(0.7, 0.25, 0.05), seed=42):
+    """
+    Write a full synthetic dataset to `output_dir` and return the paths written.
+
+    Args:
+        output_dir (str): Destination directory (created if needed)
+        jobs (int): Number of job postings
+        programmes (int): Number of distinct KUCCPS programmes
+        institutions (int): Number of institutions
+        offerings_per_programme (float): Mean institutions offering each programme
+        profiles (int): Number of KCSE profiles
+        texts (int): Number of interest statements
+        dept_skew (float): Zipf exponent of the department distribution (0 = uniform)
+        level_mix (tuple): Share of Degree / Diploma / Certificate programmes
+        seed (int): Random seed
+
+    Returns:
+        dict: file kind -> path
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    departments = [d for d, kws in DEPARTMENT_KEYWORDS.items() if d != "Other" and len(kws) >= 5]
+    weights = _dept_weights(departments, dept_skew, rng)
+    level_mix = np.asarray(level_mix, dtype=float) / np.sum(level_mix)
+
+    real_requirements = _load_json(os.path.join(PROJECT_ROOT, 'Kuccps', 'kuccps_requirements.json'), {})
+    seed_profiles = _load_json(os.path.join(PROJECT_ROOT, 'data', 'sample_kcse_profiles.json'), [])
+
+    paths = {
+        'jobs_csv': os.path.join(output_dir, 'myjobmag_jobs.csv'),
+        'kuccps_csv': os.path.join(output_dir, 'kuccps_courses.csv'),
+        'requirements_json': os.path.join(output_dir, 'kuccps_requirements.json'),
+        'skill_map_json': os.path.join(output_dir, 'career_skill_map.json'),
+        'demand_csv': os.path.join(output_dir, 'job_demand_metrics.csv'),
+        'regional_demand_csv': os.path.join(output_dir, 'job_demand_regional.csv'),
+        'profiles_json': os.path.join(output_dir, 'kcse_profiles.json'),
+        'interest_texts_json': os.path.join(output_dir, 'interest_texts.json'),
+        'config_ini': os.path.join(output_dir, 'config.ini'),
+    }
+
+    jobs_df = generate_jobs(jobs, departments, weights, rng)
+    jobs_df.to_csv(paths['jobs_csv'], index=False)
+    demand = jobs_df.groupby('Department').size().reset_index(name='job_count')
+    demand['demand_score'] = demand['job_count'] / demand['job_count'].max()
+    demand.to_csv(paths['demand_csv'], index=False)
+    build_regional_demand(jobs_df, paths['regional_demand_csv'])
+
+    courses_df, requirements, skill_map = generate_programmes(
+        programmes, institutions, offerings_per_programme, departments, weights, level_mix,
+        list(real_requirements.values()), rng
+    )
+    courses_df.to_csv(paths['kuccps_csv'], index=False)
+    for key, data in (('requirements_json', requirements), ('skill_map_json', skill_map),
+                      ('profiles_json', generate_profiles(profiles, seed_profiles, rng)),
+                      ('interest_texts_json', generate_interest_texts(texts, departments, weights, rng))):
+        with open(paths[key], 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    # Config that points CareerRecommender at the synthetic files; derived
+    # indexes/caches are kept next to them so they never overwrite the real ones
+    config = configparser.ConfigParser()
+    config['paths'] = {k: os.path.abspath(v) for k, v in paths.items()
+                       if k in ('jobs_csv', 'kuccps_csv', 'requirements_json', 'skill_map_json', 'demand_csv',
+                                'regional_demand_csv')}
+    for key, filename in (('job_signal_index', 'job_signal_index.pkl'), ('dept_centroids', 'dept_job_centroids.npz'),
+                          ('job_embeddings', 'job_embeddings.f16.npy'), ('job_embeddings_meta', 'job_embeddings_meta.json'),
+                          ('programme_index', 'programme_index.npz'), ('programme_graph', 'programme_graph.npz'),
+                          ('jobs_search_db', 'jobs_search.db'), ('demand_db', 'demand_history.db')):
+        config['paths'][key] = os.path.abspath(os.path.join(output_dir, filename))
+    with open(paths['config_ini'], 'w') as f:
+        config.write(f)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic data for scale and load tests.")
+    parser.add_argument('--output-dir', default=os.path.join(PROJECT_ROOT, 'data', 'synthetic'))
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplier on the real data sizes (3k jobs, 1.1k programmes, 70 institutions)")
+    parser.add_argument('--jobs', type=int, help="Override the number of job postings")
+    parser.add_argument('--programmes', type=int, help="Override the number of programmes")
+    parser.add_argument('--institutions', type=int, help="Override the number of institutions")
+    parser.add_argument('--offerings', type=float, default=4.5, help="Mean offerings per programme")
+    parser.add_argument('--profiles', type=int, default=500, help="Number of KCSE profiles")
+    parser.add_argument('--texts', type=int, default=500, help="Number of interest statements")
+    parser.add_argument('--dept-skew', type=float, default=1.0, help="Zipf exponent for departments (0 = uniform)")
+    parser.add_argument('--level-mix', default="0.7,0.25,0.05", help="Degree,Diploma,Certificate shares")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    written = generate(
+        args.output_dir,
+        jobs=args.jobs or int(3000 * args.scale),
+        programmes=args.programmes or int(1100 * args.scale),
+        institutions=args.institutions or max(1, int(70 * args.scale)),
+        offerings_per_programme=args.offerings,
+        profiles=args.profiles,
+        texts=args.texts,
+        dept_skew=args.dept_skew,
+        level_mix=tuple(float(x) for x in args.level_mix.split(',')),
+        seed=args.seed,
+    )
+    for kind, path in written.items():
+        print(f"  ✅ {kind}: {path}")
@@ -1,7 +1,18 @@
+"""
+Bulk-load the scraped jobs CSV into the `jobs` table.
+
+The CSV is read in chunks, cleaned column-wise and streamed into a staging
+table (COPY on PostgreSQL, batched executemany on the SQLite stand-in used by
+the tests). One transaction then upserts the staged rows by content hash
+(the title|company|description `job_key` the other job stores use) and
+deletes postings no longer in the snapshot, so readers see either the old or
+the new table, never an empty one, and unchanged postings keep their ids.
+"""
+import io
 import os
 import sys
+import sqlite3
 import pandas as pd # type: ignore
-import psycopg2 # type: ignore
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,58 +26,173 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5432")
 }
 
-def load_jobs_to_db(csv_path="data/myjobmag_jobs.csv"):
-    if not os.path.exists(csv_path):
-        print(f"File {csv_path} not found.")
-        return
+# CSV column -> jobs table column
+COLUMN_MAP = {
+    'Job Title': 'Job_Title',
+    'Company': 'Company',
+    'Description': 'Description',
+    'Minimum Qualification': 'Minimum_Qualification',
+    'Skills Required': 'Skills_Required',
+    'Location': 'Location',
+    'Work Type': 'Work_Type',
+    'Years of Experience': 'Years_of_Experience',
+}
+TABLE_COLUMNS = list(COLUMN_MAP.values()) + ['Department', 'content_hash']
+
+def clean_jobs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Jobs table rows for a CSV chunk: text columns with missing values as '',
+    Department from DeptNorm (or Department, 'Unknown' if missing) and the
+    posting's content hash. Duplicate postings within the chunk are dropped.
+    """
+    from core.job_keys import job_key # type: ignore
+
+    rows = pd.DataFrame(index=df.index)
+    for source, column in COLUMN_MAP.items():
+        rows[column] = df[source].fillna('').astype(str) if source in df.columns else ''
+    dept_source = 'DeptNorm' if 'DeptNorm' in df.columns else 'Department'
+    rows['Department'] = df[dept_source].fillna('Unknown').astype(str) if dept_source in df.columns else 'Unknown'
+
+    # Hash the raw values, as job_search_db and the job indexes do
+    raw = [df[c] if c in df.columns else pd.Series([''] * len(df), index=df.index)
+           for c in ('Job Title', 'Company', 'Description')]
+    rows['content_hash'] = [job_key(t, c, d) for t, c, d in zip(*raw)]
+    return rows.drop_duplicates(subset='content_hash')
 
-    print("Loading jobs from CSV...")
-    df = pd.read_csv(csv_path)
+def connect():
+    """Open the PostgreSQL connection from DB_CONFIG (psycopg2 is only needed here)."""
+    import psycopg2 # type: ignore
+    return psycopg2.connect(**DB_CONFIG)
 
-    conn = None
+def _is_sqlite(conn) -> bool:
+    return isinstance(conn, sqlite3.Connection)
+
+def _has_content_hash(conn, cur) -> bool:
+    if _is_sqlite(conn):
+        return 'content_hash' in {row[1].lower() for row in cur.execute("PRAGMA table_info(jobs)").fetchall()}
+    cur.execute("""
+        SELECT 1 FROM information_schema.columns
+         WHERE table_schema = current_schema() AND table_name = 'jobs' AND column_name = 'content_hash'
+    """)
+    return cur.fetchone() is not None
+
+def _ensure_content_hash(conn):
+    """
+    One-time migration of a jobs table from before content hashes: add the
+    column and its unique index in their own committed transaction, so the
+    load transaction never holds the schema lock a PostgreSQL ALTER TABLE takes.
+    """
+    cur = conn.cursor()
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cur = conn.cursor()
-        
-        print("Connected! Emptying existing jobs table...")
-        cur.execute("TRUNCATE TABLE jobs RESTART IDENTITY CASCADE;")
-        
-        print("Inserting fresh data into PostgreSQL...")
-        insert_query = """
-            INSERT INTO jobs (Job_Title, Company, Description, Minimum_Qualification, 
-                              Skills_Required, Location, Work_Type, Years_of_Experience, Department)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        count = 0
-        for index, row in df.iterrows():
-            dept = row.get('DeptNorm', row.get('Department', 'Unknown'))
-            if pd.isna(dept): dept = 'Unknown'
-
-            data = (
-                str(row.get('Job Title', '')) if not pd.isna(row.get('Job Title')) else '',
-                str(row.get('Company', '')) if not pd.isna(row.get('Company')) else '',
-                str(row.get('Description', '')) if not pd.isna(row.get('Description')) else '',
-                str(row.get('Minimum Qualification', '')) if not pd.isna(row.get('Minimum Qualification')) else '',
-                str(row.get('Skills Required', '')) if not pd.isna(row.get('Skills Required')) else '',
-                str(row.get('Location', '')) if not pd.isna(row.get('Location')) else '',
-                str(row.get('Work Type', '')) if not pd.isna(row.get('Work Type')) else '',
-                str(row.get('Years of Experience', '')) if not pd.isna(row.get('Years of Experience')) else '',
-                str(dept) if not pd.isna(dept) else ''
-            )
-            
-            cur.execute(insert_query, data)
-            count += 1
-            
+        missing = not _has_content_hash(conn, cur)
+        if missing:
+            print("Adding the content_hash column to the jobs table...")
+            cur.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+            cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs (content_hash)")
         conn.commit()
-        print(f"✅ Successfully written {count} jobs into the PostgreSQL database.")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
         cur.close()
-    except psycopg2.Error as e:
-        print(f"Database error: {e}")
+
+def _stage(conn, cur, rows: pd.DataFrame, first_row: int):
+    """Append cleaned rows to jobs_staging, numbering them from `first_row` (file order)."""
+    rows = rows.assign(row_no=range(first_row, first_row + len(rows)))[TABLE_COLUMNS + ['row_no']]
+    if _is_sqlite(conn):
+        cur.executemany(
+            f"INSERT INTO jobs_staging ({', '.join(rows.columns)}) VALUES ({', '.join('?' * len(rows.columns))})",
+            rows.itertuples(index=False, name=None)
+        )
+    else:
+        buffer = io.StringIO()
+        rows.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        # FORCE_NOT_NULL keeps empty fields as '' (CSV COPY would read them as NULL)
+        cur.copy_expert(f"COPY jobs_staging ({', '.join(rows.columns)}) FROM STDIN "
+                        f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(TABLE_COLUMNS)}))", buffer)
+
+def bulk_load_jobs(conn, chunks) -> dict:
+    """
+    Replace the contents of `jobs` with the given snapshot in one transaction
+    (after adding the content_hash column, if the table predates it).
+
+    Args:
+        conn: psycopg2 or sqlite3 connection with an existing jobs table
+        chunks: Iterable of raw CSV DataFrame chunks (e.g. pd.read_csv(..., chunksize=n))
+
+    Returns:
+        dict: {'inserted': n, 'updated': n, 'deleted': n}
+    """
+    _ensure_content_hash(conn)
+    cur = conn.cursor()
+    try:
+        cur.execute("DROP TABLE IF EXISTS jobs_staging")
+        cur.execute(f"CREATE TEMP TABLE jobs_staging ({', '.join(c + ' TEXT' for c in TABLE_COLUMNS)}, row_no INTEGER)")
+
+        staged = 0
+        for chunk in chunks:
+            rows = clean_jobs(chunk)
+            _stage(conn, cur, rows, staged)
+            staged += len(rows)
+
+        # Keep the first occurrence of postings repeated across chunks
+        cur.execute("DELETE FROM jobs_staging WHERE row_no NOT IN (SELECT MIN(row_no) FROM jobs_staging GROUP BY content_hash)")
+        cur.execute("CREATE UNIQUE INDEX idx_jobs_staging_hash ON jobs_staging (content_hash)")
+        cur.execute("SELECT COUNT(*), SUM(CASE WHEN content_hash IN (SELECT content_hash FROM jobs) THEN 1 ELSE 0 END) "
+                    "FROM jobs_staging")
+        unique_rows, updated = cur.fetchone()
+        updated = updated or 0
+        inserted = unique_rows - updated
+
+        columns = ', '.join(TABLE_COLUMNS)
+        refreshed = ', '.join(f"{c} = excluded.{c}" for c in TABLE_COLUMNS if c != 'content_hash')
+        cur.execute(f"""
+            INSERT INTO jobs ({columns})
+            SELECT {columns} FROM jobs_staging WHERE true ORDER BY row_no
+            ON CONFLICT (content_hash) DO UPDATE SET {refreshed}
+        """)
+        cur.execute("""
+            DELETE FROM jobs WHERE content_hash IS NULL
+               OR NOT EXISTS (SELECT 1 FROM jobs_staging s WHERE s.content_hash = jobs.content_hash)
+        """)
+        deleted = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            cur.execute("DROP TABLE IF EXISTS jobs_staging")
+            conn.commit()
+        finally:
+            cur.close()
+    return {'inserted': inserted, 'updated': updated, 'deleted': deleted}
+
+def load_jobs_to_db(csv_path="data/myjobmag_jobs.csv", conn=None, chunk_size=10000):
+    """
+    Load the jobs CSV into the database (PostgreSQL from DB_CONFIG unless a
+    connection is given), streaming it `chunk_size` rows at a time.
+    """
+    if not os.path.exists(csv_path):
+        print(f"File {csv_path} not found.")
+        return
+
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = connect()
+        print("Connected! Bulk loading jobs from CSV through a staging table...")
+        stats = bulk_load_jobs(conn, pd.read_csv(csv_path, chunksize=chunk_size))
+        print(f"✅ Jobs table updated: {stats['inserted']} new, {stats['updated']} refreshed, "
+              f"{stats['deleted']} removed postings.")
+        return stats
+    except ImportError as e:
+        print(f"Database driver not available: {e}")
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Database error: {e}")
     finally:
-        if conn:
+        if own_conn and conn:
             conn.close()
 
 if __name__ == "__main__":
@@ -2,27 +2,22 @@ import pandas as pd # type: ignore
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from etl.extract_jobs import classify_department, normalize_department # type: ignore
+from etl.extract_jobs import classify_departments, normalize_departments # type: ignore
 from models.compute_demand_metrics import compute_demand_metrics
 
 # Load the existing scraped data
 df = pd.read_csv('data/myjobmag_jobs.csv')
 
-def reclassify(row):
-    title = str(row.get('Job Title', ''))
-    desc = str(row.get('Description', ''))
-    skills = str(row.get('Skills Required', ''))
-    raw_cat = str(row.get('Category', ''))
-    
-    classified_dept = classify_department(title, desc, skills)
-    # Prefer explicit category if provided, but raw_category is often empty or bad in scrapers
-    # So we use the new logic
-    dept_norm = normalize_department(raw_cat or classified_dept, f"{title} {desc} {skills}")
-    
-    return pd.Series({'Department': classified_dept, 'DeptNorm': dept_norm})
+# Keyword classification for the whole frame in one pass
+df['Department'] = classify_departments(df)
 
-# Apply the new robust classification
-df[['Department', 'DeptNorm']] = df.apply(reclassify, axis=1)
+# Prefer explicit category if provided, but raw_category is often empty or bad in scrapers
+# So we fall back to the keyword classification
+raw_cat = df['Category'].fillna('').astype(str).str.strip() if 'Category' in df.columns else pd.Series('', index=df.index)
+raw_cat = raw_cat.where(raw_cat != '', df['Department'])
+text = (df['Job Title'].fillna('').astype(str) + ' ' + df['Description'].fillna('').astype(str)
+        + ' ' + df['Skills Required'].fillna('').astype(str))
+df['DeptNorm'] = normalize_departments(raw_cat, text)
 
 # Save back to CSV
 df.to_csv('data/myjobmag_jobs.csv', index=False)
@@ -10,7 +10,7 @@ from datetime import datetime
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).parent
+project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
 def backup_existing_data():
@@ -25,7 +25,10 @@ def backup_existing_data():
         "data/myjobmag_jobs.json",
         "data/brightermonday_jobs.csv",
         "data/all_jobs_merged.csv",
-        "data/job_demand_metrics.csv"
+        "data/job_demand_metrics.csv",
+        "data/job_demand_regional.csv",
+        "data/dept_job_centroids.npz",
+        "data/demand_history.db"
     ]
     
     print("\n💾 Backing up existing data...")
@@ -77,8 +80,9 @@ def cleanup_old_backups(keep_last_n=10):
 
 def merge_and_deduplicate(dfs: list, output_csv: str) -> int:
     """
-    Merge multiple DataFrames, deduplicate by (Job Title, Company),
-    and save to the unified CSV used by the recommender.
+    Merge multiple DataFrames, deduplicate by (Job Title, Company) and then
+    by near-duplicate title within the same normalized company (see
+    etl/dedup.py), and save to the unified CSV used by the recommender.
     Returns the total number of unique jobs.
     """
     import pandas as pd # type: ignore
@@ -91,16 +95,139 @@ def merge_and_deduplicate(dfs: list, output_csv: str) -> int:
     combined["_company_lower"] = combined["Company"].str.lower().str.strip()
     combined.drop_duplicates(subset=["_title_lower", "_company_lower"], inplace=True)
     combined.drop(columns=["_title_lower", "_company_lower"], inplace=True)
+    exact = len(combined)
+
+    # Cross-posted jobs with slightly different titles/company spellings
+    from etl.dedup import drop_near_duplicates # type: ignore
+    combined, near = drop_near_duplicates(combined)
+
+    # Normalise free-text locations to counties for the regional demand cube
+    from core.locations import add_region_column # type: ignore
+    combined = add_region_column(combined)
     
     # Reset index
     combined.reset_index(drop=True, inplace=True)
     combined.to_csv(output_csv, index=False, encoding="utf-8")
     
     after = len(combined)
-    print(f"  📊 Merged: {before} raw → {after} unique jobs saved to {output_csv}")
+    print(f"  📊 Merged: {before} raw → {after} unique jobs saved to {output_csv} "
+          f"({before - exact} exact, {near} near duplicates dropped)")
+    return after
+
+def _source_chunks(source, chunk_size: int):
+    """
+    DataFrame chunks of a merge source: a DataFrame, a CSV or scraper JSONL
+    path, or a (source, {column: value}) pair adding constant columns.
+    """
+    import pandas as pd # type: ignore
+
+    source, constants = source if isinstance(source, tuple) else (source, {})
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif str(source).endswith(".jsonl"):
+        from etl.job_stream import _chunks # type: ignore
+        chunks = (pd.DataFrame(records) for records in _chunks(str(source), chunk_size))
+    else:
+        chunks = pd.read_csv(source, chunksize=chunk_size)
+    for chunk in chunks:
+        yield chunk.assign(**constants) if constants else chunk
+
+def _source_columns(source) -> list:
+    """Columns of a merge source without loading its rows (JSONL keys are scanned once)."""
+    import pandas as pd # type: ignore
+
+    source, constants = source if isinstance(source, tuple) else (source, {})
+    if isinstance(source, pd.DataFrame):
+        columns = list(source.columns)
+    elif str(source).endswith(".jsonl"):
+        from etl.job_stream import iter_jsonl # type: ignore
+        columns = list(dict.fromkeys(key for record in iter_jsonl(str(source)) for key in record))
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    return columns + [c for c in constants if c not in columns]
+
+def _count_rows(csv_path) -> int:
+    import pandas as pd # type: ignore
+    return sum(len(chunk) for chunk in pd.read_csv(csv_path, usecols=[0], chunksize=100000))
+
+def merge_and_deduplicate_chunked(sources: list, output_csv: str, chunk_size: int = 20000,
+                                  key_db_path: str = None) -> int:
+    """
+    Out-of-core version of merge_and_deduplicate: streams every source in
+    `chunk_size` rows, drops rows already kept (exact or near duplicates, via
+    an on-disk etl.dedup.DedupIndex) and appends the rest to the output, so
+    peak memory is one chunk whatever the number or size of sources.
+    The output is written to a temporary file first, so a source may be the
+    output CSV itself.
+
+    Args:
+        sources (list): DataFrames, CSV/JSONL paths or (source, {column: value}) pairs
+        output_csv (str): Unified CSV to write
+        chunk_size (int): Rows per chunk
+        key_db_path (str): Keep the key index in this SQLite file (temporary by default)
+
+    Returns:
+        int: Number of unique jobs written
+    """
+    import pandas as pd # type: ignore
+    from etl.dedup import DedupIndex # type: ignore
+    from core.locations import add_region_column # type: ignore
+
+    # Same column order pd.concat gives: every source's columns in first-seen order
+    columns = list(dict.fromkeys(c for source in sources for c in _source_columns(source)))
+    tmp_csv = f"{output_csv}.merging"
+    before = exact = near = after = 0
+    with DedupIndex(key_db_path) as index:
+        for source in sources:
+            for chunk in _source_chunks(source, chunk_size):
+                chunk = chunk.reindex(columns=columns)
+                keep, n_exact, n_near = index.filter(chunk["Job Title"].tolist(), chunk["Company"].tolist())
+                before += len(chunk)
+                exact += n_exact
+                near += n_near
+                kept = add_region_column(chunk[keep])
+                kept.to_csv(tmp_csv, index=False, encoding="utf-8", mode="w" if after == 0 else "a",
+                            header=(after == 0))
+                after += len(kept)
+    if after == 0:
+        add_region_column(pd.DataFrame(columns=columns)).to_csv(tmp_csv, index=False, encoding="utf-8")
+    os.replace(tmp_csv, output_csv)
+
+    print(f"  📊 Merged (chunked): {before} raw → {after} unique jobs saved to {output_csv} "
+          f"({exact} exact, {near} near duplicates dropped)")
     return after
 
-def main():
+# Columns JobSignalIndex.apply_delta reads from a snapshot
+SIGNAL_INDEX_COLUMNS = ('Job Title', 'Company', 'Description', 'DeptNorm')
+
+def update_job_signal_index(previous_df, current_df) -> dict:
+    """
+    Apply the added/removed/re-labelled postings between two snapshots to the
+    persisted JobSignalIndex used by the classifier's job-description layer,
+    building it from scratch the first time.
+    """
+    from models.job_signal_index import JobSignalIndex, DEFAULT_INDEX_PATH # type: ignore
+
+    index = JobSignalIndex.load(DEFAULT_INDEX_PATH)
+    if index is None:
+        index = JobSignalIndex()
+        index.rebuild(current_df)
+        stats = {'added': len(index.jobs), 'removed': 0, 'moved': 0}
+    else:
+        stats = index.apply_delta(previous_df, current_df)
+    index.save(DEFAULT_INDEX_PATH)
+    print(f"  ✅ Job-signal index: +{stats['added']} / -{stats['removed']} / moved {stats['moved']} "
+          f"({len(index.jobs):,} jobs indexed)")
+    return stats
+
+def main(full_refresh: bool = False, chunked: bool = False):
+    """
+    Run the whole pipeline. Scraping is incremental: postings already in the
+    seen-URL store are not re-fetched and pagination stops at mostly-known
+    pages; `full_refresh` (--full) re-scrapes every page and detail.
+    `chunked` (--chunked) merges the sources out of core with
+    merge_and_deduplicate_chunked instead of loading them all at once.
+    """
     print("=" * 65)
     print("🔄 MULTI-SOURCE JOB DATA PIPELINE  (MyJobMag + BrighterMonday)")
     print("=" * 65)
@@ -109,19 +236,35 @@ def main():
     backup_existing_data()
     
     import pandas as pd # type: ignore
-    scraped_dfs = []
+
+    # The previous snapshot is needed to subtract removed postings from the
+    # job-signal index. Read it now: Step 1 overwrites the same file.
+    merged_csv = str(project_root / "data" / "myjobmag_jobs.csv")  # keep original path for recommender
+    previous_df = pd.read_csv(merged_csv, usecols=lambda c: c in SIGNAL_INDEX_COLUMNS) \
+        if os.path.exists(merged_csv) else None
+
+    from etl.driver_pool import DriverPool # type: ignore
+    from etl.seen_store import SeenStore # type: ignore
+    # (CSV path, constant columns) of every scraped source, read in full or in chunks at merge time
+    scraped_sources = []
+    # One pool of Selenium drivers (started lazily, rate-limited per host) for both scrapers
+    driver_pool = DriverPool(size=4, rate_per_host=1 / 1.5)
+    seen_store = SeenStore(skip_known=not full_refresh)
 
     # ── Step 1: Scrape MyJobMag ───────────────────────────────────────
     print("\n📡 Step 1: Scraping MyJobMag Kenya...")
     try:
-        from etl.extract_jobs import scrape_myjobmag # type: ignore
-        scrape_myjobmag(pages=5)
+        try:
+            from etl.http_scraper import scrape_source # type: ignore
+            scrape_source("myjobmag", pages=5, seen_store=seen_store, return_records=False)
+        except ImportError as e:
+            print(f"  Warning: HTTP scraper unavailable ({e}), using Selenium.")
+            from etl.extract_jobs import scrape_myjobmag # type: ignore
+            scrape_myjobmag(pages=5, pool=driver_pool, seen_store=seen_store, return_records=False)
         myjobmag_csv = project_root / "data" / "myjobmag_jobs.csv"
         if myjobmag_csv.exists():
-            df_mj = pd.read_csv(myjobmag_csv)
-            df_mj["Source"] = "MyJobMag"
-            scraped_dfs.append(df_mj)
-            print(f"  ✅ MyJobMag: {len(df_mj)} jobs scraped.")
+            scraped_sources.append((str(myjobmag_csv), {"Source": "MyJobMag"}))
+            print(f"  ✅ MyJobMag: {_count_rows(myjobmag_csv)} jobs scraped.")
         else:
             print("  ⚠️  MyJobMag CSV not found after scrape.")
     except Exception as e:
@@ -130,23 +273,34 @@ def main():
     # ── Step 2: Scrape BrighterMonday ────────────────────────────────
     print("\n📡 Step 2: Scraping BrighterMonday Kenya...")
     try:
-        from etl.scrape_brightermonday import scrape_brightermonday # type: ignore
-        scrape_brightermonday(pages=5)
+        try:
+            from etl.http_scraper import scrape_source # type: ignore
+            scrape_source("brightermonday", pages=5, seen_store=seen_store, return_records=False)
+        except ImportError as e:
+            print(f"  Warning: HTTP scraper unavailable ({e}), using Selenium.")
+            from etl.scrape_brightermonday import scrape_brightermonday # type: ignore
+            scrape_brightermonday(pages=5, pool=driver_pool, seen_store=seen_store, return_records=False)
         bm_csv = project_root / "data" / "brightermonday_jobs.csv"
         if bm_csv.exists():
-            df_bm = pd.read_csv(bm_csv)
-            scraped_dfs.append(df_bm)
-            print(f"  ✅ BrighterMonday: {len(df_bm)} jobs scraped.")
+            scraped_sources.append((str(bm_csv), {}))
+            print(f"  ✅ BrighterMonday: {_count_rows(bm_csv)} jobs scraped.")
         else:
             print("  ⚠️  BrighterMonday CSV not found after scrape.")
     except Exception as e:
         print(f"  ❌ BrighterMonday scraping failed: {e}")
 
+    driver_pool.close()
+    print(f"\n👁️ Seen-URL store: {seen_store.count():,} postings tracked")
+    seen_store.close()
+
     # ── Step 3: Merge & Deduplicate ───────────────────────────────────
-    merged_csv = str(project_root / "data" / "myjobmag_jobs.csv")  # keep original path for recommender
-    if scraped_dfs:
+    if scraped_sources:
         print("\n🔗 Step 3: Merging and deduplicating all sources...")
-        total = merge_and_deduplicate(scraped_dfs, merged_csv)
+        if chunked:
+            total = merge_and_deduplicate_chunked(scraped_sources, merged_csv)
+        else:
+            total = merge_and_deduplicate([pd.read_csv(path).assign(**constants)
+                                           for path, constants in scraped_sources], merged_csv)
         # Also save a separate all_jobs file for admin inspection
         all_csv = str(project_root / "data" / "all_jobs_merged.csv")
         import shutil as _shutil
@@ -155,13 +309,60 @@ def main():
         print("\n⚠️ No data scraped from any source. Aborting merge.")
         return False
 
+    # ── Step 3b: Apply the delta to the job-signal index ──────────────
+    print("\n🧮 Step 3b: Updating job-signal index incrementally...")
+    try:
+        update_job_signal_index(previous_df, pd.read_csv(merged_csv))
+    except Exception as e:
+        print(f"  ⚠️ Could not update job-signal index: {e}")
+
+    # ── Step 3c: Embed postings once (offline BERT pass) for search + centroids ──
+    print("\n🧭 Step 3c: Building job embedding index and department centroids...")
+    try:
+        from models.semantic_job_index import build_semantic_job_index, DEFAULT_MATRIX_PATH # type: ignore
+        from models.dept_centroids import build_department_centroids, DEFAULT_CENTROIDS_PATH # type: ignore
+        merged_df = pd.read_csv(merged_csv)
+        job_vectors = build_semantic_job_index(merged_df)
+        print(f"  ✅ {len(job_vectors):,} postings embedded into {DEFAULT_MATRIX_PATH}")
+        counts = build_department_centroids(merged_df, DEFAULT_CENTROIDS_PATH, vectors=job_vectors)
+        print(f"  ✅ Centroids for {len(counts)} departments saved to {DEFAULT_CENTROIDS_PATH}")
+    except Exception as e:
+        print(f"  ⚠️ Could not build job embeddings: {e}")
+
+    # ── Step 3d: Upsert the snapshot into the SQLite full-text job store ──
+    print("\n🗄️ Step 3d: Updating full-text job search database...")
+    try:
+        from etl.job_search_db import update_from_csv, job_count, DEFAULT_DB_PATH # type: ignore
+        stats = update_from_csv(merged_csv)
+        print(f"  ✅ {stats['inserted']} new / {stats['updated']} refreshed postings "
+              f"({job_count():,} searchable in {DEFAULT_DB_PATH})")
+    except Exception as e:
+        print(f"  ⚠️ Could not update job search database: {e}")
+
+    # ── Step 3e: Programme similarity graph (only when requirements changed) ──
+    print("\n🕸️ Step 3e: Checking programme similarity graph...")
+    try:
+        from scripts.build_programme_graph import build_programme_graph_cache # type: ignore
+        edges, rebuilt = build_programme_graph_cache()
+        print(f"  ✅ Programme graph {'rebuilt' if rebuilt else 'already current'} ({edges:,} edges)")
+    except Exception as e:
+        print(f"  ⚠️ Could not build programme graph: {e}")
+
     # ── Step 4: Recompute demand metrics off the merged dataset ───────
     print("\n📊 Step 4: Recomputing demand metrics from merged data...")
     try:
         from models.compute_demand_metrics import compute_demand_metrics # type: ignore
+        from models.demand_store import DEFAULT_DEMAND_DB_PATH # type: ignore
+        # Only this run's new postings are appended to the demand history; windows come from it
         compute_demand_metrics(
             jobs_csv_path=merged_csv,
-            output_path=str(project_root / "data" / "job_demand_metrics.csv")
+            output_path=str(project_root / "data" / "job_demand_metrics.csv"),
+            demand_db_path=DEFAULT_DEMAND_DB_PATH
+        )
+        from core.locations import build_regional_demand # type: ignore
+        build_regional_demand(
+            pd.read_csv(merged_csv),
+            output_path=str(project_root / "data" / "job_demand_regional.csv")
         )
         print("  ✅ Demand metrics updated!")
     except Exception as e:
@@ -199,5 +400,5 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    success = main(full_refresh="--full" in sys.argv, chunked="--chunked" in sys.argv)
     sys.exit(0 if success else 1)
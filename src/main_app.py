@@ -67,6 +67,22 @@ def _hash_job_row(title: str, company: str, desc: str) -> str:
     h.update((str(title) + '|' + str(company) + '|' + str(desc)).encode('utf-8', errors='ignore'))
     return h.hexdigest()
 
+def _render_eligible_alternatives(eligibility_map: dict, limit: int = 5):
+    """List the closest programmes the student qualifies for, from the programme similarity graph."""
+    seen = set()
+    rows = []
+    for prog, info in eligibility_map.items():
+        for alt in info.get('alternatives', []) or []:
+            if alt['programme'] in seen or alt['programme'] in eligibility_map:
+                continue
+            seen.add(alt['programme'])
+            rows.append((prog, alt))
+    if not rows:
+        return
+    st.markdown("#### 🔀 Closest Programmes You Qualify For")
+    for prog, alt in rows[:limit]:
+        st.markdown(f"- ✅ **{alt['programme']}** ({alt.get('level', 'Programme')}) — similar to {prog.replace(chr(10), ' ').title()}")
+
 def _load_category_mapping():
     try:
         if os.path.exists(CATEGORY_MAP_FILE):
@@ -80,6 +96,9 @@ def _save_category_mapping(mapping: dict):
     try:
         with open(CATEGORY_MAP_FILE, 'w', encoding='utf-8') as f:
             json.dump(mapping, f, ensure_ascii=False, indent=2)
+        # Pick up the new mappings in the shared taxonomy without a restart
+        from models.taxonomy import get_taxonomy # type: ignore
+        get_taxonomy().reload()
     except Exception:
         pass
 
@@ -528,6 +547,17 @@ with st.sidebar:
         st.session_state.pop('recommendations', None)
         st.session_state.pop('df_viz', None)
         st.session_state['_target_level_prev'] = target_level
+
+    # Preferred region: blends county-level job demand into the market score
+    _regions = sorted(r for r in recommender.regional_demand if r != "Unspecified")
+    preferred_region = st.selectbox(
+        "📍 Preferred Region",
+        ["Anywhere in Kenya"] + _regions,
+        index=0,
+        key='preferred_region',
+        help="Weigh job demand in this county alongside national demand."
+    )
+    region_arg = None if preferred_region == "Anywhere in Kenya" else preferred_region
     st.markdown("---")
     
     # 2. Intelligence
@@ -785,6 +815,44 @@ with st.expander("🆕 New here? Unlock the power of AI Guidance", expanded=Fals
         st.markdown("🛤 **3. Explore Roadmaps**")
         st.caption("Each result comes with a 4-step execution plan and real-world job connections.")
 
+# Programme finder: search KUCCPS offerings by name, institution or department
+with st.expander("🔎 Search KUCCPS Programmes"):
+    search_index = getattr(recommender, 'programme_search', None)
+    if search_index is None or not search_index.docs:
+        st.caption("Programme data is unavailable.")
+    else:
+        ps_query = st.text_input("Programme, institution or field", key="programme_search_query",
+                                 placeholder="e.g. nursing, computer sci, moi university")
+        suggestions = search_index.autocomplete(ps_query, limit=5) if ps_query else []
+        if suggestions:
+            st.caption("Suggestions: " + " · ".join(s.replace(chr(10), ' ').title() for s in suggestions))
+        f_col1, f_col2, f_col3 = st.columns(3)
+        with f_col1:
+            ps_level = st.selectbox("Level", ["Any", "Degree", "Diploma", "Certificate"], key="programme_search_level")
+        with f_col2:
+            ps_inst = st.selectbox("Institution", ["Any"] + search_index.institutions(), key="programme_search_inst")
+        with f_col3:
+            ps_cutoff = st.slider("Cutoff range", 0.0, 50.0, (0.0, 50.0), step=0.5, key="programme_search_cutoff")
+        cutoff_filtered = ps_cutoff != (0.0, 50.0)
+        hits = search_index.search(
+            ps_query,
+            level=None if ps_level == "Any" else ps_level,
+            institution=None if ps_inst == "Any" else ps_inst,
+            cutoff_min=ps_cutoff[0] if cutoff_filtered else None,
+            cutoff_max=ps_cutoff[1] if cutoff_filtered else None,
+            k=25
+        )
+        if hits:
+            st.dataframe(pd.DataFrame([{
+                "Programme": h['programme'].replace(chr(10), ' '),
+                "Institution": h['institution'],
+                "Level": h['level'],
+                "Cutoff": h['cutoff'] if h['cutoff'] is not None else "N/A",
+                "Code": h['code'],
+            } for h in hits]), use_container_width=True, hide_index=True)
+        elif ps_query:
+            st.caption("No programmes match that search.")
+
 st.markdown("### ✍️ Start Your Career Profile")
 
 # Template Guidance
@@ -1239,9 +1307,9 @@ if st.button("🚀 Generate Personalized Roadmap", type="primary"):
                 inc_recommender = InclusiveRecommender(base_recommender=recommender)
                 inc_recommender.set_accessibility_requirements(st.session_state.get('acc_requirements', []))
                 inc_recommender.set_disability_type(st.session_state.get('disability_type', 'Default'))
-                recs = inc_recommender.recommend(student_text, top_n=8, alpha=alpha, beta=beta, kcse_results=kcse_data, target_level=target_level)
+                recs = inc_recommender.recommend(student_text, top_n=8, alpha=alpha, beta=beta, kcse_results=kcse_data, target_level=target_level, region=region_arg)
             else:
-                recs = recommender.recommend(student_text, top_n=8, alpha=alpha, beta=beta, kcse_results=kcse_data, target_level=target_level)
+                recs = recommender.recommend(student_text, top_n=8, alpha=alpha, beta=beta, kcse_results=kcse_data, target_level=target_level, region=region_arg)
                 
             if recs:
                 st.session_state['recommendations'] = recs
@@ -1274,6 +1342,16 @@ if 'recommendations' in st.session_state:
     recommendations = st.session_state['recommendations']
     df_viz = st.session_state['df_viz']
     student_text = st.session_state.get('student_query', '')
+    # The student's text is embedded once per submission (not per rerun) and shared by every
+    # Market Pulse search below; only when the job embedding index can use it, and never in
+    # the BERT-free fast classifier mode
+    student_query_vector = None
+    if student_text and recommender.classifier_mode != "fast" and recommender.semantic_job_index() is not None:
+        cached_query = st.session_state.get('student_query_vector')
+        if cached_query is None or cached_query[0] != student_text:
+            cached_query = (student_text, recommender.embed_query(student_text))
+            st.session_state['student_query_vector'] = cached_query
+        student_query_vector = cached_query[1]
 
     st.markdown("---")
 
@@ -1526,6 +1604,8 @@ if 'recommendations' in st.session_state:
                                 else:
                                     st.markdown("- **Pre-University Certificate** in relevant field")
                                     st.markdown("- **TVET Foundation Level 5**")
+
+                                _render_eligible_alternatives(eligibility_map)
                                 
                                 st.markdown("#### 🔗 Upgrade Pathway (Bridge Logic)")
                                 st.success("Successful completion of a Diploma enables **Lateral Entry** into a degree later and improves your future KUCCPS competitiveness.")
@@ -1570,6 +1650,7 @@ if 'recommendations' in st.session_state:
                                         st.markdown("- TVET foundational certificates (3–6 months)")
                                         st.markdown("- Private college short courses (4–8 weeks)")
                                         st.success("Completing bridging improves degree eligibility and future competitiveness.")
+                                        _render_eligible_alternatives(rec.get('eligibility', {}))
                                     except Exception:
                                         pass
                                 
@@ -1843,7 +1924,10 @@ if 'recommendations' in st.session_state:
                         st.markdown("#### 📡 Market Pulse: Active Opportunities")
                         st.caption("Click on any role below to unlock a detailed breakdown of skills and academic alignment.")
 
-                        jobs = recommender.get_top_jobs(rec['dept'], top_n=3)
+                        if student_query_vector is not None:
+                            jobs = recommender.search_jobs(student_text, dept=rec['dept'], k=3, query_vector=student_query_vector)
+                        else:
+                            jobs = recommender.get_top_jobs(rec['dept'], top_n=3)
                         if jobs:
                             for idx, job in enumerate(jobs):
                                 # Unique key for expander
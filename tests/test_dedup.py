@@ -0,0 +1,117 @@
+import unittest
+import os
+import sys
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.dedup import DedupIndex, _candidate_pairs, drop_near_duplicates, minhash_signatures, near_duplicate_clusters, normalize_company, normalize_title # type: ignore
+
+
+class TestDedup(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_company("Safaricom PLC"), normalize_company("Safaricom Kenya Limited"))
+        self.assertEqual(normalize_company(float('nan')), '')
+        self.assertEqual(normalize_title("Data Analyst at Safaricom PLC", "Safaricom Ltd"), "data analyst")
+        # "at" followed by something other than the employer is part of the title
+        self.assertEqual(normalize_title("Teacher at Kisumu Campus", "Moi University"), "teacher at kisumu campus")
+
+    def test_clusters(self):
+        titles = ["Senior Data Analyst at Safaricom PLC", "Senior Data Analyst", "Data Analyst",
+                  "Senior Data Analyst", "Sotware Engineer", "Software Engineer", "Accountant"]
+        companies = ["Safaricom PLC", "Safaricom Kenya Limited", "Safaricom",
+                     "Equity Bank", "KCB", "KCB Group", "KCB"]
+        self.assertEqual(near_duplicate_clusters(titles, companies).tolist(), [0, 0, 2, 3, 4, 4, 6])
+
+    @staticmethod
+    def _perturbed_postings():
+        rng = np.random.RandomState(0)
+        roles = ["Accountant", "Software Engineer", "Data Analyst", "Sales Executive", "Nurse", "Procurement Officer"]
+        titles, companies = [], []
+        for _ in range(120):
+            title = str(rng.choice(roles))
+            if rng.rand() < 0.3:
+                i = rng.randint(len(title))
+                title = title[:i] + title[i + 1:]
+            titles.append(f"{title} at Acme Ltd" if rng.rand() < 0.5 else title)
+            companies.append(str(rng.choice(["Acme Ltd", "Acme Kenya", "Beta Bank"])))
+        return titles, companies
+
+    @staticmethod
+    def _pairwise_reference(titles, companies):
+        """Clusters from comparing every pair of postings."""
+        from thefuzz import fuzz # type: ignore
+        norm = [(normalize_company(c), normalize_title(t, c)) for t, c in zip(titles, companies)]
+        parent = list(range(len(norm)))
+
+        def root(x):
+            while parent[x] != x:
+                x = parent[x]
+            return x
+        for j in range(len(norm)):
+            for i in range(j):
+                if norm[i][0] == norm[j][0] and fuzz.token_sort_ratio(norm[i][1], norm[j][1]) >= 90:
+                    ri, rj = root(i), root(j)
+                    parent[max(ri, rj)] = min(ri, rj)
+        return np.array([root(i) for i in range(len(norm))])
+
+    def test_matches_pairwise_reference(self):
+        """Blocking finds the same clusters as comparing every pair on a small perturbed set."""
+        titles, companies = self._perturbed_postings()
+        expected = self._pairwise_reference(titles, companies)
+        self.assertEqual(near_duplicate_clusters(titles, companies, num_perm=64, bands=32).tolist(), expected.tolist())
+
+    def test_default_parameters_against_pairwise_reference(self):
+        """With the default 32 permutations in 8 bands, merges are all real and few duplicates are missed."""
+        titles, companies = self._perturbed_postings()
+        expected = self._pairwise_reference(titles, companies)
+        reps = near_duplicate_clusters(titles, companies)
+        self.assertTrue((expected[reps] == expected).all())
+        found = (reps != np.arange(len(reps))).sum()
+        self.assertGreaterEqual(found / (expected != np.arange(len(expected))).sum(), 0.95)
+
+    def test_candidate_pairs_cover_whole_buckets(self):
+        buckets = np.array([[5, 1], [5, 2], [7, 3], [5, 3], [7, 4]], dtype=np.int64)
+        self.assertEqual(_candidate_pairs(buckets).tolist(), [[0, 1], [0, 3], [1, 3], [2, 3], [2, 4]])
+
+    def test_numbers_must_match(self):
+        titles = ["Teacher Grade 1", "Teacher Grade 2", "Teacher, Grade 1", "Accountant II", "Accountant 2"]
+        self.assertEqual(near_duplicate_clusters(titles, ["Moi School"] * 5).tolist(), [0, 1, 0, 3, 4])
+        with DedupIndex() as index:
+            index.filter(titles[:1], ["Moi School"])
+            keep, _, near = index.filter(titles[1:3], ["Moi School"] * 2)
+        self.assertEqual((keep.tolist(), near), ([True, False], 1))
+
+    def test_signatures_estimate_jaccard(self):
+        sig = minhash_signatures(["senior data analyst", "senior data analyst", "nurse"], num_perm=64)
+        self.assertTrue((sig[0] == sig[1]).all())
+        self.assertLess((sig[0] == sig[2]).mean(), 0.2)
+
+    def test_drop_near_duplicates_keeps_first(self):
+        df = pd.DataFrame({"Job Title": ["Nurse at Aga Khan Hospital", "Nurse", "Driver"],
+                           "Company": ["Aga Khan Hospital", "The Aga Khan Hospital", "Aga Khan Hospital"]})
+        kept, dropped = drop_near_duplicates(df)
+        self.assertEqual(dropped, 1)
+        self.assertEqual(kept.index.tolist(), [0, 2])
+
+    def test_index_across_chunks(self):
+        """Streaming chunks through DedupIndex keeps the same rows as clustering them all at once."""
+        titles = ["Nurse at Aga Khan Hospital", "Driver", "NURSE", "Nurse", "Drivr", "Accountant", "driver"]
+        companies = ["Aga Khan Hospital", "Aga Khan Hospital", "The Aga Khan Hospital", "Aga Khan Hospital",
+                     "Aga Khan Hospital", "Aga Khan Hospital", "Aga Khan Hospital"]
+        expected = near_duplicate_clusters(titles, companies) == np.arange(len(titles))
+        with DedupIndex() as index:
+            kept, exact, near = [], 0, 0
+            for start in range(0, len(titles), 3):
+                keep, n_exact, n_near = index.filter(titles[start:start + 3], companies[start:start + 3])
+                kept.extend(keep.tolist())
+                exact += n_exact
+                near += n_near
+        self.assertEqual(kept, expected.tolist())
+        self.assertEqual((exact, near), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import math
+import tempfile
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compute_demand_metrics import compute_demand_metrics # type: ignore
+from models.demand_store import DemandStore # type: ignore
+
+
+def _jobs(*rows):
+    return pd.DataFrame([(f"{dept} role {i}", "Acme", f"Posting {i}", dept) for i, dept in rows],
+                        columns=['Job Title', 'Company', 'Description', 'Department'])
+
+
+class TestDemandStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = DemandStore(os.path.join(self.tmp.name, 'demand.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_only_new_postings_are_counted(self):
+        first = _jobs((1, 'Business'), (2, 'Business'), (3, 'Engineering'))
+        self.assertEqual(self.store.ingest(first, seen_on='2025-01-01'), 3)
+        # A re-scraped snapshot adds only its new posting, on the new date
+        self.assertEqual(self.store.ingest(pd.concat([first, _jobs((4, 'Engineering'))]), seen_on='2025-01-05'), 1)
+        self.assertEqual(self.store.ingest(first, seen_on='2025-01-05'), 0)
+        self.assertEqual(self.store.window_counts(), {'Business': 2, 'Engineering': 2})
+        self.assertEqual(self.store.window_counts(days=3), {'Engineering': 1})
+
+    def test_windows_growth_and_scores(self):
+        self.store.ingest(_jobs((1, 'Business'), (2, 'Engineering')), seen_on='2025-01-01')
+        self.store.ingest(_jobs((3, 'Business'), (4, 'Business'), (5, 'Business'), (6, 'Engineering')), seen_on='2025-01-09')
+        week = self.store.demand(7).set_index('Department')
+        self.assertEqual(week['job_count'].to_dict(), {'Business': 3, 'Engineering': 1})
+        self.assertAlmostEqual(week.loc['Engineering', 'demand_score'], 1 / 3)
+        # Previous week (Jan 2) had 1 Business and 1 Engineering posting
+        self.assertAlmostEqual(week.loc['Business', 'growth'], 2.0)
+        self.assertAlmostEqual(week.loc['Engineering', 'growth'], 0.0)
+
+        metrics = self.store.metrics(windows=(7, 30)).set_index('Department')
+        self.assertEqual(metrics['history_job_count'].to_dict(), {'Business': 4, 'Engineering': 2})
+        self.assertEqual(metrics['job_count_30d'].to_dict(), {'Business': 4, 'Engineering': 2})
+        self.assertTrue(math.isnan(metrics.loc['Business', 'growth_30d']))
+
+    def test_first_snapshot_is_a_baseline(self):
+        jobs = _jobs((1, 'Business'), (2, 'Business'), (3, 'Engineering'))
+        self.assertEqual(self.store.ingest(jobs, seen_on='2025-01-01', baseline=True), 3)
+        self.assertIsNone(self.store.latest_day())
+        self.assertEqual(self.store.window_counts(7), {})
+        self.assertEqual(self.store.window_counts(), {'Business': 2, 'Engineering': 1})
+
+        # Only postings that appear after the baseline fall in a window
+        self.store.ingest(pd.concat([jobs, _jobs((4, 'Engineering'))]), seen_on='2025-01-05')
+        self.assertEqual(self.store.window_counts(7), {'Engineering': 1})
+        self.assertEqual(self.store.window_counts(), {'Business': 2, 'Engineering': 2})
+
+    def test_metrics_csv_keeps_snapshot_counts(self):
+        csv_path = os.path.join(self.tmp.name, 'jobs.csv')
+        output = os.path.join(self.tmp.name, 'metrics.csv')
+        db_path = os.path.join(self.tmp.name, 'history.db')
+        _jobs((1, 'Business'), (2, 'Business'), (3, 'Engineering')).to_csv(csv_path, index=False)
+        plain = compute_demand_metrics(csv_path, output)
+
+        first = compute_demand_metrics(csv_path, output, demand_db_path=db_path, seen_on='2025-01-01')
+        self.assertEqual(first[['Department', 'job_count', 'demand_score']].to_dict(), plain.to_dict())
+        self.assertEqual(first['history_job_count'].tolist(), [2, 1])
+        # The seeding run is no one's new postings
+        self.assertEqual(first['job_count_7d'].tolist(), [0, 0])
+
+        # Business postings 1 and 2 expired; job_count is the snapshot, history keeps them
+        _jobs((3, 'Engineering'), (4, 'Engineering'), (5, 'Business')).to_csv(csv_path, index=False)
+        second = compute_demand_metrics(csv_path, output, demand_db_path=db_path, seen_on='2025-01-05').set_index('Department')
+        self.assertEqual(second['job_count'].to_dict(), {'Business': 1, 'Engineering': 2})
+        self.assertEqual(second['history_job_count'].to_dict(), {'Business': 3, 'Engineering': 2})
+        self.assertEqual(second['job_count_7d'].to_dict(), {'Business': 1, 'Engineering': 1})
+        self.assertEqual(pd.read_csv(output).columns[:3].tolist(), ['Department', 'job_count', 'demand_score'])
+
+
+if __name__ == "__main__":
+    unittest.main()
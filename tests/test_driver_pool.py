@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.driver_pool import DriverPool, HostRateLimiter # type: ignore
+
+
+class FakeDriver:
+    def __init__(self):
+        self.loaded = []
+
+    def get(self, url):
+        self.loaded.append(url)
+        time.sleep(0.01)
+
+    def quit(self):
+        pass
+
+
+class TestDriverPool(unittest.TestCase):
+    def test_map_ordered_and_bounded(self):
+        """Results keep input order, no more than `size` drivers start, and failures become None."""
+        drivers = []
+        lock = threading.Lock()
+
+        def factory(headless):
+            with lock:
+                drivers.append(FakeDriver())
+                return drivers[-1]
+
+        with DriverPool(size=3, rate_per_host=0, driver_factory=factory) as pool:
+            urls = [f"https://example.com/job/{i}" for i in range(12)]
+            results = pool.map(lambda d, u: pool.load(d, u) and u, urls)
+            self.assertEqual(results, urls)
+            self.assertLessEqual(len(drivers), 3)
+            self.assertEqual(sum(len(d.loaded) for d in drivers), 12)
+            self.assertEqual(pool.map(lambda d, x: 10 // x, [5, 0, 2]), [2, None, 5])
+            self.assertLessEqual(len(drivers), 3)
+
+    def test_rate_limit_is_per_host(self):
+        limiter = HostRateLimiter(rate_per_host=20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.wait("https://a.example/x")
+        # 1 burst token, then 4 more at 20/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        start = time.monotonic()
+        limiter.wait("https://b.example/x")
+        self.assertLess(time.monotonic() - start, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
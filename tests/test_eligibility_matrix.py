@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from typing import ClassVar # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.recommender import CareerRecommender # type: ignore
+from models.eligibility_matrix import STATUS_LABELS # type: ignore
+
+
+class TestEligibilityMatrix(unittest.TestCase):
+    recommender: ClassVar[CareerRecommender]
+    cache_dir: ClassVar[tempfile.TemporaryDirectory]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.recommender = CareerRecommender()
+        # Keep the programme caches built on first use out of the repo's data/ folder
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.recommender._programme_index_path = os.path.join(cls.cache_dir.name, 'programme_index.npz')
+        cls.recommender._programme_graph_path = os.path.join(cls.cache_dir.name, 'programme_graph.npz')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache_dir.cleanup()
+
+    def _profiles(self):
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'sample_kcse_profiles.json')
+        with open(path, 'r') as f:
+            profiles = json.load(f)
+        profiles.append({"mean_grade": "C+", "subjects": {"Mathematics": "C", "English": "C+", "Biology": "D+"}})
+        profiles.append({"mean_grade": "B", "subjects": {}})
+        return profiles
+
+    def test_matches_check_eligibility(self):
+        """Vectorized statuses agree with the per-programme check for every requirement entry."""
+        matrix = self.recommender.eligibility_matrix
+        names = list(self.recommender.kuccps_requirements) + ["BACHELOR OF SCIENCE (COMPUTER SCIENCE)", "Unknown Programme XYZ"]
+        rows = [matrix.lookup(name) for name in names]
+        for profile in self._profiles():
+            codes = matrix.statuses_for_rows(rows, profile)
+            for name, code in zip(names, codes):
+                status, _, _ = self.recommender.check_eligibility(name, profile)
+                self.assertEqual(STATUS_LABELS[int(code)], status, f"{name!r} for {profile}")
+
+    def test_recommend_programmes_filters_status(self):
+        results = {"mean_grade": "D", "subjects": {"Mathematics": "D", "English": "D"}}
+        recs = self.recommender.recommend_programmes("computer science and software", results, k=5, statuses=["ELIGIBLE"])
+        for rec in recs:
+            self.assertEqual(rec['eligibility'], "ELIGIBLE")
+
+    def test_institution_index(self):
+        """Per-institution statuses agree with check_eligibility and rankings count them."""
+        profile = self._profiles()[0]
+        ranking = self.recommender.rank_institutions(profile, top_n=None)
+        counts = [r['matching_programmes'] for r in ranking]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        for entry in ranking[:3]:
+            offerings = self.recommender.programmes_at_institution(entry['institution'], profile)
+            self.assertEqual(len(offerings), entry['total_programmes'])
+            eligible = self.recommender.programmes_at_institution(entry['institution'], profile, statuses=["ELIGIBLE"])
+            self.assertEqual(len(eligible), entry['matching_programmes'])
+            for offering in offerings:
+                if offering['requirement_key']:
+                    status, _, _ = self.recommender.check_eligibility(offering['programme'], profile)
+                    self.assertEqual(offering['eligibility'], status)
+
+
+if __name__ == '__main__':
+    unittest.main()
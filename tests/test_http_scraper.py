@@ -0,0 +1,130 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import http_scraper # type: ignore
+from etl.http_scraper import scrape_source, html_text, FixtureFetcher # type: ignore
+from etl.seen_store import SeenStore # type: ignore
+from bs4 import BeautifulSoup # type: ignore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'http_scraper')
+
+
+class TestHttpScraper(unittest.TestCase):
+    def _scrape(self, source):
+        return scrape_source(source, pages=2, fixture_dir=FIXTURES, json_path=None, csv_path=None, stream_path=None)
+
+    def test_myjobmag_replay(self):
+        jobs = self._scrape('myjobmag')
+        # The sponsored card without a title link is skipped
+        self.assertEqual([j['Job Title'] for j in jobs], ["Software Engineer", "Registered Nurse", "Accountant"])
+        engineer, nurse, accountant = jobs
+        self.assertEqual(engineer['Company'], "Safaricom PLC")
+        self.assertEqual(engineer['Url'], "https://www.myjobmag.co.ke/job/software-engineer-safaricom-plc")
+        self.assertEqual(engineer['Location'], "Nairobi")
+        self.assertEqual(engineer['Skills Required'], "Python, SQL, Docker")
+        self.assertEqual(engineer['Minimum Qualification'], "BA/BSc/HND")
+        self.assertEqual(engineer['Department'], "Information Technology")
+        self.assertEqual(nurse['Category'], "Healthcare")
+        # No saved detail page: same empty record the Selenium scraper writes on failure
+        self.assertEqual(accountant['Description'], "")
+        self.assertEqual(accountant['Department'], "Finance & Accounting")
+
+    def test_brightermonday_replay(self):
+        jobs = self._scrape('brightermonday')
+        self.assertEqual(len(jobs), 2)
+        analyst, farm = jobs
+        self.assertEqual(analyst['Company'], "Equity Bank")
+        self.assertEqual(analyst['Years of Experience'], "2 years")
+        self.assertEqual(analyst['Source'], "BrighterMonday")
+        self.assertIn("Power BI", analyst['Skills Required'])
+        # An explicit site category is preferred for DeptNorm
+        self.assertEqual(analyst['DeptNorm'], "Data, Business Analysis and AI")
+        self.assertEqual(farm['Url'], "https://www.brightermonday.co.ke/listings/farm-manager-y2")
+        self.assertEqual(farm['Location'], "Murang'a")
+        self.assertEqual(farm['Department'], "Agriculture & Environmental")
+
+    def test_incremental_rescrape(self):
+        """A second run re-uses stored postings, only retries failed pages and stops paginating."""
+        class CountingFetcher(FixtureFetcher):
+            def __init__(self, fixture_dir):
+                super().__init__(fixture_dir)
+                self.urls = []
+
+            def get(self, url, wait_css=None):
+                self.urls.append(url)
+                return super().get(url, wait_css)
+
+        with tempfile.TemporaryDirectory() as tmp, SeenStore(os.path.join(tmp, 'seen.db'), stop_ratio=0.6) as store:
+            first_fetcher, second_fetcher = CountingFetcher(FIXTURES), CountingFetcher(FIXTURES)
+            first = scrape_source('myjobmag', pages=2, fetcher=first_fetcher, selenium_fallback=False, delay=0,
+                                  json_path=None, csv_path=None, stream_path=None, seen_store=store)
+            second = scrape_source('myjobmag', pages=2, fetcher=second_fetcher, selenium_fallback=False, delay=0,
+                                   json_path=None, csv_path=None, stream_path=None, seen_store=store)
+            self.assertEqual(second, first)
+            self.assertEqual(len(first_fetcher.urls), 5)
+            # Listing page 1 plus the detail page that failed last time; page 2 is never requested
+            self.assertEqual(second_fetcher.urls, ["https://www.myjobmag.co.ke/jobs",
+                                                   "https://www.myjobmag.co.ke/job/accountant-acme"])
+            self.assertEqual(store.count('myjobmag'), 2)
+
+    def test_detail_pages_stay_concurrent_with_selenium_fallback(self):
+        """HTTP detail fetches run on the worker pool; only the Selenium re-fetch is serialised."""
+        class Concurrency:
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.active = self.peak = self.calls = 0
+
+            def enter(self):
+                with self.lock:
+                    self.active += 1
+                    self.calls += 1
+                    self.peak = max(self.peak, self.active)
+                time.sleep(0.05)
+                with self.lock:
+                    self.active -= 1
+
+        http, browser = Concurrency(), Concurrency()
+
+        class BlockedDetailFetcher(FixtureFetcher):
+            """Listings replay from fixtures; every detail page comes back without content."""
+            def get(self, url, wait_css=None):
+                if "/job/" in url:
+                    http.enter()
+                    return None
+                return super().get(url, wait_css)
+
+        class FakeSelenium:
+            def __init__(self, **kwargs):
+                pass
+
+            def get(self, url, wait_css=None):
+                browser.enter()
+                return None
+
+            def close(self):
+                pass
+
+        with mock.patch.object(http_scraper, "SeleniumFetcher", FakeSelenium):
+            jobs = scrape_source('myjobmag', pages=1, fetcher=BlockedDetailFetcher(FIXTURES), selenium_fallback=True,
+                                 workers=4, delay=0, json_path=None, csv_path=None, stream_path=None)
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual(http.calls, 3)
+        self.assertGreater(http.peak, 1)
+        # Every detail page falls back to the browser, one at a time
+        self.assertEqual(browser.calls, 3)
+        self.assertEqual(browser.peak, 1)
+
+    def test_html_text_lines(self):
+        soup = BeautifulSoup("<div><p>Location: <b>Nairobi</b></p><script>x()</script>Skills:<br>SQL</div>", "html.parser")
+        self.assertEqual(html_text(soup.div), "Location: Nairobi\nSkills:\nSQL")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import job_search_db # type: ignore
+
+
+JOBS = pd.DataFrame([
+    ("Python Developer", "Acme", "Build python web services", "Django, SQL", "Information Technology"),
+    ("Registered Nurse", "City Hospital", "Patient care in the ward", "Nursing", "Healthcare & Medical"),
+    ("Data Analyst", "Ledger Ltd", "Dashboards and reporting", "Python, Excel", "Data Science & Analytics"),
+], columns=['Job Title', 'Company', 'Description', 'Skills Required', 'DeptNorm'])
+
+
+class TestJobSearchDB(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, 'jobs.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_upsert_is_incremental(self):
+        conn = job_search_db.connect(self.db)
+        self.assertEqual(job_search_db.upsert_jobs(conn, JOBS, seen_on='2025-01-01'), {'inserted': 3, 'updated': 0})
+        self.assertEqual(job_search_db.upsert_jobs(conn, JOBS.head(1), seen_on='2025-02-01'), {'inserted': 0, 'updated': 1})
+        conn.close()
+        self.assertEqual(job_search_db.job_count(self.db), 3)
+        recent = job_search_db.search_jobs("python", seen_since='2025-02-01', db_path=self.db)
+        self.assertEqual([r['Job Title'] for r in recent], ["Python Developer"])
+
+    def test_unchanged_postings_skip_the_fts_index(self):
+        conn = job_search_db.connect(self.db)
+        job_search_db.upsert_jobs(conn, JOBS, seen_on='2025-01-01')
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        def fts_writes():
+            writes = sum("'jobs_fts_" in sql for sql in statements)
+            statements.clear()
+            return writes
+
+        job_search_db.upsert_jobs(conn, JOBS, seen_on='2025-02-01')
+        self.assertEqual(fts_writes(), 0)
+        # Changed skills re-index that posting only
+        job_search_db.upsert_jobs(conn, JOBS.assign(**{'Skills Required': ["Django, SQL, AWS", "Nursing", "Python, Excel"]}))
+        self.assertGreater(fts_writes(), 0)
+        conn.set_trace_callback(None)
+        conn.close()
+        self.assertEqual([r['Job Title'] for r in job_search_db.search_jobs("aws", db_path=self.db)], ["Python Developer"])
+        self.assertEqual(job_search_db.search_jobs("django", db_path=self.db)[0]['Job Title'], "Python Developer")
+
+    def test_ranked_search_and_filters(self):
+        conn = job_search_db.connect(self.db)
+        job_search_db.upsert_jobs(conn, JOBS)
+        conn.close()
+        hits = job_search_db.search_jobs("python developer", db_path=self.db)
+        self.assertEqual(hits[0]['Job Title'], "Python Developer")
+        self.assertEqual(len(hits), 2)  # the analyst matches on skills
+        only_data = job_search_db.search_jobs("python", department="Data Science & Analytics", db_path=self.db)
+        self.assertEqual([r['Job Title'] for r in only_data], ["Data Analyst"])
+        # FTS operators in user input are quoted, not interpreted
+        self.assertEqual(job_search_db.search_jobs('nurse" OR NOT (', db_path=self.db)[0]['Job Title'], "Registered Nurse")
+
+    def test_missing_database(self):
+        self.assertEqual(job_search_db.search_jobs("python", db_path=self.db), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import pickle
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.job_signal_index import JobSignalIndex # type: ignore
+
+
+def _jobs(rows):
+    return pd.DataFrame(rows, columns=['Job Title', 'Company', 'Description', 'DeptNorm'])
+
+
+OLD = _jobs([
+    ("Software Developer", "Acme", "Build python web services and apis", "Information Technology"),
+    ("Registered Nurse", "City Hospital", "Patient care in the hospital ward", "Healthcare & Medical"),
+    ("Accountant", "Ledger Ltd", "Prepare tax returns and audit accounts", "Finance & Accounting"),
+])
+NEW = _jobs([
+    ("Software Developer", "Acme", "Build python web services and apis", "Information Technology"),
+    ("Accountant", "Ledger Ltd", "Prepare tax returns and audit accounts", "Business"),
+    ("Clinical Officer", "Rural Clinic", "Diagnose patients and manage clinic care", "Healthcare & Medical"),
+])
+
+
+class TestJobSignalIndex(unittest.TestCase):
+
+    def assertSameIndex(self, a, b):
+        (qa, labels_a), (qb, labels_b) = a.query_index(), b.query_index()
+        self.assertEqual(labels_a, labels_b)
+        self.assertEqual(qa[1], qb[1])
+        self.assertTrue(np.allclose(qa[2], qb[2]))
+        self.assertTrue(np.allclose(qa[4], qb[4]))
+
+    def test_delta_matches_rebuild(self):
+        """Applying add/remove/move deltas gives the same statistics as counting from scratch."""
+        incremental = JobSignalIndex()
+        incremental.rebuild(OLD)
+        stats = incremental.apply_delta(OLD, NEW)
+        incremental.compact()
+        self.assertEqual(stats, {'added': 1, 'removed': 1, 'moved': 1})
+
+        fresh = JobSignalIndex()
+        fresh.rebuild(NEW)
+        self.assertSameIndex(incremental, fresh)
+
+    def test_sync_rebuilds_when_rows_vanish(self):
+        index = JobSignalIndex()
+        index.rebuild(NEW)
+        stats = index.sync(OLD)
+        self.assertEqual(stats['rebuilt'], 1)
+        fresh = JobSignalIndex()
+        fresh.rebuild(OLD)
+        self.assertSameIndex(index, fresh)
+
+    def test_pickle_roundtrip(self):
+        index = JobSignalIndex()
+        index.rebuild(OLD)
+        restored = pickle.loads(pickle.dumps(index))
+        self.assertSameIndex(index, restored)
+
+
+if __name__ == '__main__':
+    unittest.main()
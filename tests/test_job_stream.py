@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.job_stream import JobStream, iter_jsonl, jsonl_to_json, jsonl_to_csv # type: ignore
+
+
+def _job(i, **extra):
+    return {"Job Title": f"Job {i}", "Company": "Acme", "Description": f"Role {i}\nNairobi", "Url": f"https://x/{i}", **extra}
+
+
+class TestJobStream(unittest.TestCase):
+    def test_resume_after_crash(self):
+        """An interrupted run resumes at the checkpointed page and drops the page in flight."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'jobs.jsonl')
+            stream = JobStream(path, 'myjobmag')
+            stream.append([_job(0), _job(1), None])
+            stream.checkpoint(2)
+            stream.append([_job(2)])  # page 2 is interrupted before its checkpoint
+            stream.close()
+
+            resumed = JobStream(path, 'myjobmag')
+            self.assertEqual((resumed.start_page, resumed.jobs_written), (2, 2))
+            self.assertEqual([r['Url'] for r in resumed.records()], ["https://x/0", "https://x/1"])
+            resumed.append([_job(2), _job(3)])
+            resumed.checkpoint(3)
+            resumed.finish()
+            resumed.close()
+            self.assertEqual(len(list(iter_jsonl(path))), 4)
+
+            # A finished run (or another source's checkpoint) starts from scratch
+            fresh = JobStream(path, 'myjobmag')
+            self.assertEqual((fresh.start_page, fresh.jobs_written), (1, 0))
+            fresh.close()
+
+    def test_converters_match_in_memory_output(self):
+        records = [_job(i) for i in range(7)] + [_job(7, Source="BrighterMonday")]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'jobs.jsonl')
+            stream = JobStream(path, 'brightermonday')
+            stream.append(records)
+            stream.close()
+
+            jsonl_to_json(path, os.path.join(tmp, 'jobs.json'))
+            with open(os.path.join(tmp, 'jobs.json'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), json.dumps(records, indent=2, ensure_ascii=False))
+
+            jsonl_to_csv(path, os.path.join(tmp, 'jobs.csv'), chunk_size=3)
+            pd.DataFrame(records).to_csv(os.path.join(tmp, 'expected.csv'), index=False, encoding='utf-8')
+            with open(os.path.join(tmp, 'jobs.csv'), encoding='utf-8') as a, open(os.path.join(tmp, 'expected.csv'), encoding='utf-8') as b:
+                self.assertEqual(a.read(), b.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import os
+import sys
+import sqlite3
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import load_jobs_to_db # type: ignore
+from load_jobs_to_db import bulk_load_jobs # type: ignore
+
+
+JOBS = pd.DataFrame([
+    ("Python Developer", "Acme", "Build python web services", "Django, SQL", "Information Technology"),
+    ("Registered Nurse", "City Hospital", "Patient care in the ward", None, "Healthcare & Medical"),
+    ("Data Analyst", "Ledger Ltd", "Dashboards and reporting", "Python, Excel", None),
+], columns=['Job Title', 'Company', 'Description', 'Skills Required', 'DeptNorm'])
+
+
+class TestLoadJobsToDB(unittest.TestCase):
+    """Bulk loader against the SQLite stand-in for the PostgreSQL jobs table."""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute("""
+            CREATE TABLE jobs (id INTEGER PRIMARY KEY, Job_Title TEXT, Company TEXT, Description TEXT,
+                               Minimum_Qualification TEXT, Skills_Required TEXT, Location TEXT, Work_Type TEXT,
+                               Years_of_Experience TEXT, Department TEXT)
+        """)
+        self.conn.execute("INSERT INTO jobs (Job_Title) VALUES ('Loaded before content hashes')")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _rows(self):
+        return self.conn.execute("SELECT id, Job_Title, Skills_Required, Department FROM jobs ORDER BY id").fetchall()
+
+    def test_snapshot_replaces_table(self):
+        stats = bulk_load_jobs(self.conn, [JOBS.head(2), JOBS.tail(2)])
+        self.assertEqual(stats, {'inserted': 3, 'updated': 0, 'deleted': 1})
+        self.assertEqual([r[1:] for r in self._rows()], [
+            ("Python Developer", "Django, SQL", "Information Technology"),
+            ("Registered Nurse", "", "Healthcare & Medical"),
+            ("Data Analyst", "Python, Excel", "Unknown"),
+        ])
+
+        # Re-labelled postings are updated in place, dropped ones removed, new ones appended
+        ids = {title: i for i, title, _, _ in self._rows()}
+        snapshot = pd.concat([JOBS.iloc[[2, 0]].assign(DeptNorm="Data Science & Analytics"),
+                              pd.DataFrame([("Driver", "Acme", "Deliveries", "Driving", "Transport")], columns=JOBS.columns)])
+        self.assertEqual(bulk_load_jobs(self.conn, [snapshot]), {'inserted': 1, 'updated': 2, 'deleted': 1})
+        rows = {title: (i, dept) for i, title, _, dept in self._rows()}
+        self.assertEqual(rows["Data Analyst"], (ids["Data Analyst"], "Data Science & Analytics"))
+        self.assertEqual(rows["Python Developer"][0], ids["Python Developer"])
+        self.assertNotIn("Registered Nurse", rows)
+        self.assertIn("Driver", rows)
+
+    def test_failed_load_leaves_table_untouched(self):
+        bulk_load_jobs(self.conn, [JOBS])
+        before = self._rows()
+
+        def chunks():
+            yield JOBS.head(1)
+            raise IOError("CSV truncated")
+
+        with self.assertRaises(IOError):
+            bulk_load_jobs(self.conn, chunks())
+        self.assertEqual(self._rows(), before)
+
+    def test_migration_runs_once_outside_the_load(self):
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+
+        def chunks():
+            raise IOError("CSV missing")
+            yield
+
+        # The migration is committed even though the load itself fails...
+        with self.assertRaises(IOError):
+            bulk_load_jobs(self.conn, chunks())
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        self.assertIn('content_hash', columns)
+        self.assertEqual(sum(s.startswith('ALTER TABLE') for s in statements), 1)
+
+        # ...and later loads find the column and skip it
+        statements.clear()
+        bulk_load_jobs(self.conn, [JOBS])
+        self.assertFalse([s for s in statements if s.startswith(('ALTER TABLE', 'CREATE UNIQUE INDEX IF NOT EXISTS'))])
+
+
+class TestLoadJobsToPostgres(unittest.TestCase):
+    """Bulk loader against a local PostgreSQL server (DB_* environment), in a scratch schema."""
+
+    def setUp(self):
+        try:
+            self.conn = load_jobs_to_db.connect()
+        except ImportError:
+            self.skipTest("psycopg2 is not installed")
+        except Exception as e:
+            self.skipTest(f"No PostgreSQL server available: {e}")
+        self.schema = f"test_load_jobs_{os.getpid()}"
+        with self.conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {self.schema}")
+            cur.execute(f"SET search_path TO {self.schema}")
+            cur.execute("""
+                CREATE TABLE jobs (id SERIAL PRIMARY KEY, Job_Title TEXT, Company TEXT, Description TEXT,
+                                   Minimum_Qualification TEXT, Skills_Required TEXT, Location TEXT, Work_Type TEXT,
+                                   Years_of_Experience TEXT, Department TEXT)
+            """)
+            cur.execute("INSERT INTO jobs (Job_Title) VALUES ('Loaded before content hashes')")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.rollback()
+        with self.conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {self.schema} CASCADE")
+        self.conn.commit()
+        self.conn.close()
+
+    def test_migrates_and_loads(self):
+        self.assertEqual(bulk_load_jobs(self.conn, [JOBS.head(2), JOBS.tail(2)]),
+                         {'inserted': 3, 'updated': 0, 'deleted': 1})
+        self.assertEqual(bulk_load_jobs(self.conn, [JOBS.iloc[[2, 0]]]), {'inserted': 0, 'updated': 2, 'deleted': 1})
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT job_title, skills_required, department FROM jobs ORDER BY id")
+            self.assertEqual(cur.fetchall(), [("Python Developer", "Django, SQL", "Information Technology"),
+                                              ("Data Analyst", "Python, Excel", "Unknown")])
+            cur.execute("SELECT COUNT(*) FROM information_schema.columns "
+                        "WHERE table_schema = %s AND table_name = 'jobs' AND column_name = 'content_hash'", (self.schema,))
+            self.assertEqual(cur.fetchone()[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
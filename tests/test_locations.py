@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.locations import REMOTE, UNSPECIFIED, build_regional_demand, job_region, normalize_location # type: ignore
+
+
+class TestLocations(unittest.TestCase):
+    def test_towns_map_to_counties(self):
+        self.assertEqual(normalize_location("Eldoret"), "Uasin Gishu")
+        self.assertEqual(normalize_location("Westlands, Nairobi"), "Nairobi")
+        self.assertEqual(normalize_location("Thika Road"), "Kiambu")
+        self.assertEqual(normalize_location("Murang’a"), "Murang'a")
+        # The longest name wins: West Pokot, not the "Pokot" alias
+        self.assertEqual(normalize_location("Kapenguria, West Pokot"), "West Pokot")
+        self.assertEqual(normalize_location("Kisumu"), "Kisumu")
+
+    def test_remote_fallback(self):
+        self.assertEqual(normalize_location("Remote"), REMOTE)
+        self.assertEqual(normalize_location("Work from home (Kenya)"), REMOTE)
+        # A named place wins over a remote marker
+        self.assertEqual(normalize_location("Nairobi / Remote"), "Nairobi")
+        self.assertIsNone(normalize_location("Kenya"))
+        self.assertIsNone(normalize_location(float('nan')))
+
+    def test_job_region_falls_back_to_title_and_description(self):
+        self.assertEqual(job_region({'Location': "Mombasa", 'Job Title': "Nurse in Kisumu"}), "Mombasa")
+        self.assertEqual(job_region({'Location': "We are hiring", 'Job Title': "Nurse - Kisumu"}), "Kisumu")
+        self.assertEqual(job_region({'Location': None, 'Description': "Based in Nanyuki"}), "Laikipia")
+        self.assertEqual(job_region({'Location': "Kenya", 'Job Title': "Accountant"}), UNSPECIFIED)
+
+    def test_regional_demand_is_relative_to_the_busiest_department(self):
+        jobs = pd.DataFrame({
+            'Department': ["Business", "Business", "Engineering", "Business", "Engineering", None],
+            'Location': ["Nairobi", "Westlands", "Nairobi", "Kisumu", "Kisumu", "Kisumu"],
+        })
+        cube = build_regional_demand(jobs).set_index(['Region', 'Department'])
+        self.assertEqual(cube['job_count'].to_dict(), {
+            ("Kisumu", "Business"): 1, ("Kisumu", "Engineering"): 1,
+            ("Nairobi", "Business"): 2, ("Nairobi", "Engineering"): 1,
+        })
+        self.assertAlmostEqual(cube.loc[("Nairobi", "Engineering"), 'demand_score'], 0.5)
+        self.assertAlmostEqual(cube.loc[("Kisumu", "Engineering"), 'demand_score'], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
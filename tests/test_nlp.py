@@ -1,5 +1,8 @@
 import pytest # type: ignore
+import torch # type: ignore
+from unittest import mock
 from models.interest_classifier import InterestClassifier
+from models import interest_vectorizer, nlp_preprocessing
 
 # We mock the underlying vectorizer in the classifier if needed, 
 # but for a "Unit" test of the classifier class itself, we might want 
@@ -8,6 +11,25 @@ from models.interest_classifier import InterestClassifier
 # or mocked vectors in a real CI environment if memory is tight.
 # For now, we assume the environment can handle the NLTK lookup.
 
+
+def _fake_bert(calls):
+    """Deterministic 768-d stand-in for get_bert_embedding that records each call."""
+    def embed(text, *args, **kwargs):
+        calls.append(text)
+        vec = torch.zeros(768)
+        for i, ch in enumerate(text.lower()):
+            vec[(ord(ch) * 31 + i) % 768] += 1.0
+        return vec
+    return embed
+
+
+@pytest.fixture
+def bert_calls():
+    calls = []
+    with mock.patch.dict(interest_vectorizer.EMBEDDING_MODES, {"bert": _fake_bert(calls)}):
+        yield calls
+
+
 class TestInterestClassifier:
     
     def test_classify_dummy(self):
@@ -22,3 +44,189 @@ class TestInterestClassifier:
         # Since we mocked the modules in test_recommender, we'll leave this 
         # as a placeholder or we need to setup similar patching.
         assert True
+
+    def test_fast_mode_never_calls_bert(self, bert_calls):
+        classifier = InterestClassifier()
+        bert_calls.clear()  # department vectors are embedded once at construction
+
+        text = "I love coding and building mobile apps in python"
+        fast_scores, path = classifier.classify_with_path(text, mode="fast")
+        assert bert_calls == []
+        assert path == "fast"
+
+        full_scores = classifier.classify(text, mode="full")
+        assert bert_calls == [text]
+        assert set(fast_scores) == set(full_scores)
+        assert max(fast_scores, key=fast_scores.get) == "Information Technology"
+
+    def test_fast_blend_keeps_job_layer_weight(self, bert_calls):
+        classifier = InterestClassifier()
+        tfidf = {"Law": 0.4, "Education": 0.1}
+        # The max-normalised job layer always gives its top department 1.0
+        jobs = {"Law": 0.0, "Education": 1.0}
+        scores = classifier._blend("", {}, tfidf, jobs, 0.45, 0.35, 0.20, use_bert=False)
+        assert scores["Law"] == pytest.approx(0.8 * 0.4)
+        assert scores["Education"] == pytest.approx(0.8 * 0.1 + 0.2)
+        assert max(scores, key=scores.get) == "Law"
+
+    def test_cascade_skips_bert_when_keywords_decide(self, bert_calls):
+        classifier = InterestClassifier()
+        bert_calls.clear()
+
+        scores, path = classifier.classify_with_path("software developer writing python code", mode="cascade")
+        assert path == "fast"
+        assert bert_calls == []
+        assert max(scores, key=scores.get) == "Information Technology"
+
+    def test_cascade_escalates_to_bert(self, bert_calls):
+        classifier = InterestClassifier()
+        bert_calls.clear()
+
+        # No keyword signal at all: the top score is below cascade_min_signal
+        text = "I am not sure, I like many things."
+        _, path = classifier.classify_with_path(text, mode="cascade")
+        assert path == "full"
+        assert bert_calls == [text]
+
+        # A clear keyword winner still escalates when its margin is below cascade_margin
+        classifier.cascade_margin = 10.0
+        _, path = classifier.classify_with_path("software developer writing python code", mode="cascade")
+        assert path == "full"
+        assert classifier.path_counts == {"fast": 0, "full": 2}
+
+    def test_cascade_fast_path_keeps_keyword_winner(self, bert_calls):
+        import pandas as pd # type: ignore
+        classifier = InterestClassifier()
+        bert_calls.clear()
+        text = "software developer writing python code"
+        jobs_df = pd.DataFrame({'Description': ["Court filings"], 'DeptNorm': ["Law"]})
+
+        # A heavily weighted job layer that favours another department would overturn
+        # the keyword winner, so the fast blend is not returned
+        with mock.patch.object(classifier, "_job_description_signal", return_value={"Law": 1.0}):
+            fast_scores = classifier.classify(text, job_signal_weight=0.9, jobs_df=jobs_df, mode="fast")
+            assert max(fast_scores, key=fast_scores.get) == "Law"
+            _, path = classifier.classify_with_path(text, job_signal_weight=0.9, jobs_df=jobs_df, mode="cascade")
+        assert path == "full"
+        assert bert_calls == [text]
+
+        with mock.patch.object(classifier, "_job_description_signal", return_value={"Law": 1.0}):
+            scores, path = classifier.classify_with_path(text, jobs_df=jobs_df, mode="cascade")
+        assert path == "fast"
+        assert max(scores, key=scores.get) == "Information Technology"
+
+    def test_is_decisive_needs_signal_and_margin(self, bert_calls):
+        classifier = InterestClassifier(cascade_margin=0.05, cascade_min_signal=0.10)
+        # Both conditions hold
+        assert classifier._is_decisive("", {"Law": 0.30, "Education": 0.20})
+        # Strong top score, but the runner-up is within the margin
+        assert not classifier._is_decisive("", {"Law": 0.30, "Education": 0.27})
+        # Clear margin, but the top score is too weak
+        assert not classifier._is_decisive("", {"Law": 0.08, "Education": 0.0})
+        # Signal groups are applied before the check: "court" boosts Law past the margin
+        assert classifier._is_decisive("court", {"Law": 0.30, "Education": 0.27})
+        # The fast blend must agree with the keyword winner
+        assert classifier._is_decisive("", {"Law": 0.30, "Education": 0.20}, {"Law": 0.5, "Education": 0.4})
+        assert not classifier._is_decisive("", {"Law": 0.30, "Education": 0.20}, {"Law": 0.4, "Education": 0.5})
+
+
+class TestStaticEmbedding:
+
+    VOCAB = {"play": 0, "##ing": 1, "##er": 2, "un": 3, "##play": 4, "##able": 5}
+
+    def test_wordpiece_longest_match_first(self):
+        assert nlp_preprocessing._wordpiece("play", self.VOCAB) == ["play"]
+        assert nlp_preprocessing._wordpiece("playing", self.VOCAB) == ["play", "##ing"]
+        assert nlp_preprocessing._wordpiece("unplayable", self.VOCAB) == ["un", "##play", "##able"]
+        # Any unmatched remainder makes the whole word unknown
+        assert nlp_preprocessing._wordpiece("playx", self.VOCAB) == []
+        assert nlp_preprocessing.static_tokenize("Playing, unplayable!", self.VOCAB) == \
+            ["play", "##ing", "un", "##play", "##able"]
+
+    def test_failed_table_load_falls_back_once(self, tmp_path):
+        fallback = torch.ones(768)
+        with mock.patch.object(nlp_preprocessing, "_STATIC_TABLE", None), \
+             mock.patch.object(nlp_preprocessing, "STATIC_VECTORS_PATH", str(tmp_path / "missing.npz")), \
+             mock.patch.object(nlp_preprocessing, "_get_bert_assets", side_effect=OSError("no weights")) as load, \
+             mock.patch.object(nlp_preprocessing, "get_fallback_vector", return_value=fallback):
+            for _ in range(3):
+                assert nlp_preprocessing.get_static_embedding("software developer") is fallback
+            assert load.call_count == 1
+
+    def test_static_embedding_averages_token_vectors(self):
+        table = torch.arange(12, dtype=torch.float32).reshape(6, 2)
+        with mock.patch.object(nlp_preprocessing, "_STATIC_TABLE", (self.VOCAB, table)):
+            vec = nlp_preprocessing.get_static_embedding("playing")
+            assert torch.equal(vec, table[[0, 1]].mean(dim=0))
+            assert torch.equal(nlp_preprocessing.get_static_embedding("xyz"), torch.zeros(2))
+
+
+class TestPersistedEmbeddings:
+
+    def test_centroids_are_not_built_from_fallback_vectors(self, tmp_path):
+        import pandas as pd # type: ignore
+        from models.dept_centroids import build_department_centroids
+
+        jobs = pd.DataFrame({'Description': ["Write python services"], 'DeptNorm': ["Information Technology"]})
+        output = tmp_path / "centroids.npz"
+        with mock.patch.object(nlp_preprocessing, "_get_bert_assets", side_effect=OSError("no weights")):
+            # Query-time embeddings still fall back to keyword vectors...
+            assert nlp_preprocessing.get_bert_embeddings_batch(["python"]).shape == (1, 768)
+            # ...but vectors persisted as "bert" refuse to
+            with pytest.raises(OSError):
+                build_department_centroids(jobs, str(output))
+        assert not output.exists()
+
+
+class TestSentencePooling:
+
+    ESSAY = ("I enjoy drawing and painting portraits in my free time. "
+             "More than anything I want to write software and build mobile apps. "
+             "My friends say I am good at organising events.")
+
+    @pytest.fixture
+    def batch_calls(self, bert_calls):
+        embed = interest_vectorizer.EMBEDDING_MODES["bert"]
+        batches = []
+
+        def embed_batch(texts, *args, **kwargs):
+            batches.append(list(texts))
+            return torch.stack([embed(t) for t in texts])
+
+        with mock.patch.object(interest_vectorizer, "get_bert_embeddings_batch", embed_batch):
+            yield batches
+
+    def test_split_sentences_edge_cases(self):
+        assert nlp_preprocessing.split_sentences("") == []
+        assert nlp_preprocessing.split_sentences("I like maths") == ["I like maths"]
+        # Short fragments are folded into the previous sentence
+        assert nlp_preprocessing.split_sentences("I like maths and physics. Really!") == ["I like maths and physics. Really!"]
+        assert len(nlp_preprocessing.split_sentences(self.ESSAY)) == 3
+        capped = nlp_preprocessing.split_sentences(self.ESSAY, max_sentences=2)
+        assert len(capped) == 2 and capped[1].endswith("organising events.")
+
+    def test_vectorize_sentences_shapes(self, batch_calls):
+        vectorizer = interest_vectorizer.InterestVectorizer()
+        assert tuple(vectorizer.vectorize_sentences(self.ESSAY).shape) == (3, 768)
+        assert len(batch_calls) == 1  # one batched forward pass for the whole essay
+        assert tuple(vectorizer.vectorize_sentences("software developer").shape) == (1, 768)
+        assert tuple(vectorizer.vectorize_sentences("").shape) == (1, 768)
+
+    @pytest.mark.parametrize("pooling", ["max", "attention"])
+    def test_pooled_scores(self, batch_calls, pooling):
+        pooled = InterestClassifier(sentence_pooling=pooling)
+        plain = InterestClassifier()
+
+        # One pooled score per department, from the per-sentence similarity matrix
+        scores = pooled._sentence_bert_scores(self.ESSAY)
+        assert set(scores) == set(pooled.dept_bert_vectors)
+        sentence_vecs = pooled.vectorizer.vectorize_sentences(self.ESSAY)
+        names, dept_matrix, _ = pooled._dept_matrix()
+        sims = torch.nn.functional.normalize(sentence_vecs, dim=1) @ dept_matrix.T
+        assert tuple(sims.shape) == (3, len(names))
+        if pooling == "max":
+            assert scores == pytest.approx({d: float(s) for d, s in zip(names, sims.max(dim=0).values)})
+
+        # One sentence (or none) scores exactly like the unpooled whole-text embedding
+        for text in ("software developer", ""):
+            assert pooled._bert_scores(text) == pytest.approx(plain._bert_scores(text))
@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.eligibility_matrix import EligibilityMatrix, ELIGIBLE, NOT_ELIGIBLE # type: ignore
+from models.programme_graph import ( # type: ignore
+    build_programme_graph, save_programme_graph, load_programme_graph, ProgrammeGraph
+)
+
+GRADE_POINTS = {"A": 12, "B": 9, "C+": 7, "C": 6, "D": 3, "E": 1}
+
+REQUIREMENTS = {
+    "BACHELOR OF SCIENCE (COMPUTER SCIENCE)": {"min_mean_grade": "C+", "required_subjects": {"Mathematics": "C+"}},
+    "DIPLOMA IN COMPUTER SCIENCE": {"min_mean_grade": "C", "required_subjects": {"Mathematics": "C"}},
+    "CERTIFICATE IN COMPUTER SCIENCE": {"min_mean_grade": "D", "required_subjects": {"Mathematics": "D"}},
+    "BACHELOR OF SCIENCE (APPLIED COMPUTER SCIENCE)": {"min_mean_grade": "B", "required_subjects": {"Mathematics": "B"}},
+    "DIPLOMA IN NURSING": {"min_mean_grade": "C", "required_subjects": {"Biology": "C"}},
+    "BACHELOR OF LAWS": {"min_mean_grade": "B", "required_subjects": {"English": "B"}},
+}
+
+
+class TestProgrammeGraph(unittest.TestCase):
+    def setUp(self):
+        self.matrix = EligibilityMatrix(REQUIREMENTS, GRADE_POINTS)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'programme_graph.npz')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_top_k_neighbours(self):
+        k = 2
+        graph = build_programme_graph(self.matrix, k=k)
+        self.assertEqual(graph.shape, (6, 6))
+        self.assertTrue(np.all(np.diff(graph.indptr) <= k))
+        self.assertEqual(graph.diagonal().tolist(), [0.0] * 6)
+
+        # The kept edges are the k strongest of the full similarity row
+        full = build_programme_graph(self.matrix, k=5).toarray()
+        for row in range(6):
+            kept = set(graph.indices[graph.indptr[row]:graph.indptr[row + 1]].tolist())
+            strongest = [j for j in np.argsort(-full[row], kind='stable') if full[row, j] > 0][:k]
+            self.assertEqual(kept, set(strongest))
+
+        cs = self.matrix.lookup("DIPLOMA IN COMPUTER SCIENCE")
+        neighbours = graph.indices[graph.indptr[cs]:graph.indptr[cs + 1]]
+        self.assertTrue(all("COMPUTER SCIENCE" in self.matrix.keys[j] for j in neighbours))
+
+    def test_alternatives_keep_only_eligible(self):
+        save_programme_graph(self.matrix, self.path, k=5)
+        graph = ProgrammeGraph(self.matrix, cache_path=self.path)
+        codes = np.full(len(self.matrix.keys), ELIGIBLE, dtype=np.int8)
+        codes[self.matrix.lookup("DIPLOMA IN COMPUTER SCIENCE")] = NOT_ELIGIBLE
+
+        alternatives = graph.alternatives("BACHELOR OF SCIENCE (COMPUTER SCIENCE)", codes, n=2)
+        names = [alt['programme'] for alt in alternatives]
+        self.assertEqual(len(names), 2)
+        self.assertNotIn("DIPLOMA IN COMPUTER SCIENCE", names)
+        self.assertNotIn("BACHELOR OF SCIENCE (COMPUTER SCIENCE)", names)
+        similarities = [alt['similarity'] for alt in alternatives]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+
+    def test_graph_is_only_loaded_at_request_time(self):
+        # Nothing saved: no alternatives, and nothing is built or written
+        graph = ProgrammeGraph(self.matrix, cache_path=self.path)
+        codes = np.full(len(self.matrix.keys), ELIGIBLE, dtype=np.int8)
+        self.assertEqual(graph.alternatives("DIPLOMA IN NURSING", codes), [])
+        self.assertFalse(os.path.exists(self.path))
+
+        # A graph saved for another requirement list is stale
+        save_programme_graph(self.matrix, self.path)
+        self.assertIsNotNone(load_programme_graph(self.matrix, self.path))
+        fewer = EligibilityMatrix(dict(list(REQUIREMENTS.items())[:4]), GRADE_POINTS)
+        self.assertIsNone(load_programme_graph(fewer, self.path))
+
+        # So is one whose subject requirements changed under the same names
+        edited = dict(REQUIREMENTS)
+        edited["DIPLOMA IN NURSING"] = {"min_mean_grade": "C", "required_subjects": {"Chemistry": "C"}}
+        self.assertIsNone(load_programme_graph(EligibilityMatrix(edited, GRADE_POINTS), self.path))
+        self.assertIsNotNone(load_programme_graph(EligibilityMatrix(dict(REQUIREMENTS), GRADE_POINTS), self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
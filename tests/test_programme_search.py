@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.programme_search import ProgrammeSearchIndex # type: ignore
+
+COURSES = pd.DataFrame([
+    {"Program_Code": "1", "Institution_Name": "MOI UNIVERSITY", "Programme_Name": "BACHELOR OF SCIENCE (COMPUTER SCIENCE)", "Department": "IT", "Cutoff_2024": "38.1"},
+    {"Program_Code": "2", "Institution_Name": "EGERTON UNIVERSITY", "Programme_Name": "BACHELOR OF SCIENCE (COMPUTER SCIENCE)", "Department": "IT", "Cutoff_2024": "30.2"},
+    {"Program_Code": "3", "Institution_Name": "MOI UNIVERSITY", "Programme_Name": "BACHELOR OF SCIENCE (NURSING)", "Department": "Health", "Cutoff_2024": "41.0"},
+    {"Program_Code": "4", "Institution_Name": "KMTC", "Programme_Name": "DIPLOMA IN NURSING", "Department": "Health", "Cutoff_2024": "-"},
+    {"Program_Code": "5", "Institution_Name": "ZETECH UNIVERSITY", "Programme_Name": "BACHELOR OF ARTS (INTERNATIONAL RELATIONS AND DIPLOMACY)", "Department": "Law", "Cutoff_2024": "22.4"},
+])
+
+
+class TestProgrammeSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ProgrammeSearchIndex(COURSES)
+
+    def test_prefix_search_requires_all_words(self):
+        hits = self.index.search("moi comp")
+        self.assertEqual([h['code'] for h in hits], ["1"])
+
+    def test_filters(self):
+        self.assertEqual([h['code'] for h in self.index.search("nurs", level="Diploma")], ["4"])
+        self.assertEqual([h['code'] for h in self.index.search("computer", cutoff_max=35)], ["2"])
+        self.assertEqual([h['code'] for h in self.index.search("", institution="moi university", cutoff_min=40)], ["3"])
+
+    def test_empty_query_lists_lowest_cutoff_first(self):
+        extra = pd.DataFrame([{"Program_Code": "6", "Institution_Name": "KMTC", "Department": "Health",
+                               "Programme_Name": "DIPLOMA IN CLINICAL MEDICINE", "Cutoff_2024": "28.5"}])
+        index = ProgrammeSearchIndex(pd.concat([COURSES, extra], ignore_index=True))
+        # The KMTC nursing diploma has no cutoff, so it comes after every real one
+        self.assertEqual([h['code'] for h in index.search("", level="Diploma")], ["6", "4"])
+
+    def test_level_uses_whole_words(self):
+        hit = self.index.search("diplomacy")[0]
+        self.assertEqual(hit['level'], "Degree")
+
+    def test_autocomplete(self):
+        suggestions = self.index.autocomplete("nur")
+        self.assertIn("DIPLOMA IN NURSING", suggestions)
+        self.assertIn("BACHELOR OF SCIENCE (NURSING)", suggestions)
+        self.assertEqual(self.index.autocomplete("xyz"), [])
+        # Earlier words must be in the suggestion too, not just a word matching the last one
+        self.assertEqual(self.index.autocomplete("science nur"), ["BACHELOR OF SCIENCE (NURSING)"])
+        self.assertEqual(self.index.autocomplete("computer sc"), ["BACHELOR OF SCIENCE (COMPUTER SCIENCE)"])
+        self.assertEqual(self.index.autocomplete("diploma sc"), [])
+
+    def test_prefix_expansion_keeps_most_common_terms(self):
+        # 60 rare "c..." words sort before "computer" and would fill an alphabetical cut-off
+        rare = pd.DataFrame([{"Program_Code": f"r{i}", "Institution_Name": "KMTC", "Department": "Other",
+                              "Programme_Name": f"CERTIFICATE IN CA{i:02d}"} for i in range(60)])
+        index = ProgrammeSearchIndex(pd.concat([COURSES, rare], ignore_index=True))
+        terms = index._expand_prefix("c", limit=5)
+        self.assertEqual(terms[:2], ["certificate", "computer"])
+        self.assertEqual(len(terms), 5)
+        self.assertEqual({h['code'] for h in index.search("egerton c")}, {"2"})
+        # A whole-word prefix is always kept, however rare
+        self.assertEqual(index._expand_prefix("ca07", limit=1), ["ca07"])
+
+
+if __name__ == '__main__':
+    unittest.main()
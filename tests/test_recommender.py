@@ -112,5 +112,63 @@ class TestCareerRecommender(unittest.TestCase):
         # Check if Information Technology is the top recommendation
         self.assertEqual(first_rec['dept'], 'Information Technology')
 
+    def test_invalid_classifier_settings_fall_back_per_field(self):
+        """One bad [classifier] value resets only that setting."""
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        config['classifier'] = {
+            'mode': 'cascade', 'cascade_margin': 'wide', 'cascade_min_signal': '0.2',
+            'embedding': 'gpt', 'sentence_pooling': 'max'
+        }
+        with open('config.ini', 'w') as configfile:
+            config.write(configfile)
+
+        recommender = CareerRecommender()
+        self.assertEqual(recommender.classifier_mode, 'cascade')
+        self.assertEqual(recommender.classifier.cascade_margin, 0.05)
+        self.assertEqual(recommender.classifier.cascade_min_signal, 0.2)
+        self.assertEqual(recommender.classifier.vectorizer.embedding_mode, 'bert')
+        self.assertEqual(recommender.classifier.sentence_pooling, 'max')
+
+    def test_regional_demand_blend(self):
+        """A preferred region blends its demand score into the national one by regional_weight."""
+        pd.DataFrame({
+            'Department': ['Information Technology', 'Business', 'Business'],
+            'Region': ['Uasin Gishu', 'Uasin Gishu', 'Remote'],
+            'job_count': [2, 5, 3],
+            'demand_score': [0.4, 1.0, 1.0]
+        }).to_csv('test_regional_demand.csv', index=False)
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        config['paths']['regional_demand_csv'] = 'test_regional_demand.csv'
+        config['demand'] = {'regional_weight': '0.25'}
+        with open('config.ini', 'w') as configfile:
+            config.write(configfile)
+        try:
+            recommender = CareerRecommender()
+        finally:
+            os.remove('test_regional_demand.csv')
+
+        # Towns resolve to their county; remote wording to the Remote row; unknown places to national only
+        self.assertEqual(recommender.resolve_region("Eldoret"), 'Uasin Gishu')
+        self.assertEqual(recommender.resolve_region("Uasin Gishu"), 'Uasin Gishu')
+        self.assertEqual(recommender.resolve_region("Work from home"), 'Remote')
+        self.assertIsNone(recommender.resolve_region("Kisumu"))
+        self.assertIsNone(recommender.resolve_region(None))
+
+        interest = {'Information Technology': 0.5, 'Health': 0.5}
+        scores = recommender._calculate_scores(interest, False, 0.75, 0.25, {}, region='Uasin Gishu')
+        it = scores['Information Technology']
+        self.assertAlmostEqual(it['demand_score'], 0.75 * 150 / 150 + 0.25 * 0.4)
+        self.assertAlmostEqual(it['final_score'], 0.75 * 0.5 + 0.25 * it['demand_score'])
+        self.assertEqual((it['job_count'], it['regional_job_count']), (150, 2))
+        # No postings for the department in the region: its regional share is zero
+        self.assertAlmostEqual(scores['Health']['demand_score'], 0.75 * 50 / 150)
+        self.assertEqual(scores['Health']['regional_job_count'], 0)
+
+        national = recommender._calculate_scores(interest, False, 0.75, 0.25, {})
+        self.assertAlmostEqual(national['Information Technology']['demand_score'], 1.0)
+        self.assertIsNone(national['Information Technology']['regional_job_count'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
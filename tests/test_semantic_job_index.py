@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from unittest import mock
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.job_keys import job_key # type: ignore
+from models import semantic_job_index # type: ignore
+from models.semantic_job_index import SemanticJobIndex, build_semantic_job_index # type: ignore
+
+
+JOBS = pd.DataFrame([
+    ("Python Developer", "Acme", "Build web services", "Information Technology"),
+    ("Registered Nurse", "City Hospital", "Patient care", "Healthcare & Medical"),
+    ("Data Engineer", "Ledger Ltd", "Pipelines and warehouses", "Information Technology"),
+    ("Clinical Officer", "Rural Clinic", "Outpatient care", "Healthcare & Medical"),
+], columns=['Job Title', 'Company', 'Description', 'DeptNorm'])
+
+# One direction per posting, so each one is the best match for its own vector
+VECTORS = np.eye(4, 8, dtype=np.float32) * 3
+
+
+def _fake_embed(texts, embedding_mode="bert", batch_size=32):
+    return VECTORS[:len(texts)]
+
+
+class TestSemanticJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.matrix_path = os.path.join(self.tmp.name, 'job_embeddings.f16.npy')
+        self.meta_path = os.path.join(self.tmp.name, 'job_embeddings_meta.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build(self, jobs=JOBS):
+        with mock.patch.object(semantic_job_index, 'embed_texts', _fake_embed):
+            return build_semantic_job_index(jobs, self.matrix_path, self.meta_path)
+
+    def test_build_and_search(self):
+        vectors = self._build()
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0)
+        index = SemanticJobIndex.load(self.matrix_path, self.meta_path)
+        self.assertEqual(index.embedding_mode, "bert")
+        self.assertEqual(index.matrix.shape, (4, 8))
+        # Rows are grouped by department, so a department is a contiguous slice
+        self.assertEqual(index.departments, {"Healthcare & Medical": (0, 2), "Information Technology": (2, 4)})
+        keys = [job_key(t, c, d) for t, c, d in zip(JOBS['Job Title'], JOBS['Company'], JOBS['Description'])]
+
+        # The id table maps every row back to its posting
+        for i, key in enumerate(keys):
+            self.assertEqual(index.search(VECTORS[i], k=1)[0][0], key)
+        hits = index.search(VECTORS[2] + 0.5 * VECTORS[1], dept="Information Technology", k=5)
+        self.assertEqual([key for key, _ in hits], [keys[2], keys[0]])
+        self.assertAlmostEqual(hits[0][1], 2 / np.sqrt(5), places=3)
+        self.assertEqual(index.search(VECTORS[0], dept="Law"), [])
+        # Queries from another embedding space find nothing rather than garbage
+        self.assertEqual(index.search(np.ones(16)), [])
+
+    def test_mismatched_files_are_rejected(self):
+        self._build()
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            old_meta = json.load(f)
+        # A rebuild with the same number of rows, read before its meta is replaced
+        self._build(JOBS.assign(Description=JOBS['Description'] + " (updated)"))
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump(old_meta, f)
+        self.assertIsNone(SemanticJobIndex.load(self.matrix_path, self.meta_path))
+        self.assertIsNone(SemanticJobIndex.load(self.matrix_path, os.path.join(self.tmp.name, 'missing.json')))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['job_embeddings.f16.npy', 'job_embeddings_meta.json'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+import pandas as pd # type: ignore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.taxonomy import Taxonomy, get_taxonomy # type: ignore
+
+
+class TestBatchClassification(unittest.TestCase):
+    def test_batch_matches_per_posting(self):
+        """classify_batch picks the same department as classify for every posting."""
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'myjobmag_jobs.csv')
+        df = pd.read_csv(path).fillna('')
+        rows = [(str(r['Job Title']), str(r['Description']), str(r.get('Skills Required', '')))
+                for _, r in df.iterrows()]
+        rows += [
+            ("C# Developer", "Build .NET services", ""),
+            ("Data Analyst", "machine learning and data science", "Python, SQL"),
+            ("Senior Accountant", "audit, tax and financial reporting", ""),
+            ("Nurse", "", ""),
+            ("Zookeeper", "feed animals", ""),
+            ("", "", ""),
+        ]
+        taxonomy = get_taxonomy()
+        expected = [taxonomy.classify(t, d, s) for t, d, s in rows]
+        batch = taxonomy.classify_batch([t for t, _, _ in rows], [f"{t} {d} {s}" for t, d, s in rows])
+        self.assertEqual(batch, expected)
+
+
+class TestKeywordClassification(unittest.TestCase):
+    def test_etl_era_classifications(self):
+        """Postings the ETL's own keyword lists classified before the taxonomy merge keep their department."""
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'myjobmag_jobs.csv')
+        df = pd.read_csv(path).fillna('').drop_duplicates(subset='Job Title').set_index('Job Title')
+        taxonomy = get_taxonomy()
+        expected = {
+            "HR Manager for Manufacturing Client at Walk In Solutions": "Human Resources",
+            "Programme Lead at eWATERservices": "Project Management",
+            "Latest Recruitment at Turkana County Government": "Project Management",
+            "Careers at KCA University (KCAU)": "Project Management",
+        }
+        for title, dept in expected.items():
+            row = df.loc[title]
+            self.assertEqual(taxonomy.classify(title, str(row['Description']), str(row['Skills Required'])), dept, title)
+
+        self.assertEqual(taxonomy.classify("Officer", "talent and employee relations"), "Human Resources")
+        self.assertEqual(taxonomy.classify("Officer", "contract review and drafting"), "Law")
+        self.assertEqual(taxonomy.classify("Officer", "programme planning, delivery and implementation"),
+                         "Project Management")
+
+
+class TestCategoryMap(unittest.TestCase):
+    def test_overrides_revalidated_on_change(self):
+        """Edits to the overrides file are picked up without an explicit reload."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'category_mappings.json')
+            taxonomy = Taxonomy(path)
+            self.assertEqual(taxonomy.normalize_category("Legal Services"), "Legal Services")
+            with open(path, 'w') as f:
+                json.dump({"Legal Services": "Law"}, f)
+            self.assertEqual(taxonomy.normalize_category("Legal Services"), "Law")
+            os.remove(path)
+            self.assertEqual(taxonomy.normalize_category("Legal Services"), "Legal Services")
+
+
+if __name__ == '__main__':
+    unittest.main()